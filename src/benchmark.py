@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from misc.get_parent_dir import ROOT_DIR
+from pong_benchmarks.benchmark_suite import check_allocation_budgets, compare_to_baseline, print_benchmark_report, run_benchmark_suite
+
+parser = argparse.ArgumentParser(description="Benchmarks the physics, ai and rendering hot paths and the full game loop.")
+parser.add_argument("--output", metavar="PATH", default=None, help="Write the results to a json file")
+parser.add_argument("--baseline", metavar="PATH", default=str(ROOT_DIR / "resources" / "benchmarks" / "baseline.json"), help="Baseline results to compare against")
+parser.add_argument("--update_baseline", action="store_true", help="Store these results as the new baseline instead of comparing")
+parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown vs the baseline that counts as a regression")
+parser.add_argument("--quick", action="store_true", help="Fewer repeats and frames (noisier)")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    report = run_benchmark_suite(quick=args.quick)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.update_baseline:
+        print_benchmark_report(report)
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        sys.exit(0)
+
+    over_budget = check_allocation_budgets(report)
+    try:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    except FileNotFoundError:
+        baseline = None
+
+    print_benchmark_report(report, baseline)
+    regressions = compare_to_baseline(report, baseline, args.threshold) if baseline else []
+    if baseline is None: # a gate without a baseline would pass every regression
+        print(f"\nNo baseline at {args.baseline}, run with --update_baseline to create one (baselines are machine specific).")
+    for name, baseline_value, value, change in regressions:
+        print(f"REGRESSION {name}: {baseline_value:,.1f} -> {value:,.1f} ({change:+.0%} slower, threshold {args.threshold:.0%})")
+    for name, budget, value in over_budget:
+        print(f"OVER BUDGET {name}: {value:,.1f} (budget {budget:,.1f})")
+    sys.exit(1 if regressions or over_budget or baseline is None else 0)
@@ -0,0 +1,19 @@
+import argparse
+
+from pong_game_classes.rollback import print_loopback_report, run_loopback_test
+
+parser = argparse.ArgumentParser(description="Plays a rollback 2-player match over a simulated loopback link with latency and jitter and reports rollbacks.")
+parser.add_argument("--frames", type=int, default=3600, help="Frames played by each peer")
+parser.add_argument("--latency_ms", type=float, default=60.0, help="One-way link latency")
+parser.add_argument("--jitter_ms", type=float, default=15.0, help="Random +- variation of each packet's latency (packets may reorder)")
+parser.add_argument("--input_delay", type=int, default=2, help="Ticks local input is delayed by (hides that much latency without rollback)")
+parser.add_argument("--max_prediction", type=int, default=8, help="Ticks the simulation may run ahead of the remote input before stalling")
+parser.add_argument("--seed", type=int, default=0, help="Seed of the match and of the link jitter")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    report = run_loopback_test(
+        frames=args.frames, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        input_delay=args.input_delay, max_prediction=args.max_prediction, seed=args.seed
+    )
+    print_loopback_report(report)
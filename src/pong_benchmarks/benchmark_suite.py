@@ -0,0 +1,281 @@
+import gc
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from array import array
+from time import perf_counter, sleep
+
+# offscreen display and silent audio, so the rendering benchmarks run on machines without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from pong_game_classes.ai_controller import AIController
+from pong_game_classes.simulation import PongSimulation
+
+AI_BALL_DISTANCES: tuple = (100, 300, 600, 1100) # ball distance from the ai's paddle, in pixels
+MULTI_BALL_COUNTS: tuple = (1, 10, 100, 1000, 10_000) # chaos mode ball counts
+SLOW_PRESENT_S: float = 0.012 # display update of the pipeline benchmark (a flip waiting on a busy compositor, say)
+# absolute limits (checked even without a baseline): a steady-state frame should allocate next to nothing, so long
+# sessions do not trigger garbage collection pauses
+ALLOCATION_BUDGETS: dict = {
+    "game_loop.retained_bytes_per_frame": 4.0,       # memory still allocated after the frame (leaks, growing caches)
+    "game_loop.frame_alloc_peak_bytes[p99]": 1024.0, # most memory allocated at once during a frame, above its start
+}
+
+
+def _ns_per_call(func, repeats:int) -> dict:
+    """Best-of-repeats time of one call to func (number of calls per repeat calibrated to ~0.2s)."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best: float = min(timer.repeat(repeat=repeats, number=number)) / number
+    return {"value": best * 1e9, "unit": "ns/call", "higher_is_better": False}
+
+
+def _physics_benchmarks(repeats:int) -> dict:
+    simulation = PongSimulation()
+    ball = simulation.ball
+    results: dict = {}
+
+    results["ball.update_trajectory"] = _ns_per_call(ball.update_trajectory, repeats)
+    ball.reset()
+
+    far_rect = simulation.right_paddle.rect # ball is in the middle of the field, no overlap
+    results["ball.check_and_bounce_at_rect_collision[miss]"] = _ns_per_call(lambda: ball.check_and_bounce_at_rect_collision(far_rect), repeats)
+
+    ball.coordinates.update(simulation.left_paddle.rect.centerx + ball.radius, simulation.left_paddle.rect.centery)
+    ball.update_rect()
+    results["ball.check_and_bounce_at_rect_collision[hit]"] = _ns_per_call(lambda: ball.check_and_bounce_at_rect_collision(simulation.left_paddle.rect), repeats)
+    return results
+
+
+def _ai_benchmarks(repeats:int) -> dict:
+    simulation = PongSimulation()
+    ball, paddle = simulation.ball, simulation.right_paddle
+    paddle_position: dict = {"x": paddle.rect.x, "y": paddle.rect.y, "height": paddle.paddle_height}
+    results: dict = {}
+
+    ball.x_direction, ball.angle = 1, 0.5
+    for distance in AI_BALL_DISTANCES:
+        ball.coordinates.update(paddle.rect.x - distance, simulation.field_height * 0.3)
+        snapshot: dict = ball.yield_trajectory_prediction_data()
+        uncached_snapshot: dict = {key: value for key, value in snapshot.items() if key != "trajectory_id"}
+        results[f"ai.predictive_tracking_decision[{distance}px,uncached]"] = _ns_per_call(
+            lambda: AIController._predictive_tracking_decision(uncached_snapshot, paddle_position, simulation.dt), repeats
+        )
+        results[f"ai.predictive_tracking_decision[{distance}px,cached]"] = _ns_per_call(
+            lambda: AIController._predictive_tracking_decision(snapshot, paddle_position, simulation.dt, simulation.intercept_cache), repeats
+        )
+    results["ai.trained_policy_decision"] = _ns_per_call(
+        lambda: AIController.return_decision("trained", snapshot, paddle_position, simulation.dt), repeats
+    )
+    return results
+
+
+def _create_game_loop():
+    """
+        Creates the windowed game (offscreen, uncapped frame rate). parse_cli_args parses sys.argv on import, so the game's
+        own options are swapped in while the game modules are imported, and the caller's are restored after.
+    """
+    argv: list = sys.argv
+    sys.argv = [argv[0], "--fps_cap", "0"]
+    try:
+        from pong_game_loop.game_loop import SCENE_POINT_SCORED, GameLoop
+    finally:
+        sys.argv = argv
+    game_loop = GameLoop()
+    game_loop.game_instance.points_per_game = 10**9 # no winner (and no game over scene) during the benchmark
+    game_loop.scene_durations_ms[SCENE_POINT_SCORED] = 0 # no pause after a point either
+    return game_loop
+
+
+def _rendering_benchmarks(game_loop, repeats:int) -> dict:
+    game = game_loop.game_instance
+    results: dict = {}
+    for render_mode in ("dirty", "flip"):
+        game.render_mode = render_mode
+        results[f"game.draw_objects[{render_mode}]"] = _ns_per_call(
+            lambda: game.draw_objects(ball_obj=game_loop.ball, left_paddle_obj=game_loop.left_paddle, right_paddle_obj=game_loop.right_paddle), repeats
+        )
+        results[f"game.set_screen_text[{render_mode}]"] = _ns_per_call(
+            lambda: game.set_screen_text(msg=game_loop.player_1.get_score_text(), x_offset_mult=0.5, y_offset_mult=0.1), repeats
+        )
+        game.end_frame() # flush the dirty-rect bookkeeping of the calls above
+    game.render_mode = "dirty"
+    return results
+
+
+def _end_to_end_benchmarks(game_loop, frames:int) -> dict:
+    """Frames per second of the full game loop while a match is being played, for each render mode."""
+    from pong_game_loop.game_loop import SCENE_PLAYING
+    game = game_loop.game_instance
+    results: dict = {}
+    for render_mode in ("dirty", "flip"):
+        game.render_mode = render_mode
+        game_loop.set_scene(SCENE_PLAYING)
+        game_loop.run_frame() # first frame of a mode is a full redraw
+        start: float = perf_counter()
+        for _ in range(frames):
+            game_loop.run_frame()
+        results[f"game_loop.fps[{render_mode}]"] = {"value": frames / (perf_counter() - start), "unit": "frames/s", "higher_is_better": True}
+    return results
+
+
+def _multi_ball_benchmarks(game_loop, ball_frames:int) -> dict:
+    """
+        Chaos mode frame time as the ball count grows: the physics tick of every ball (spatial hash broadphase, paddle and
+        ball-versus-ball collisions) and the whole frame (tick plus batched drawing and display update, dirty render mode).
+        Each count runs about ball_frames ball updates (at least 10 frames).
+    """
+    from pong_game_classes.multi_ball import MultiBallArena
+    game = game_loop.game_instance
+    game.render_mode = "dirty"
+    results: dict = {}
+    for ball_count in MULTI_BALL_COUNTS:
+        arena = MultiBallArena(game, game_loop.left_paddle, game_loop.right_paddle, game_loop.player_1, game_loop.player_2, ball_count=ball_count)
+        frames: int = max(10, ball_frames // ball_count)
+        step_time: float = 0.0
+        start: float = perf_counter()
+        for _ in range(frames):
+            game.begin_frame()
+            step_start: float = perf_counter()
+            arena.step()
+            step_time += perf_counter() - step_start
+            game.draw_objects(ball_obj=arena.balls[0], left_paddle_obj=game_loop.left_paddle, right_paddle_obj=game_loop.right_paddle, balls=arena.balls)
+            game.end_frame()
+        frame_time: float = perf_counter() - start
+        results[f"multi_ball.step_us[{ball_count} balls]"] = {"value": step_time / frames * 1e6, "unit": "us/frame", "higher_is_better": False}
+        results[f"multi_ball.frame_us[{ball_count} balls]"] = {"value": frame_time / frames * 1e6, "unit": "us/frame", "higher_is_better": False}
+    game_loop.player_1.reset()
+    game_loop.player_2.reset()
+    game_loop.ball.reset()
+    return results
+
+
+def _pipeline_benchmarks(game_loop, seconds:float) -> dict:
+    """
+        Physics tick jitter (|tick interval - physics_dt|) while a match is played for seconds with a slow display update
+        (SLOW_PRESENT_S, the GIL is released meanwhile as in a real flip): single-threaded, where the ticks due run back to
+        back once per frame, and pipelined (--pipeline), where a simulation thread runs them on schedule.
+    """
+    from pong_game_loop.game_loop import SCENE_PLAYING
+    from pong_game_loop.pipeline import TickPacing
+    game = game_loop.game_instance
+    present = game.end_frame
+    def slow_present() -> None:
+        sleep(SLOW_PRESENT_S)
+        present()
+    game.end_frame = slow_present
+    results: dict = {}
+    try:
+        for loop_name in ("single-threaded", "pipelined"):
+            game_loop.tick_pacing = TickPacing(physics_dt=game.physics_dt)
+            game_loop.set_scene(SCENE_PLAYING)
+            if loop_name == "pipelined": game_loop.start_pipeline()
+            end: float = perf_counter() + seconds
+            while perf_counter() < end:
+                game_loop.run_frame()
+            if game_loop.simulation_thread: game_loop.stop_pipeline()
+            stats: dict = game_loop.tick_pacing.stats()
+            for percentile in ("p50", "p99"):
+                results[f"pipeline.tick_jitter_{percentile}_ms[{loop_name}]"] = {
+                    "value": stats[f"jitter_{percentile}_ms"], "unit": "ms", "higher_is_better": False
+                }
+    finally:
+        del game.end_frame # back to the method
+        game_loop.tick_pacing = None
+    return results
+
+
+def _allocation_benchmarks(game_loop, frames:int) -> dict:
+    """
+        tracemalloc view of steady-state frames (dirty render mode, match in progress, warmed up caches). Retained memory
+        is the median growth of 10 equal chunks of frames, so a one-off allocation (e.g. the text of a new score) is not
+        mistaken for a per-frame leak.
+    """
+    from pong_game_loop.game_loop import SCENE_PLAYING
+    game_loop.game_instance.render_mode = "dirty"
+    game_loop.set_scene(SCENE_PLAYING)
+    for _ in range(120):
+        game_loop.run_frame()
+
+    gen0_collections: list = [0]
+    def count_collections(phase:str, info:dict) -> None:
+        if phase == "start" and info["generation"] == 0: gen0_collections[0] += 1
+    frame_peaks = array("d", bytes(8 * frames)) # preallocated, so recording does not allocate either
+    chunk_memory = array("d", bytes(8 * 11))     # traced memory at the chunk boundaries
+    chunk_frames: int = frames // 10
+    gc.collect()
+    gc.callbacks.append(count_collections)
+    tracemalloc.start()
+    try:
+        for frame_idx in range(chunk_frames * 10):
+            frame_start, _ = tracemalloc.get_traced_memory()
+            if frame_idx % chunk_frames == 0: chunk_memory[frame_idx // chunk_frames] = frame_start
+            tracemalloc.reset_peak()
+            game_loop.run_frame()
+            frame_peaks[frame_idx] = tracemalloc.get_traced_memory()[1] - frame_start
+        chunk_memory[10] = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        gc.callbacks.remove(count_collections)
+
+    peaks: list = sorted(frame_peaks[:chunk_frames * 10])
+    chunk_growth: list = sorted(chunk_memory[chunk_idx + 1] - chunk_memory[chunk_idx] for chunk_idx in range(10))
+    return {
+        "game_loop.retained_bytes_per_frame": {"value": max(0.0, chunk_growth[5] / chunk_frames), "unit": "B/frame", "higher_is_better": False},
+        "game_loop.frame_alloc_peak_bytes[p99]": {"value": peaks[int(len(peaks) * 0.99)], "unit": "B", "higher_is_better": False},
+        "game_loop.gc_gen0_collections_per_1k_frames": {"value": gen0_collections[0] * 1000 / frames, "unit": "1/1k frames", "higher_is_better": False},
+    }
+
+
+def run_benchmark_suite(quick:bool=False) -> dict:
+    repeats: int = 3 if quick else 7
+    results: dict = {}
+    results.update(_physics_benchmarks(repeats))
+    results.update(_ai_benchmarks(repeats))
+    game_loop = _create_game_loop()
+    results.update(_rendering_benchmarks(game_loop, repeats))
+    results.update(_end_to_end_benchmarks(game_loop, frames=500 if quick else 3000))
+    results.update(_allocation_benchmarks(game_loop, frames=500 if quick else 3000))
+    results.update(_multi_ball_benchmarks(game_loop, ball_frames=20_000 if quick else 100_000))
+    results.update(_pipeline_benchmarks(game_loop, seconds=1.0 if quick else 3.0))
+    game_loop.game_instance.close_and_cleanup()
+    return {
+        "meta": {"python": platform.python_version(), "pygame": pygame.version.ver, "platform": platform.platform(), "machine": platform.machine()},
+        "results": results,
+    }
+
+
+def compare_to_baseline(report:dict, baseline:dict, threshold:float) -> list:
+    """Returns (name, baseline value, current value, relative change) rows for results that got worse by more than threshold."""
+    regressions: list = []
+    for name, result in report["results"].items():
+        baseline_result: dict | None = baseline["results"].get(name)
+        if baseline_result is None or baseline_result["value"] == 0 or name in ALLOCATION_BUDGETS: continue # budgets are absolute
+        change: float = (result["value"] - baseline_result["value"]) / baseline_result["value"]
+        if result["higher_is_better"]: change = -change # positive change means slower, whatever the unit
+        if change > threshold:
+            regressions.append((name, baseline_result["value"], result["value"], change))
+    return regressions
+
+
+def check_allocation_budgets(report:dict) -> list:
+    """Returns (name, budget, current value) rows for results over their ALLOCATION_BUDGETS limit."""
+    return [
+        (name, budget, report["results"][name]["value"]) for name, budget in ALLOCATION_BUDGETS.items()
+        if name in report["results"] and report["results"][name]["value"] > budget
+    ]
+
+
+def print_benchmark_report(report:dict, baseline:dict|None=None) -> None:
+    print(f"\n{'benchmark':<58}{'value':>14}  {'unit':<10}{'vs baseline':>12}")
+    for name, result in report["results"].items():
+        vs_baseline: str = ""
+        if baseline and name in baseline["results"] and baseline["results"][name]["value"]: # no ratio to a zero baseline
+            ratio: float = result["value"] / baseline["results"][name]["value"]
+            vs_baseline = f"{ratio:.2f}x"
+        print(f"{name:<58}{result['value']:>14,.1f}  {result['unit']:<10}{vs_baseline:>12}")
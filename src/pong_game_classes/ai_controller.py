@@ -1,15 +1,43 @@
 import random
 
+from misc.get_parent_dir import ROOT_DIR
+from pong_game_classes.policy_table import PolicyTable
+
+DEFAULT_POLICY_FILEPATH: str = str(ROOT_DIR / "resources" / "ai" / "policy.bin") # lookup table of the "trained" difficulty
+
 class AIController:
 
+    _INTERCEPT_CACHE_MAX_SIZE: int = 64                         # per game, a game's ai only ever needs the current trajectories
+    _prediction_stats: dict = {"predictions": 0, "cache_hits": 0}
+    _policy: PolicyTable | None = None                          # "trained" difficulty, loaded on first use
+
     @staticmethod
-    def return_decision(ai_difficulty:str, ball_trajectory_snapshot:dict, paddle_position:dict, game_dt:float) -> str:
+    def return_decision(ai_difficulty:str, ball_trajectory_snapshot:dict, paddle_position:dict, game_dt:float, approach_direction:int=1,
+                        field_size:tuple|None=None, intercept_cache:dict|None=None) -> str:
+        """
+            approach_direction is the ball x-direction heading towards the ai's paddle (1: right paddle, -1: left paddle).
+            field_size is the game's (width, height), the "trained" policy normalizes the state to the field it was trained on.
+            intercept_cache is the game's own cache of predicted intercepts ("hard" difficulty), None to predict every time.
+        """
         if ai_difficulty == "hard":
-            return AIController._predictive_tracking_decision(ball_trajectory_snapshot, paddle_position, game_dt)
-        return AIController._simple_tracking_decision(ball_trajectory_snapshot, paddle_position)
+            return AIController._predictive_tracking_decision(ball_trajectory_snapshot, paddle_position, game_dt, intercept_cache)
+        if ai_difficulty == "trained":
+            if AIController._policy is None: AIController.load_policy(DEFAULT_POLICY_FILEPATH)
+            return AIController._policy.decision(ball_trajectory_snapshot, paddle_position, approach_direction, field_size)
+        return AIController._simple_tracking_decision(ball_trajectory_snapshot, paddle_position, approach_direction)
+
+    @staticmethod
+    def load_policy(filepath:str) -> None:
+        """Memory-maps the lookup-table policy the "trained" difficulty plays (see policy_trainer.py)."""
+        AIController.set_policy(PolicyTable.load(filepath))
+
+    @staticmethod
+    def set_policy(policy:PolicyTable) -> None:
+        if AIController._policy is not None: AIController._policy.close()
+        AIController._policy = policy
 
     @staticmethod    
-    def _predictive_tracking_decision(ball_trajectory_snapshot:dict, paddle_position:dict, game_dt:float) -> str:
+    def _predictive_tracking_decision(ball_trajectory_snapshot:dict, paddle_position:dict, game_dt:float, intercept_cache:dict|None=None) -> str:
         """Logic: Predict where the ball will cross the ai's paddle x-coordinate, by taking into consideration:
             - current ball trajectory
             - anticipated reflection(s)
@@ -26,6 +54,7 @@ class AIController:
                     "y_direction": int
                     "lower_reflection_bound": int   
                     "upper_reflection_bound": int
+                    "trajectory_id": int            (optional, enables caching of the predicted intercept)
                 }
                 - paddle_position (dict):
                 {
@@ -33,33 +62,27 @@ class AIController:
                     "y": int
                     "height": float
                 }    
+                - game_dt (float): unused since the prediction became closed-form, kept for call compatibility
+                - intercept_cache (dict): (trajectory_id, paddle x) -> predicted intercept y-position, owned by the game
+                  (one per match, so concurrent matches never evict each other's entries), None disables caching
         """
         error_percentage: float = 0.05                                                  # set to add error to output
         if random.randint(1 , 2) % 2 == 1:
             error_percentage *= -1                                                      # flip sign if random int is odd                                             
 
-        time_to_cross_x_threshold: float = abs((paddle_position["x"] - ball_trajectory_snapshot["x_position"]) / ball_trajectory_snapshot["x_velocity"])
-
-        ball_y_pos_predicted: int = ball_trajectory_snapshot["y_position"]              # set to current y-position
-        ball_y_velocity_calculated: float = ball_trajectory_snapshot["y_velocity"]      # set to current y-velocity
-
-        time_left: float = time_to_cross_x_threshold                                    # initialize to time for ball to cross x pos of paddle
-
-        while time_left > 0:
-            time_step = min(game_dt, time_left)
-            ball_y_pos_predicted += ball_y_velocity_calculated * time_step
-
-            lower_screen_collision = ball_y_pos_predicted >= ball_trajectory_snapshot["lower_reflection_bound"] 
-            if lower_screen_collision:
-                ball_y_pos_predicted = ball_trajectory_snapshot["lower_reflection_bound"] - (ball_y_pos_predicted - ball_trajectory_snapshot["lower_reflection_bound"])
-                ball_y_velocity_calculated *= -1
-
-            upper_screen_collision = ball_y_pos_predicted <= ball_trajectory_snapshot["upper_reflection_bound"]
-            if upper_screen_collision:
-                ball_y_pos_predicted = ball_trajectory_snapshot["upper_reflection_bound"] + (ball_trajectory_snapshot["upper_reflection_bound"] - ball_y_pos_predicted)
-                ball_y_velocity_calculated *= -1
-     
-            time_left -= time_step
+        # The intercept only depends on the trajectory, so it is computed once per trajectory (until the next bounce or reset)
+        cache_key: tuple | None = None
+        if intercept_cache is not None and ball_trajectory_snapshot.get("trajectory_id") is not None:
+            cache_key = (ball_trajectory_snapshot["trajectory_id"], paddle_position["x"])
+        if cache_key is not None and cache_key in intercept_cache:
+            AIController._prediction_stats["cache_hits"] += 1
+            ball_y_pos_predicted: float = intercept_cache[cache_key]
+        else:
+            AIController._prediction_stats["predictions"] += 1
+            ball_y_pos_predicted: float = AIController._predict_intercept_y(ball_trajectory_snapshot, paddle_position["x"])
+            if cache_key is not None:
+                if len(intercept_cache) >= AIController._INTERCEPT_CACHE_MAX_SIZE: intercept_cache.clear() # only stale trajectories
+                intercept_cache[cache_key] = ball_y_pos_predicted
         
         ball_y_pos_predicted *= (1 - error_percentage) # Adding some error to value to make game more realistic
         if ball_y_pos_predicted < paddle_position["y"] + (paddle_position["height"]*0.5): return "move_up"
@@ -67,7 +90,35 @@ class AIController:
         else: return "stay"
     
     @staticmethod
-    def _simple_tracking_decision(ball_trajectory_snapshot:dict, paddle_position:dict) -> str:
+    def _predict_intercept_y(ball_trajectory_snapshot:dict, paddle_x:float) -> float:
+        """Closed-form O(1) prediction of the ball's y-position when it crosses paddle_x. 
+            Reflections between the upper and lower bounds are folded analytically: the unbounded path is taken modulo
+            one full bounce cycle (2 * field span) and mirrored back when it lands on the return leg.
+        """
+        upper_bound: float = ball_trajectory_snapshot["upper_reflection_bound"]
+        span: float = ball_trajectory_snapshot["lower_reflection_bound"] - upper_bound
+        time_to_cross_x_threshold: float = abs((paddle_x - ball_trajectory_snapshot["x_position"]) / ball_trajectory_snapshot["x_velocity"])
+
+        unfolded_y: float = ball_trajectory_snapshot["y_position"] - upper_bound + ball_trajectory_snapshot["y_velocity"] * time_to_cross_x_threshold
+        folded_y: float = unfolded_y % (2 * span)
+        if folded_y > span: folded_y = 2 * span - folded_y
+        return upper_bound + folded_y
+
+    @staticmethod
+    def get_prediction_stats() -> dict:
+        """Returns how many intercepts were computed vs served from the games' per-trajectory caches."""
+        stats: dict = dict(AIController._prediction_stats)
+        lookups: int = stats["predictions"] + stats["cache_hits"]
+        stats["cache_hit_ratio"] = stats["cache_hits"] / lookups if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def reset_prediction_stats() -> None:
+        AIController._prediction_stats["predictions"] = 0
+        AIController._prediction_stats["cache_hits"] = 0
+
+    @staticmethod
+    def _simple_tracking_decision(ball_trajectory_snapshot:dict, paddle_position:dict, approach_direction:int=1) -> str:
         """
             Simply instructs the paddle's movement based on checking ball's y-position in relation to the paddle's y-position.
         """
@@ -77,7 +128,7 @@ class AIController:
 
         result: str = "stay"
         conditional_value: float = ball_trajectory_snapshot["y_position"] * (1 - error_percentage)
-        if ball_trajectory_snapshot["x_direction"] == 1:
+        if ball_trajectory_snapshot["x_direction"] == approach_direction:
             if conditional_value < paddle_position["y"] + (paddle_position["height"]*0.5): result = "move_up"
             elif conditional_value > paddle_position["y"] + (paddle_position["height"]*0.5): result = "move_down"
         return result
\ No newline at end of file
@@ -0,0 +1,133 @@
+import json
+import threading
+from pathlib import Path
+from time import perf_counter
+
+import pygame
+
+from misc.get_parent_dir import ROOT_DIR
+
+FONT_CACHE_FILEPATH: Path = ROOT_DIR / ".cache" / "fonts.json"
+ICON_FILEPATH: Path = ROOT_DIR / "resources" / "icons" / "pong.jpg"
+SOUNDTRACK_FILEPATH: Path = ROOT_DIR / "resources" / "sounds" / "8bit_music_for_game.mp3"
+
+
+class StartupReport:
+    """
+        Wall-clock breakdown of the startup. mark(phase) attributes the time since the previous mark to a main thread phase
+        (like FrameProfiler.mark); the preloading thread adds its own phases, which overlap the main thread's.
+    """
+
+    def __init__(self, started_at:float|None=None):
+        self.started_at: float = started_at if started_at is not None else perf_counter()
+        self._last_mark: float = self.started_at
+        self.phases: list = []          # (phase, seconds) on the main thread, in order
+        self.preload_phases: list = []  # (phase, seconds) on the preloading thread, in order
+        self.first_frame_at: float | None = None
+        self.preload_done_at: float | None = None
+
+    def first_frame_presented(self) -> None:
+        """Call after every frame until the report is printed, only the first call counts."""
+        if self.first_frame_at is not None: return
+        self.mark("first frame")
+        self.first_frame_at = self._last_mark
+
+    def mark(self, phase:str) -> None:
+        now: float = perf_counter()
+        self.phases.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    def add_phase(self, phase:str, seconds:float) -> None:
+        """A main thread phase timed by the caller (it does not move the lap timer of mark())."""
+        self.phases.append((phase, seconds))
+
+    def add_preload_phase(self, phase:str, seconds:float) -> None:
+        self.preload_phases.append((phase, seconds))
+
+    def print_report(self) -> None:
+        first_frame_ms: float = ((self.first_frame_at or self._last_mark) - self.started_at) * 1000
+        preload_ms: float = ((self.preload_done_at or self._last_mark) - self.started_at) * 1000
+        print(f"\nStartup: first frame on screen after {first_frame_ms:.1f}ms, assets loaded after {preload_ms:.1f}ms")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<24}{seconds * 1000:>9.1f}ms")
+        if self.preload_phases:
+            print("  background preloading (overlaps the phases above):")
+            for phase, seconds in self.preload_phases:
+                print(f"    {phase:<22}{seconds * 1000:>9.1f}ms")
+
+
+class AssetManager:
+    """
+        Startup of the windowed game without pygame.init(): only the display and font modules are initialized up front, so
+        the start screen can be shown right away. The mixer, the icon, the soundtrack and the sound-effects are loaded by a
+        background thread meanwhile (wait() blocks until it is done, ready() polls). Resolved system font paths are cached
+        on disk, so a SysFont lookup does not scan the system fonts on every launch.
+    """
+
+    def __init__(self, enable_sounds:bool=False, startup_report:StartupReport|None=None, font_cache_filepath:Path|None=FONT_CACHE_FILEPATH):
+        self.enable_sounds: bool = enable_sounds
+        self.startup_report: StartupReport | None = startup_report
+        self.font_cache_filepath: Path | None = font_cache_filepath
+        self.icon: pygame.Surface | None = None
+        self.effect_sounds: dict = {}   # effect name -> pygame.mixer.Sound (only with enable_sounds)
+        self.soundtrack_loaded: bool = False
+        self._preload_thread: threading.Thread | None = None
+        self._preload_error: BaseException | None = None
+
+    def init_modules(self) -> None:
+        pygame.display.init()
+        pygame.font.init()
+
+    def font(self, name:str, size:int) -> pygame.font.Font:
+        """pygame.font.SysFont(name, size), with the font file resolved from the on-disk cache when possible."""
+        cache: dict = {}
+        if self.font_cache_filepath is not None and self.font_cache_filepath.exists():
+            try: cache = json.loads(self.font_cache_filepath.read_text())
+            except ValueError: cache = {} # corrupt cache, resolve again
+        if name in cache and (cache[name] is None or Path(cache[name]).exists()):
+            return pygame.font.Font(cache[name], size) # None is pygame's default font, which SysFont falls back to as well
+
+        filepath: str | None = pygame.font.match_font(name) # scans the system fonts (fc-list on linux)
+        if self.font_cache_filepath is not None:
+            cache[name] = filepath
+            self.font_cache_filepath.parent.mkdir(parents=True, exist_ok=True)
+            self.font_cache_filepath.write_text(json.dumps(cache, indent=4))
+        return pygame.font.Font(filepath, size)
+
+    def start_preloading(self, icon_filepath:Path=ICON_FILEPATH, soundtrack_filepath:Path=SOUNDTRACK_FILEPATH) -> None:
+        self._preload_thread = threading.Thread(
+            target=self._preload, args=(icon_filepath, soundtrack_filepath), name="asset-preload", daemon=True
+        )
+        self._preload_thread.start()
+
+    def ready(self) -> bool:
+        return self._preload_thread is not None and not self._preload_thread.is_alive()
+
+    def wait(self) -> None:
+        """Blocks until the preloading thread is done, re-raises anything it failed with."""
+        if self._preload_thread is not None: self._preload_thread.join()
+        if self._preload_error is not None: raise self._preload_error
+
+    def _preload(self, icon_filepath:Path, soundtrack_filepath:Path) -> None:
+        try:
+            self.icon = self._timed("icon", pygame.image.load, str(icon_filepath))
+            if self.enable_sounds:
+                self._timed("mixer init", pygame.mixer.init)
+                self._timed("soundtrack", pygame.mixer.music.load, str(soundtrack_filepath))
+                self.soundtrack_loaded = True
+                try:
+                    from pong_game_classes.sound_synth import load_synthesized_sounds # imports numpy on a synth cache miss
+                    self.effect_sounds = self._timed("sound-effects", load_synthesized_sounds)
+                except (ImportError, KeyError, ValueError, OSError, pygame.error) as error: # e.g. no numpy, a mixer format the synth does not handle
+                    print(f"\nSound-effects disabled, they could not be synthesized: {error!r}")
+                    self.effect_sounds = {}
+        except BaseException as error:
+            self._preload_error = error
+        finally:
+            if self.startup_report: self.startup_report.preload_done_at = perf_counter()
+
+    def _timed(self, phase:str, load, *args):
+        start: float = perf_counter()
+        result = load(*args)
+        if self.startup_report: self.startup_report.add_preload_phase(phase, perf_counter() - start)
+        return result
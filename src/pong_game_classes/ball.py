@@ -1,79 +1,158 @@
 import pygame
-import random
+from itertools import count
 from math import sin
 from enum import Enum
 
+from pong_game_classes.paddle import REFERENCE_FIELD_HEIGHT, REFERENCE_FIELD_WIDTH
+
+_trajectory_ids = count() # process-wide, so trajectory ids never collide between balls (used as an AIController cache key)
+
 class PongBallDirection(Enum):
     DOWN = -1
     UP = 1
     LEFT = -1
     RIGHT = 1
 
+# plain ints of PongBallDirection, so the per-tick code does not pay for enum attribute lookups
+DIRECTION_DOWN: int = PongBallDirection.DOWN.value
+DIRECTION_UP: int = PongBallDirection.UP.value
+DIRECTION_LEFT: int = PongBallDirection.LEFT.value
+DIRECTION_RIGHT: int = PongBallDirection.RIGHT.value
+_SERVE_DIRECTIONS: tuple = (DIRECTION_LEFT, DIRECTION_RIGHT)
+
+# colours are resolved once, a colour name would be parsed again on every draw call
+BALL_COLOR = pygame.Color("white")
+BALL_OUTLINE_COLOR_LEFT = pygame.Color("red")   # ball heading towards the left paddle
+BALL_OUTLINE_COLOR_RIGHT = pygame.Color("blue")
+
 class PongBall:
+    __slots__ = (
+        "radius", "max_speed_x", "max_speed_y", "max_deflection_angle", "color", "outline_color", "game", "coordinates",
+        "previous_coordinates", "x_direction", "y_direction", "current_pcnt_max_speed", "angle", "trajectory_id", "rect",
+        "_draw_center", "_trajectory_snapshot",
+    )
 
-    def __init__(self, radius:float=25.0, max_speed_x:float=900.0, max_speed_y:float=180.0, max_deflect_angle:float=30.0):
-        from pong_game_classes.game import PongGame
-        
-        self.radius: float = radius
-        self.max_speed_x: float = max_speed_x
-        self.max_speed_y: float = max_speed_y
+    def __init__(self, radius:float=25.0, max_speed_x:float=900.0, max_speed_y:float=180.0, max_deflect_angle:float=30.0, game=None):
+        """radius and speeds are for the reference field (1280x720), they are scaled to the game's field size."""
+        if game is None:
+            from pong_game_classes.game import PongGame
+            game = PongGame() # reference to game singleton instance
+
+        x_scale: float = game.field_width / REFERENCE_FIELD_WIDTH
+        y_scale: float = game.field_height / REFERENCE_FIELD_HEIGHT
+        self.radius: float = radius * y_scale
+        self.max_speed_x: float = max_speed_x * x_scale
+        self.max_speed_y: float = max_speed_y * y_scale
         self.max_deflection_angle: float = max_deflect_angle
-        self.color: str = "white"
-        self.outline_color = "blue"
+        self.color: pygame.Color = BALL_COLOR
+        self.outline_color: pygame.Color = BALL_OUTLINE_COLOR_RIGHT
 
-        self.game = PongGame() # reference to game singleton instance
+        self.game = game # PongGame singleton, or a headless PongSimulation
         self.coordinates = pygame.Vector2(self.game.mid_screen_coordinate)
-        self.x_direction = PongBallDirection.LEFT.value
-        self.y_direction = PongBallDirection.UP.value
+        self.previous_coordinates = pygame.Vector2(self.coordinates) # position before the last update_trajectory() call
+        self.x_direction: int = DIRECTION_LEFT
+        self.y_direction: int = DIRECTION_UP
         self.current_pcnt_max_speed: float = 0.5
         self.angle: float = 0.0
-        self.rect = pygame.draw.circle(surface=self.game.screen, color="white", center=self.coordinates, radius=self.radius)
+        self.trajectory_id: int = next(_trajectory_ids) # changes whenever the ball's velocity changes (bounce or reset)
+        self.rect = pygame.Rect(0, 0, self.radius*2, self.radius*2)
+        self.update_rect()
+        self._draw_center = pygame.Vector2(self.coordinates)  # reused by interpolated_coordinates()
+        self._trajectory_snapshot: dict = {}                  # reused by yield_trajectory_prediction_data()
 
 
     def check_and_bounce_at_rect_collision(self, rect_obj:pygame.Rect) -> None:
-        """Handles ball reflections upon horizontal collisions with any rect object passed in."""
-        if rect_obj.colliderect(self.rect):
+        """Handles ball reflections upon horizontal collisions with any rect object passed in.
+            Besides the overlap test, the ball's last move is swept against the rect so a fast ball (or a long frame) cannot tunnel through it.
+        """
+        if rect_obj.colliderect(self.rect) or self._sweep_to_rect_contact(rect_obj):
             self._bounce_off_paddle(rect_obj)
             if self.game.enable_sounds: self.game.play_paddle_hit_sound()
     
     def check_and_bounce_at_horizontal_boundary_collision(self) -> None:
         """Handles ball reflections upon vertical collisions with the screen boundary (lower and upper)."""
-        lower_screen_collision = self.coordinates.y >= self.game.screen.get_height() - self.rect.height
+        lower_screen_collision = self.coordinates.y >= self.game.field_height - self.rect.height
         upper_screen_collision = self.coordinates.y <= self.rect.height/2
         if (lower_screen_collision or upper_screen_collision): 
             self.y_direction *= -1 # reverse direction trick
+            self.trajectory_id = next(_trajectory_ids)
             if self.game.enable_sounds: self.game.play_wall_bounce_sound()
 
-    def update_circle_rect(self):
-        if self.x_direction == PongBallDirection.LEFT.value: self.outline_color = "red"
-        else: self.outline_color = "blue"
-        self.rect = pygame.draw.circle(surface=self.game.screen, color=self.color, center=self.coordinates, radius=self.radius)
-        pygame.draw.arc(surface=self.game.screen, color=self.outline_color, rect=self.rect, start_angle=0, stop_angle=360, width=1)
+    def new_trajectory_id(self) -> None:
+        """Gives the ball a fresh trajectory id, e.g. after its state was overwritten (stale AIController predictions won't match it)."""
+        self.trajectory_id = next(_trajectory_ids)
+
+    def update_rect(self) -> None:
+        """Re-centres the ball's bounding rect on its coordinates (plain geometry, no drawing surface required)."""
+        self.rect.centerx = round(self.coordinates.x)
+        self.rect.centery = round(self.coordinates.y)
+
+    def interpolated_coordinates(self, alpha:float) -> pygame.Vector2:
+        """
+            Position between the previous and the current physics tick (alpha 0: previous, 1: current), used for drawing.
+            The returned vector is reused by the next call, copy it to keep it.
+        """
+        if alpha >= 1.0: return self.coordinates
+        alpha = max(alpha, 0.0)
+        previous, current = self.previous_coordinates, self.coordinates
+        self._draw_center.update(previous.x + (current.x - previous.x) * alpha, previous.y + (current.y - previous.y) * alpha)
+        return self._draw_center
+
+    def update_draw_rect(self, alpha:float=1.0) -> pygame.Vector2:
+        """Moves the rect to the interpolated draw position and picks the outline colour, returns the draw centre (reused vector)."""
+        self.outline_color = BALL_OUTLINE_COLOR_LEFT if self.x_direction == DIRECTION_LEFT else BALL_OUTLINE_COLOR_RIGHT
+        center: pygame.Vector2 = self.interpolated_coordinates(alpha)
+        self.rect.centerx = round(center.x)
+        self.rect.centery = round(center.y)
+        return center
+
+    def update_circle_rect(self, alpha:float=1.0):
+        center: pygame.Vector2 = self.update_draw_rect(alpha)
+        pygame.draw.circle(self.game.screen, self.color, center, self.radius)
+        pygame.draw.circle(self.game.screen, self.outline_color, center, self.radius, 1) # outline (a full-circle arc)
 
     def reset(self):
         """Resets ball coordinates and directional fields to initial defaults."""
         self.coordinates = pygame.Vector2(self.game.mid_screen_coordinate)
-        self.x_direction = random.choice([PongBallDirection.LEFT.value, PongBallDirection.RIGHT.value])
-        self.y_direction = PongBallDirection.UP.value
+        self.previous_coordinates = pygame.Vector2(self.coordinates) # no interpolation/sweep across a reset
+        self.x_direction = self.game.rng.choice(_SERVE_DIRECTIONS)
+        self.y_direction = DIRECTION_UP
         self.current_pcnt_max_speed: float = 0.5
         self.angle:float = 0.0
+        self.trajectory_id = next(_trajectory_ids)
 
     def update_trajectory(self) -> None:
-        """Updates ball trajectory, called every frame."""
+        """Updates ball trajectory, called every frame (every physics tick in fixed timestep mode)."""
+        self.previous_coordinates.update(self.coordinates)
         self.coordinates.x += self.x_direction * self.max_speed_x * self.current_pcnt_max_speed * self.game.dt
         self.coordinates.y += self.y_direction * self.max_speed_y * self.current_pcnt_max_speed * abs(sin(self.angle)) * self.game.dt
 
     def yield_trajectory_prediction_data(self) -> dict:
-        return {
-                "x_position": self.coordinates.x,
-                "y_position": self.coordinates.y,
-                "x_velocity": self.x_direction * self.max_speed_x * self.current_pcnt_max_speed,
-                "y_velocity": self.y_direction * self.max_speed_y * self.current_pcnt_max_speed * abs(sin(self.angle)),
-                "x_direction": self.x_direction,
-                "y_direction": self.y_direction,
-                "lower_reflection_bound": self.game.screen.get_height() - self.rect.height,
-                "upper_reflection_bound": self.rect.height/2
-            }
+        """Trajectory snapshot for the AIController. The same dict is refilled on every call, copy it to keep it."""
+        snapshot: dict = self._trajectory_snapshot
+        snapshot["x_position"] = self.coordinates.x
+        snapshot["y_position"] = self.coordinates.y
+        snapshot["x_velocity"] = self.x_direction * self.max_speed_x * self.current_pcnt_max_speed
+        snapshot["y_velocity"] = self.y_direction * self.max_speed_y * self.current_pcnt_max_speed * abs(sin(self.angle))
+        snapshot["x_direction"] = self.x_direction
+        snapshot["y_direction"] = self.y_direction
+        snapshot["lower_reflection_bound"] = self.game.field_height - self.rect.height
+        snapshot["upper_reflection_bound"] = self.rect.height/2
+        snapshot["trajectory_id"] = self.trajectory_id
+        return snapshot
+
+    def _sweep_to_rect_contact(self, rect_obj:pygame.Rect) -> bool:
+        """Continuous collision test: if the segment travelled since the previous update crossed rect_obj (grown by the ball's size),
+            moves the ball back to the first point of contact and returns True.
+        """
+        if self.previous_coordinates == self.coordinates: return False
+        expanded_rect: pygame.Rect = rect_obj.inflate(self.rect.width, self.rect.height) # ball centre inside <=> ball rect overlaps rect_obj
+        if expanded_rect.collidepoint(self.previous_coordinates): return False             # already overlapping before the move
+        contact_segment: tuple = expanded_rect.clipline(self.previous_coordinates, self.coordinates)
+        if not contact_segment: return False
+        self.coordinates.update(contact_segment[0])
+        self.update_rect()
+        return True
 
     def _bounce_off_paddle(self, rect_obj:pygame.Rect) -> None:
         """Internal method implementation for 'bounce off paddle' logic."""
@@ -90,13 +169,15 @@ class PongBall:
             normalized_dist_from_paddle_center = -1
         
         if (normalized_dist_from_paddle_center < 0):
-            self.y_direction = PongBallDirection.UP.value
+            self.y_direction = DIRECTION_UP
         else:
-            self.y_direction = PongBallDirection.DOWN.value
+            self.y_direction = DIRECTION_DOWN
         
         self.angle = normalized_dist_from_paddle_center * self.max_deflection_angle
         self.x_direction *= -1 # reverse direction trick
         self.current_pcnt_max_speed = min( (self.current_pcnt_max_speed*1.05), 1.0) # increase ball speed pcnt each deflection up to max(1.0)
+        self.trajectory_id = next(_trajectory_ids)
+        if self.game.telemetry is not None: self.game.telemetry.paddle_bounce(self)
         
         if self.game._debug_game:
             print("left paddle collision detected")
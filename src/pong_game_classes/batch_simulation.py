@@ -0,0 +1,214 @@
+import numpy as np
+import pygame
+
+from pong_game_classes.game import POINTS_PER_GAME
+from pong_game_classes.paddle import PADDLE_LEFT_OFFSET, PADDLE_MAX_SPEED, REFERENCE_FIELD_HEIGHT, REFERENCE_FIELD_WIDTH
+
+# paddle move codes used by the batch engine (a paddle 'move_up' decreases its top coordinate)
+MOVE_UP: int = -1
+STAY: int = 0
+MOVE_DOWN: int = 1
+
+class PongBatchSimulation:
+    """
+        Vectorized counterpart of PongSimulation: N independent matches stored as NumPy arrays (one entry per match)
+        and advanced together by a single call to step(). Mirrors the rules of PongBall (paddle deflection, wall
+        reflection, swept paddle collisions, speed ramp, sizes and speeds scaled to the field) and
+        PongGame.check_for_vertical_boundary_collision (scoring), including the integer rounding that pygame.Rect applies
+        to ball and paddle rects.
+    """
+
+    def __init__(self, num_matches:int, field_width:int=1280, field_height:int=720, dt:float=1/60, points_per_game:int=POINTS_PER_GAME,
+                 radius:float=25.0, max_speed_x:float=900.0, max_speed_y:float=180.0, max_deflect_angle:float=30.0, seed:int|None=None):
+        """radius and speeds are for the reference field (1280x720), they are scaled to the field size like PongBall's."""
+        x_scale: float = field_width / REFERENCE_FIELD_WIDTH
+        y_scale: float = field_height / REFERENCE_FIELD_HEIGHT
+        self.num_matches: int = num_matches
+        self.field_width: int = field_width
+        self.field_height: int = field_height
+        self.dt: float = dt
+        self.points_per_game: int = points_per_game
+        self.radius: float = radius * y_scale
+        self.max_speed_x: float = max_speed_x * x_scale
+        self.max_speed_y: float = max_speed_y * y_scale
+        self.paddle_max_speed: float = PADDLE_MAX_SPEED * y_scale
+        self.max_deflection_angle: float = max_deflect_angle
+        self.rng = np.random.default_rng(seed)
+        self.ticks: int = 0
+
+        # geometry shared by every match (same values PongBall/PongPaddle derive from the field size)
+        self.ball_size: int = int(self.radius*2)
+        self.paddle_width: int = int(field_width * 0.025)
+        self.paddle_height: int = int(field_height * 0.25)
+        self.left_paddle_x: int = int(field_width * PADDLE_LEFT_OFFSET)
+        self.right_paddle_x: int = int(field_width * (1 - PADDLE_LEFT_OFFSET) - field_width * 0.025)
+        self.paddle_start_top: float = field_height*0.5 - (field_height * 0.25 * 0.5)
+
+        # per-match state
+        self.ball_x = np.empty(num_matches)
+        self.ball_y = np.empty(num_matches)
+        self.previous_ball_x = np.empty(num_matches) # position before the last move, for the swept paddle collisions
+        self.previous_ball_y = np.empty(num_matches)
+        self.x_direction = np.empty(num_matches)
+        self.y_direction = np.empty(num_matches)
+        self.current_pcnt_max_speed = np.empty(num_matches)
+        self.angle = np.empty(num_matches)
+        self.left_paddle_top = np.empty(num_matches)
+        self.right_paddle_top = np.empty(num_matches)
+        self.score_1 = np.zeros(num_matches, dtype=np.int32)
+        self.score_2 = np.zeros(num_matches, dtype=np.int32)
+        self.winner = np.zeros(num_matches, dtype=np.int8)   # 0: match in progress, 1: player 1 won, 2: player 2 won
+
+        self.reset_match(np.ones(num_matches, dtype=bool))
+        self.x_direction[:] = -1 # PongBall starts moving left, later resets pick a random side
+
+    def _reset_ball_and_paddles(self, mask:np.ndarray) -> None:
+        """Same as PongBall.reset + PongPaddle.reset, applied to the matches selected by mask."""
+        self.ball_x[mask] = self.field_width*0.5
+        self.ball_y[mask] = self.field_height*0.5
+        self.previous_ball_x[mask] = self.ball_x[mask]
+        self.previous_ball_y[mask] = self.ball_y[mask]
+        self.x_direction[mask] = self.rng.choice((-1.0, 1.0), size=np.count_nonzero(mask))
+        self.y_direction[mask] = 1
+        self.current_pcnt_max_speed[mask] = 0.5
+        self.angle[mask] = 0.0
+        self.left_paddle_top[mask] = self.paddle_start_top
+        self.right_paddle_top[mask] = self.paddle_start_top
+
+    def reset_match(self, mask:np.ndarray|None=None) -> None:
+        """Starts new matches (scores back to 0) for the selected matches, by default every finished match."""
+        if mask is None: mask = self.winner != 0
+        self._reset_ball_and_paddles(mask)
+        self.score_1[mask] = 0
+        self.score_2[mask] = 0
+        self.winner[mask] = 0
+
+    def _sweep_to_paddle_contact(self, ball_rect_x:np.ndarray, ball_rect_y:np.ndarray, paddle_x:int, paddle_y:np.ndarray, candidates:np.ndarray) -> np.ndarray:
+        """
+            Vectorized PongBall._sweep_to_rect_contact: moves the balls whose last move crossed the paddle rect grown by
+            the ball's size back to the first point of contact, returns which did. A bounding box test picks the few
+            candidate matches, pygame's clipline() resolves them with the same integer clipping as PongBall.
+        """
+        # pygame.Rect.inflate() of the paddle rect, points are truncated to pixels like collidepoint()/clipline() do
+        left, width = paddle_x - self.ball_size//2, self.paddle_width + self.ball_size
+        top, height = paddle_y - self.ball_size//2, self.paddle_height + self.ball_size
+        previous_x, previous_y = np.trunc(self.previous_ball_x), np.trunc(self.previous_ball_y)
+        current_x, current_y = np.trunc(self.ball_x), np.trunc(self.ball_y)
+        candidates = (
+            candidates
+            & ((self.previous_ball_x != self.ball_x) | (self.previous_ball_y != self.ball_y))
+            & ~((previous_x >= left) & (previous_x < left + width) & (previous_y >= top) & (previous_y < top + height)) # already overlapping before the move
+            & (np.minimum(previous_x, current_x) < left + width) & (np.maximum(previous_x, current_x) >= left)
+            & (np.minimum(previous_y, current_y) < top + height) & (np.maximum(previous_y, current_y) >= top)
+        )
+        swept = np.zeros(self.num_matches, dtype=bool)
+        for match_idx in np.flatnonzero(candidates):
+            contact_segment: tuple = pygame.Rect(left, int(top[match_idx]), width, height).clipline(
+                (self.previous_ball_x[match_idx], self.previous_ball_y[match_idx]), (self.ball_x[match_idx], self.ball_y[match_idx])
+            )
+            if not contact_segment: continue
+            (self.ball_x[match_idx], self.ball_y[match_idx]) = contact_segment[0]
+            ball_rect_x[match_idx] = contact_segment[0][0] - self.ball_size//2
+            ball_rect_y[match_idx] = contact_segment[0][1] - self.ball_size//2
+            swept[match_idx] = True
+        return swept
+
+    def _bounce_off_paddles(self, ball_rect_x:np.ndarray, ball_rect_y:np.ndarray, paddle_x:int, paddle_top:np.ndarray, active:np.ndarray) -> None:
+        """Vectorized PongBall.check_and_bounce_at_rect_collision + _bounce_off_paddle."""
+        paddle_y = np.round(paddle_top) # the paddle rect (PongPaddle keeps a float top, rect.top is round(top))
+        overlap = (
+            (ball_rect_x < paddle_x + self.paddle_width) & (ball_rect_x + self.ball_size > paddle_x)
+            & (ball_rect_y < paddle_y + self.paddle_height) & (ball_rect_y + self.ball_size > paddle_y)
+        )
+        hit = active & overlap
+        hit |= self._sweep_to_paddle_contact(ball_rect_x, ball_rect_y, paddle_x, paddle_y, active & ~overlap)
+        if not hit.any(): return
+
+        dist_from_paddle_center = (paddle_y[hit] - (self.ball_y[hit] - self.paddle_height*0.5)) / self.paddle_height
+        normalized_dist_from_paddle_center = np.clip(2 * np.round(dist_from_paddle_center, 2), -1, 1)
+        self.y_direction[hit] = np.where(normalized_dist_from_paddle_center < 0, 1, -1)
+        self.angle[hit] = normalized_dist_from_paddle_center * self.max_deflection_angle
+        self.x_direction[hit] *= -1
+        self.current_pcnt_max_speed[hit] = np.minimum(self.current_pcnt_max_speed[hit]*1.05, 1.0)
+
+    def _move_paddles(self, paddle_top:np.ndarray, moves:np.ndarray, active:np.ndarray) -> None:
+        """PongPaddle.move_up/move_down (float top) + PongGame.bound_paddle_in_screen_window."""
+        moved = paddle_top + moves * self.paddle_max_speed * self.dt
+        moved = np.clip(moved, 0, self.field_height - self.paddle_height)
+        np.copyto(paddle_top, moved, where=active & (moves != STAY))
+
+    def step(self, left_moves:np.ndarray|int=STAY, right_moves:np.ndarray|int=STAY) -> None:
+        """
+            Advances every unfinished match by one tick, in the same order as PongSimulation.step.
+            Moves are MOVE_UP/STAY/MOVE_DOWN codes, either one per match or a single code for all of them.
+        """
+        active = self.winner == 0
+
+        # ball rect, as re-centred on the ball coordinates at the start of the frame
+        ball_rect_x = np.round(self.ball_x) - self.ball_size//2
+        ball_rect_y = np.round(self.ball_y) - self.ball_size//2
+
+        self._bounce_off_paddles(ball_rect_x, ball_rect_y, self.left_paddle_x, self.left_paddle_top, active)
+        self._bounce_off_paddles(ball_rect_x, ball_rect_y, self.right_paddle_x, self.right_paddle_top, active)
+
+        wall_collision = (self.ball_y >= self.field_height - self.ball_size) | (self.ball_y <= self.ball_size/2)
+        self.y_direction[wall_collision & active] *= -1
+
+        speed = np.where(active, self.current_pcnt_max_speed * self.dt, 0.0)
+        np.copyto(self.previous_ball_x, self.ball_x)
+        np.copyto(self.previous_ball_y, self.ball_y)
+        self.ball_x += self.x_direction * self.max_speed_x * speed
+        self.ball_y += self.y_direction * self.max_speed_y * speed * np.abs(np.sin(self.angle))
+
+        left_paddle_wins = active & (ball_rect_x >= self.field_width - self.ball_size)
+        right_paddle_wins = active & (ball_rect_x <= 0)
+        scored = left_paddle_wins | right_paddle_wins
+        if scored.any():
+            self.score_1 += left_paddle_wins
+            self.score_2 += right_paddle_wins
+            self._reset_ball_and_paddles(scored)
+
+        self._move_paddles(self.left_paddle_top, np.broadcast_to(left_moves, active.shape), active)
+        self._move_paddles(self.right_paddle_top, np.broadcast_to(right_moves, active.shape), active)
+
+        self.winner[active & (self.score_1 == self.points_per_game)] = 1
+        self.winner[active & (self.score_2 == self.points_per_game)] = 2
+        self.ticks += 1
+
+    def ai_moves(self, ai_difficulty:str, left_side_paddle:bool=False) -> np.ndarray:
+        """Vectorized AIController decision for one side of every match, returned as MOVE_UP/STAY/MOVE_DOWN codes."""
+        if left_side_paddle:
+            paddle_x, paddle_top, approach_direction = self.left_paddle_x + self.paddle_width, self.left_paddle_top, -1
+        else:
+            paddle_x, paddle_top, approach_direction = self.right_paddle_x, self.right_paddle_top, 1
+
+        if ai_difficulty == "hard":
+            error_percentage = 0.05
+            # closed-form reflection folding between the upper and lower bounds (see AIController)
+            upper, lower = self.ball_size/2, self.field_height - self.ball_size
+            x_velocity = self.x_direction * self.max_speed_x * self.current_pcnt_max_speed
+            y_velocity = self.y_direction * self.max_speed_y * self.current_pcnt_max_speed * np.abs(np.sin(self.angle))
+            time_to_cross = np.abs((paddle_x - self.ball_x) / x_velocity)
+            folded = np.mod(self.ball_y - upper + y_velocity*time_to_cross, 2*(lower - upper))
+            target_y = upper + np.where(folded > lower - upper, 2*(lower - upper) - folded, folded)
+            tracking = np.ones(self.num_matches, dtype=bool)
+        else:
+            error_percentage = 0.15
+            target_y = self.ball_y
+            tracking = self.x_direction == approach_direction
+
+        target_y = target_y * (1 - error_percentage * self.rng.choice((-1.0, 1.0), size=self.num_matches))
+        paddle_center = np.round(paddle_top) + self.paddle_height*0.5
+        moves = np.where(target_y < paddle_center, MOVE_UP, np.where(target_y > paddle_center, MOVE_DOWN, STAY)).astype(np.int8)
+        moves[~tracking] = STAY
+        return moves
+
+    def run(self, left_difficulty:str="easy", right_difficulty:str="easy", max_ticks:int=36_000) -> np.ndarray:
+        """Plays every match ai vs ai until all are decided (or max_ticks elapse). Returns the winner array."""
+        for _ in range(max_ticks):
+            if self.winner.all(): break
+            self.step(
+                left_moves=self.ai_moves(left_difficulty, left_side_paddle=True),
+                right_moves=self.ai_moves(right_difficulty)
+            )
+        return self.winner
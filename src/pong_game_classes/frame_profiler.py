@@ -0,0 +1,129 @@
+import json
+import queue
+import threading
+from array import array
+from time import perf_counter
+
+PROFILER_PHASES: tuple = ("idle", "events", "input", "physics", "ai", "draw", "text", "flip_tick")
+
+
+class FrameProfiler:
+    """
+        Lap-timer instrumentation for the game loop. mark(phase) attributes the time elapsed since the previous mark to
+        that phase; end_frame() stores the frame's per-phase times in a fixed-size ring buffer (no allocation per frame).
+        Optionally a background thread periodically dumps the history to a .csv or .json file, so file I/O never
+        happens on the game loop's thread.
+    """
+
+    def __init__(self, history_frames:int=1024, dump_path:str|None=None, dump_interval_s:float=5.0, overlay_refresh_s:float=0.5):
+        self.history_frames: int = history_frames
+        self._phase_idx: dict = {phase: idx for idx, phase in enumerate(PROFILER_PHASES)}
+        self._samples = array("d", bytes(8 * history_frames * len(PROFILER_PHASES))) # seconds, [frame][phase]
+        self._frame_times = array("d", bytes(8 * history_frames))
+        self._current = array("d", bytes(8 * len(PROFILER_PHASES)))
+        self._next_idx: int = 0     # ring buffer slot of the next frame
+        self.frames_recorded: int = 0
+        self._last_mark: float = perf_counter()
+        self._frame_start: float = self._last_mark
+
+        self.overlay_refresh_s: float = overlay_refresh_s
+        self._next_overlay_refresh: float = self._last_mark
+        self._overlay_text: str = ""
+
+        self.dump_path: str | None = dump_path
+        self.dump_interval_s: float = dump_interval_s
+        self._next_dump: float = self._last_mark + dump_interval_s
+        self._dump_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._dump_lock: threading.Lock = threading.Lock()
+        if dump_path:
+            threading.Thread(target=self._dump_worker, name="frame-profiler-dump", daemon=True).start()
+
+    def mark(self, phase:str) -> None:
+        now: float = perf_counter()
+        self._current[self._phase_idx[phase]] += now - self._last_mark
+        self._last_mark = now
+
+    def end_frame(self) -> None:
+        """Call once per frame, after the last mark. Commits the frame to the ring buffer."""
+        now: float = perf_counter()
+        phase_count: int = len(PROFILER_PHASES)
+        base: int = self._next_idx * phase_count
+        for phase_idx in range(phase_count):
+            self._samples[base + phase_idx] = self._current[phase_idx]
+            self._current[phase_idx] = 0.0
+        self._frame_times[self._next_idx] = now - self._frame_start
+        self._frame_start = now
+        self._last_mark = now
+        self._next_idx = (self._next_idx + 1) % self.history_frames
+        self.frames_recorded += 1
+
+        if self.dump_path and now >= self._next_dump:
+            self._next_dump = now + self.dump_interval_s
+            try:
+                self._dump_queue.put_nowait(self._snapshot())
+            except queue.Full:
+                pass # previous dump still being written, skip this one rather than block the frame
+
+    def _snapshot(self) -> tuple:
+        """Copies of the recorded frames in chronological order: (per-phase samples, frame times)."""
+        frames: int = min(self.frames_recorded, self.history_frames)
+        oldest: int = (self._next_idx - frames) % self.history_frames
+        order: list = [(oldest + offset) % self.history_frames for offset in range(frames)]
+        phase_count: int = len(PROFILER_PHASES)
+        samples: list = [self._samples[idx * phase_count:(idx + 1) * phase_count].tolist() for idx in order]
+        return samples, [self._frame_times[idx] for idx in order]
+
+    def frame_time_percentiles(self, percentiles:tuple=(50, 99)) -> dict:
+        """Frame time percentiles (in milliseconds) over the recorded history."""
+        frames: int = min(self.frames_recorded, self.history_frames)
+        if frames == 0: return {percentile: 0.0 for percentile in percentiles}
+        frame_times: list = sorted(self._frame_times[:frames]) if frames == self.history_frames else sorted(self._snapshot()[1])
+        return {percentile: frame_times[min(frames - 1, int(frames * percentile / 100))] * 1000 for percentile in percentiles}
+
+    def overlay_text(self) -> str:
+        """p50/p99 frame time line for the on-screen overlay, refreshed every overlay_refresh_s (so the text isn't re-rendered every frame)."""
+        now: float = perf_counter()
+        if now >= self._next_overlay_refresh:
+            self._next_overlay_refresh = now + self.overlay_refresh_s
+            percentiles: dict = self.frame_time_percentiles()
+            self._overlay_text = f"frame p50 {percentiles[50]:.1f}ms  p99 {percentiles[99]:.1f}ms"
+        return self._overlay_text
+
+    def summary(self) -> dict:
+        return self._summarize(*self._snapshot())
+
+    @staticmethod
+    def _summarize(samples:list, frame_times:list) -> dict:
+        frames: int = len(frame_times)
+        if frames == 0: return {"frames": 0, "frame_time_p50_ms": 0.0, "frame_time_p99_ms": 0.0, "phase_mean_ms": {phase: 0.0 for phase in PROFILER_PHASES}}
+        sorted_frame_times: list = sorted(frame_times)
+        return {
+            "frames": frames,
+            "frame_time_p50_ms": sorted_frame_times[min(frames - 1, int(frames * 0.50))] * 1000,
+            "frame_time_p99_ms": sorted_frame_times[min(frames - 1, int(frames * 0.99))] * 1000,
+            "phase_mean_ms": {phase: sum(sample[idx] for sample in samples) / frames * 1000 for idx, phase in enumerate(PROFILER_PHASES)},
+        }
+
+    def close(self) -> None:
+        """Writes the final history (if dumping) and prints a per-phase summary."""
+        samples, frame_times = self._snapshot()
+        if self.dump_path: self._write_dump(samples, frame_times)
+        summary: dict = self._summarize(samples, frame_times)
+        print(f"\nFrame profile (last {summary['frames']} frames): p50 {summary['frame_time_p50_ms']:.2f}ms, p99 {summary['frame_time_p99_ms']:.2f}ms")
+        for phase, mean_ms in summary["phase_mean_ms"].items():
+            print(f"  {phase:<10}{mean_ms:>8.3f}ms mean")
+
+    def _dump_worker(self) -> None:
+        while True:
+            self._write_dump(*self._dump_queue.get())
+
+    def _write_dump(self, samples:list, frame_times:list) -> None:
+        with self._dump_lock:
+            if self.dump_path.endswith(".json"):
+                with open(self.dump_path, "w") as dump_file:
+                    json.dump({"phases": PROFILER_PHASES, "summary": self._summarize(samples, frame_times), "frame_times_s": frame_times, "samples_s": samples}, dump_file)
+            else:
+                with open(self.dump_path, "w") as dump_file:
+                    dump_file.write(",".join(("frame",) + PROFILER_PHASES + ("total",)) + "\n")
+                    for frame_idx, (sample, frame_time) in enumerate(zip(samples, frame_times)):
+                        dump_file.write(f"{frame_idx}," + ",".join(f"{value * 1000:.4f}" for value in sample) + f",{frame_time * 1000:.4f}\n")
@@ -1,70 +1,155 @@
 import pygame
-from time import sleep
+import random
+from collections import deque
+from pathlib import Path
+from time import perf_counter
 
-from misc.get_parent_dir import ROOT_DIR
 from misc.singleton_decorator import singleton
 from pong_game_classes.ai_controller import AIController
+from pong_game_classes.asset_manager import ICON_FILEPATH, SOUNDTRACK_FILEPATH, AssetManager, StartupReport
 from pong_game_classes.ball import PongBall
-from pong_game_classes.paddle import PongPaddle
+from pong_game_classes.paddle import MOVE_TO_PADDLE_INPUT, PADDLE_INPUT_NONE, REFERENCE_FIELD_HEIGHT, PongPaddle
 from pong_game_classes.player import Player
+from pong_game_classes.sound_engine import SoundEngine
+from pong_game_classes.telemetry import MatchTelemetry
+from pong_game_classes.text_cache import TextRenderCache
+
+POINTS_PER_GAME: int = 3 # change this to set the value of match point (shared with the headless simulations)
+MAX_DIRTY_RECTS: int = 256 # with more objects than this on screen (multi-ball mode), redrawing the whole screen is cheaper
 
 @singleton
 class PongGame:
 
-    def __init__(self, screen_width:int=1280, screen_length:int=720, mode:str="ai", ai_difficulty:str="easy", enable_sounds:str="0"):
-        pygame.init()
+    def __init__(self, screen_width:int=1280, screen_length:int=720, mode:str="ai", ai_difficulty:str="easy", enable_sounds:str="0", render_mode:str="dirty",
+                 physics_mode:str="fixed", physics_hz:int=120, fps_cap:int=60, seed:int|None=None, startup_report:StartupReport|None=None,
+                 logical_size:tuple|None=None, scaling:str="gpu", vsync:bool=False):
+        """
+            screen_width/screen_length is the window size. With a logical_size, the game is drawn at that fixed resolution and
+            scaled to the window: by the SDL renderer at present time (scaling "gpu", pygame.SCALED) or by one
+            transform.scale of the changed regions per frame (scaling "software"). Without it the field is the window.
+        """
+        # only the modules the start screen needs are initialized here, the mixer and the assets are loaded in the background
+        self.assets = AssetManager(enable_sounds=bool(int(enable_sounds)), startup_report=startup_report)
+        self.assets.init_modules()
+        self.assets_applied: bool = False   # preloaded assets are in use (see apply_preloaded_assets())
+        self.startup_report: StartupReport | None = startup_report
+        if startup_report: startup_report.mark("pygame modules init")
 
         self.ai_difficulty: str = ai_difficulty
         self.mode: str = mode
         self.enable_sounds: bool = bool(int(enable_sounds))
+        self.render_mode: str = render_mode  # "dirty": only changed regions are pushed to the display, "flip": whole screen every frame
         self._debug_game: bool = False      # set to True to assert debug print statements
+        self.telemetry: MatchTelemetry | None = None # match event recording (--telemetry), None when off
+        self.intercept_cache: dict = {}         # the ai's predictions (see AIController._predictive_tracking_decision)
         self.has_user_started_game: bool = False
         self.quit_game: bool = False
-        self.points_per_game: int = 3       # change this to set the value of match point
-        self.dt: float = 0.0
+        self.points_per_game: int = POINTS_PER_GAME
+        self.seed: int = seed if seed is not None else random.randrange(2**63)
+        self.rng = random.Random(self.seed) # game-play randomness (ball serve direction), seeded so matches can be replayed
+        self.dt: float = 0.0                # seconds advanced by one physics step (the frame time in "variable" physics mode)
+        self.physics_mode: str = physics_mode  # "fixed": physics steps at physics_hz regardless of the frame rate, "variable": one step per frame
+        self.physics_dt: float = 1 / physics_hz
+        self.fps_cap: int = fps_cap          # 0 renders uncapped
+        self._physics_accumulator: float = 0.0
+        self._max_physics_ticks_per_frame: int = max(1, int(0.25 / self.physics_dt)) # catch up at most 0.25s after a hitch
+        if self.physics_mode == "fixed": self.dt = self.physics_dt
         self._caption: str = "PY-PONG!"
-        self._icon_path: str = str(ROOT_DIR) + "\\resources\\icons\\pong.jpg"
-        self._paddle_hit_sound_filepath: str = str(ROOT_DIR) + "\\resources\\sounds\\paddle_hit.wav"
-        self._score_point_sound_filepath: str = str(ROOT_DIR) + "\\resources\\sounds\\score_point.wav"
-        self._wall_bounce_sound_filepath: str = str(ROOT_DIR) + "\\resources\\sounds\\wall_bounce.wav"
-        self._game_soundtrack_filepath: str = str(ROOT_DIR) + "\\resources\\sounds\\8bit_music_for_game.mp3"
-
-        self.screen = pygame.display.set_mode(size=(screen_width, screen_length))
-        self.font = pygame.font.SysFont(name="Comic Sans MS", size=30)
-        self.clock = pygame.time.Clock()
-        self._icon = pygame.image.load(self._icon_path)
-        
+        self._icon_path: Path = ICON_FILEPATH
+        self._game_soundtrack_filepath: Path = SOUNDTRACK_FILEPATH
+
+        self.window_size: tuple = (screen_width, screen_length)
+        self._window: pygame.Surface | None = None # "software" scaling: the window surface the screen is scaled onto
+        if logical_size is None:
+            self.screen = pygame.display.set_mode(size=self.window_size, vsync=int(vsync))
+        elif scaling == "gpu":
+            self.screen = pygame.display.set_mode(size=logical_size, flags=pygame.SCALED, vsync=int(vsync))
+            self._resize_scaled_window()
+        else:
+            self._window = pygame.display.set_mode(size=self.window_size, vsync=int(vsync))
+            self.screen = pygame.Surface(logical_size).convert() # render target, everything draws here
+            self._window_scale: tuple = (self._window.get_width() / self.screen.get_width(), self._window.get_height() / self.screen.get_height())
         pygame.display.set_caption(self._caption)
-        pygame.display.set_icon(self._icon)
+        if startup_report: startup_report.mark("display")
+        self.assets.start_preloading(icon_filepath=self._icon_path, soundtrack_filepath=self._game_soundtrack_filepath)
 
+        self.field_width: int = self.screen.get_width()
+        self.field_height: int = self.screen.get_height()
         self.mid_screen_coordinate: tuple = (self.screen.get_width()*0.5, self.screen.get_height()*0.5) # [0]: x-coordinate, [1]: y-coordinate
+        self.field_scale: float = self.field_height / REFERENCE_FIELD_HEIGHT # text and line sizes scale like the paddles and the ball
+
+        self.font = self.assets.font(name="Comic Sans MS", size=round(30 * self.field_scale))
+        self.text_cache = TextRenderCache(font=self.font)
+        if startup_report: startup_report.mark("font")
+        self.clock = pygame.time.Clock()
+        self.clock.tick() # starts SDL's timer, pygame.time.get_ticks() returns 0 until then (pygame.init() used to start it)
+
+        # static layer (black field, divide line and boundary lines) is rendered once and blitted instead of redrawn
+        self._background: pygame.Surface = self._render_static_background()
+        self._full_redraw_pending: bool = True  # first frame (and any frame after text disappears) pushes the whole screen
+        self._update_rects: list = []           # regions to push to the display at the end of this frame
+        self._erased_rects: list = []           # object regions restored from the background at the start of this frame
+        self._drawn_object_rects: list = []     # object regions drawn this frame (erased at the start of the next one)
+        self._text_blits: dict = {}             # text destination -> surface drawn there this frame
+        self._previous_text_blits: dict = {}
+        self.last_present_time: float = 0.0     # perf_counter() when the last frame was pushed to the display
+        self._ball_sprites: dict = {}           # (radius, x direction) -> pre-rendered ball, see draw_balls()
+        self._ball_blit_sequence: list = []     # reused by draw_balls()
+        if startup_report: startup_report.mark("background")
+
+        # sound-effects are synthesized (or read from the synth cache) by the preloading thread, so playing them in the game
+        # loop never hits the disk; until apply_preloaded_assets() there is no sound
+        self.sound_engine: SoundEngine | None = None
+        self.deferred_sounds: deque | None = None # set while physics runs on another thread (pipelined mode), see play_deferred_sounds()
+
+    def apply_preloaded_assets(self, wait:bool=False) -> bool:
+        """
+            Puts the assets of the preloading thread to use (window icon, sound-effects, soundtrack), once. Returns False if
+            they are not loaded yet; with wait, blocks until they are. Call every frame until it returns True.
+        """
+        if self.assets_applied: return True
+        if not self.assets.ready():
+            if not wait: return False
+            wait_start: float = perf_counter()
+            self.assets.wait()
+            if self.startup_report: self.startup_report.add_phase("waiting for preload", perf_counter() - wait_start)
+        self.assets.wait() # re-raises a preloading error
+        pygame.display.set_icon(self.assets.icon)
+        if self.enable_sounds:
+            if self.assets.effect_sounds: # empty if the sound-effects could not be synthesized, the soundtrack still plays
+                self.sound_engine = SoundEngine(
+                    effect_sounds=self.assets.effect_sounds,
+                    min_interval_ms={"paddle_hit": 60, "wall_bounce": 60, "score_point": 250}
+                )
+            self.play_game_soundtrack()
+        self.assets_applied = True
+        return True
 
+    def begin_frame(self) -> None:
+        """
+            Wipes away anything from last frame (replaces a full screen.fill()). Put this at the very start of the game loop.
+            In "dirty" render mode only the regions where objects were drawn last frame are restored from the background.
+        """
+        # the bookkeeping lists and dicts are swapped and cleared rather than re-created, a frame allocates no new containers
+        if len(self._drawn_object_rects) > MAX_DIRTY_RECTS: self._full_redraw_pending = True
+        if self.render_mode == "flip" or self._full_redraw_pending:
+            self.screen.blit(self._background, (0, 0))
+            self._previous_text_blits.clear()
+            self._erased_rects.clear()
+        else:
+            for rect in self._drawn_object_rects:
+                self.screen.blit(self._background, rect, area=rect)
+            self._erased_rects, self._drawn_object_rects = self._drawn_object_rects, self._erased_rects
+            self._update_rects.extend(self._erased_rects)
+        self._drawn_object_rects.clear()
 
     def bound_paddle_in_screen_window(self, paddle_obj: PongPaddle):
         """Call this every frame to ensure the paddle cannot 'escape' the game window."""
-        paddle_obj.rect.top = min(paddle_obj.rect.top, (self.screen.get_height() - paddle_obj.rect.height) )
-        paddle_obj.rect.top = max(paddle_obj.rect.top, 0)
+        paddle_obj.set_top(max(min(paddle_obj.top, self.screen.get_height() - paddle_obj.rect.height), 0))
     
-    def check_if_user_has_started_game(self) -> bool:
-        """Returns True if the user has started the game, otherwise returns False."""
-        if self.has_user_started_game:
-            return True
-        else:
-            keys_pressed = pygame.key.get_pressed()
-
-            if keys_pressed[pygame.K_SPACE]:
-                self.has_user_started_game = True
-            return self.has_user_started_game
-
     def check_if_user_quit(self) -> bool:
-        """Returns True if the user attempts to close the game window, otherwise returns False."""
-        
-        for event in pygame.event.get():
-            #print(event)
-            if event.type == pygame.QUIT:
-                #print("debug -")
-                self.quit_game = True
-            return self.quit_game
+        """Returns True if the user attempts to close the game window, otherwise returns False (quit events are pumped by the game loop's InputManager)."""
+        return self.quit_game
 
     def check_for_vertical_boundary_collision(
             self, ball_obj: PongBall, left_paddle_obj: PongPaddle, right_paddle_obj: PongPaddle, player_1_obj:Player, player_2_obj:Player
@@ -80,25 +165,23 @@ class PongGame:
                 player_1_obj.increment_score()
             else:
                 player_2_obj.increment_score()
+            if self.telemetry is not None: self.telemetry.point_scored(
+                scorer="left" if left_paddle_wins else "right", score=(player_1_obj.get_score(), player_2_obj.get_score()), ball=ball_obj
+            )
             ball_obj.reset()
             left_paddle_obj.reset()
             right_paddle_obj.reset()
-            pygame.display.flip()
             
-    def check_for_winner(self, player_1_obj:Player, player_2_obj:Player) -> None:
-        """Checks for winner and updates game state accordingly."""
-        players = (player_1_obj, player_2_obj)
-        x_offsets = (0.6, 1.2)
-
-        for idx, player in enumerate(players):
-            if player.get_score() == self.points_per_game:
-                player_1_obj.reset()
-                player_2_obj.reset()
-                self.set_screen_text(msg=f"{player.get_name()} WINS.", x_offset_mult=x_offsets[idx], y_offset_mult=1.35)
-                self.has_user_started_game = False
-                pygame.display.flip()
+    def check_for_winner(self, player_1_obj:Player, player_2_obj:Player) -> Player | None:
+        """Returns the player that reached match point (or None). Does not block, showing the result and resetting the scores is left to the game loop."""
+        for player in (player_1_obj, player_2_obj):
+            if player.get_score() >= self.points_per_game: # several points can be scored in one tick in multi-ball mode
                 if self.enable_sounds: self.play_game_soundtrack()
-                sleep(3) # TODO: Try to figure out a better way to transition between games than just having this arbitrary delay.
+                if self.telemetry is not None: self.telemetry.match_won(
+                    winner="left" if player is player_1_obj else "right", score=(player_1_obj.get_score(), player_2_obj.get_score())
+                )
+                return player
+        return None
 
     def close_and_cleanup(self) -> None:
         """Simply a wrapper around pygame.quit() for now, if additional cleanup clode is needed it should be included here."""
@@ -113,90 +196,245 @@ class PongGame:
 
             print(f"left paddle coordinates: ({left_paddle_obj.rect.x}, {left_paddle_obj.rect.y})") 
             print(f"right paddle coordinates: ({right_paddle_obj.rect.x}, {right_paddle_obj.rect.y})") 
-            print(f"ball coordinates: ({round(ball_obj.coordinates.x,2)}, {round(ball_obj.coordinates.y,2)})\n") 
+            print(f"ball coordinates: ({round(ball_obj.coordinates.x,2)}, {round(ball_obj.coordinates.y,2)})") 
+            print(f"ai intercept predictions: {AIController.get_prediction_stats()}")
+            print(f"text cache hit ratio: {self.text_cache.hit_ratio():.3f} ({self.text_cache.hits} hits, {self.text_cache.misses} renders)\n")
 
-    def draw_objects(self, ball_obj: PongBall, left_paddle_obj: PongPaddle, right_paddle_obj: PongPaddle) -> None:
-        """This method is responsible for drawing all of the screen objects (exclusive of text) and is invoked every frame."""
+    def draw_objects(self, ball_obj: PongBall, left_paddle_obj: PongPaddle, right_paddle_obj: PongPaddle, alpha:float=1.0, balls:list|None=None) -> None:
+        """This method is responsible for drawing all of the screen objects (exclusive of text) and is invoked every frame.
+            alpha interpolates moving objects between the last two physics ticks (see interpolation_alpha()).
+            balls (multi-ball mode) are drawn batched instead of ball_obj.
+        """
         #pygame.draw.circle(surface=self.screen, color="white", center=ball_obj.coordinates, radius=ball_obj.radius)
-        ball_obj.update_circle_rect()
-        pygame.draw.rect(surface=self.screen, color=left_paddle_obj.color, rect=left_paddle_obj.rect)
-        pygame.draw.rect(surface=self.screen, color=right_paddle_obj.color, rect=right_paddle_obj.rect)
+        if balls is None:
+            ball_obj.update_circle_rect(alpha)
+            self._mark_object_drawn(ball_obj.rect)
+        else:
+            self.draw_balls(balls, alpha)
+        left_paddle_rect: pygame.Rect = left_paddle_obj.interpolated_rect(alpha)
+        right_paddle_rect: pygame.Rect = right_paddle_obj.interpolated_rect(alpha)
+        pygame.draw.rect(surface=self.screen, color=left_paddle_obj.color, rect=left_paddle_rect)
+        pygame.draw.rect(surface=self.screen, color=right_paddle_obj.color, rect=right_paddle_rect)
+        # (the screen divide and boundary lines are part of the pre-rendered background)
 
-        # vertical screen divide line
-        pygame.draw.line(surface=self.screen, color="gray", start_pos=(self.mid_screen_coordinate[0], 0), end_pos=(self.mid_screen_coordinate[0], self.screen.get_height()))
-        # top horizontal boundary line
-        pygame.draw.line(surface=self.screen, color="gray", start_pos=(0, 0), end_pos=(self.screen.get_width(), 0), width=15) 
-        # bottom horizontal boundary line
-        pygame.draw.line(surface=self.screen, color="gray", start_pos=(0, self.screen.get_height()), end_pos=(self.screen.get_width(), self.screen.get_height()), width=15) 
+        self._mark_object_drawn(left_paddle_rect)
+        self._mark_object_drawn(right_paddle_rect)
+
+    def draw_balls(self, balls:list, alpha:float=1.0) -> None:
+        """
+            Batched drawing of many balls: every ball is a blit of a sprite rendered once per outline colour, and all
+            of them go to the screen in a single Surface.blits() call instead of two circle draws per ball.
+        """
+        blit_sequence: list = self._ball_blit_sequence
+        blit_sequence.clear()
+        for ball in balls:
+            ball.update_draw_rect(alpha)
+            sprite: pygame.Surface | None = self._ball_sprites.get((ball.radius, ball.x_direction)) # the outline colour follows the direction
+            if sprite is None: sprite = self._render_ball_sprite(ball)
+            blit_sequence.append((sprite, ball.rect))
+        self.screen.blits(blit_sequence, doreturn=False)
+        for ball in balls:
+            self._mark_object_drawn(ball.rect)
+
+    def _render_ball_sprite(self, ball:PongBall) -> pygame.Surface:
+        """Pre-rendered ball (fill and outline) for draw_balls(), black is transparent."""
+        sprite = pygame.Surface(ball.rect.size).convert()
+        sprite.fill("black")
+        sprite.set_colorkey("black", pygame.RLEACCEL)
+        center: tuple = (ball.rect.width * 0.5, ball.rect.height * 0.5)
+        pygame.draw.circle(sprite, ball.color, center, ball.radius)
+        pygame.draw.circle(sprite, ball.outline_color, center, ball.radius, 1)
+        self._ball_sprites[(ball.radius, ball.x_direction)] = sprite
+        return sprite
 
     def end_frame(self) -> None: 
         """
             Ends the frame with displaying pending updates to the display and updating the dt for the game loop. 
             Put this at the very end of the game loop.
         """
-        pygame.display.flip() # flip() the display to put your work on screen
+        if self._window is not None:
+            self._present_software_scaled()
+        elif self.render_mode == "flip" or self._full_redraw_pending:
+            pygame.display.flip() # flip() the display to put your work on screen
+            self._full_redraw_pending = False
+        else:
+            pygame.display.update(self._update_rects) # only push the regions that changed this frame
+        self.last_present_time = perf_counter()
 
-        # limits FPS to 60
-        # dt is delta time in seconds since last frame, used for framerate-independent physics
-        self.dt = self.clock.tick(60) / 1000
+        # text that was on screen last frame but not drawn this frame has to be wiped, simplest is a full redraw
+        if any(dest not in self._text_blits for dest in self._previous_text_blits):
+            self._full_redraw_pending = True
+        self._previous_text_blits, self._text_blits = self._text_blits, self._previous_text_blits
+        self._text_blits.clear()
+        self._update_rects.clear()
+
+        # limits FPS to fps_cap (60 by default, 0 is uncapped)
+        # frame_dt is delta time in seconds since last frame, used for framerate-independent physics
+        frame_dt: float = self.clock.tick(self.fps_cap) / 1000
+        if self.physics_mode == "variable":
+            self.dt = frame_dt
+        elif self.has_user_started_game:
+            self._physics_accumulator += frame_dt
+
+    def has_pending_redraw(self) -> bool:
+        """True if the next frame has to redraw the whole screen (e.g. text disappeared), so what is on screen is not final yet."""
+        return self._full_redraw_pending
+
+    def interpolation_alpha(self) -> float:
+        """How far (0-1) the render time is between the last two physics ticks. Always 1 (no interpolation) in "variable" physics mode."""
+        if self.physics_mode == "variable": return 1.0
+        return self._physics_accumulator / self.physics_dt
+
+    def physics_ticks_due(self) -> int:
+        """
+            Returns how many physics ticks to run this frame. In "fixed" physics mode, frame time is accumulated and consumed
+            in physics_dt steps (the remainder carries over to the next frame); after a hitch at most 0.25s is caught up.
+        """
+        if self.physics_mode == "variable": return 1
+        ticks: int = int(self._physics_accumulator / self.physics_dt)
+        if ticks > self._max_physics_ticks_per_frame:
+            ticks = self._max_physics_ticks_per_frame
+            self._physics_accumulator = 0.0
+        else:
+            self._physics_accumulator -= ticks * self.physics_dt
+        return ticks
 
-    def make_move_for_ai(self, ball_obj: PongBall, right_paddle_obj: PongPaddle):
+    def make_move_for_ai(self, ball_obj: PongBall, right_paddle_obj: PongPaddle) -> int:
+        """Moves the ai's paddle, returns the applied PADDLE_INPUT_* flags."""
         # Need to get move from computer (either 'move_down', 'move_up', or 'stay' should be returned)
         computer_move: str = AIController.return_decision(
             ai_difficulty=self.ai_difficulty,
             ball_trajectory_snapshot=ball_obj.yield_trajectory_prediction_data(),
-            paddle_position={"x": right_paddle_obj.rect.x, "y": right_paddle_obj.rect.y, "height": right_paddle_obj.paddle_height},
-            game_dt=self.dt
+            paddle_position=right_paddle_obj.ai_position(),
+            game_dt=self.dt,
+            field_size=(self.field_width, self.field_height),
+            intercept_cache=self.intercept_cache
+        )
+        if self.telemetry is not None: self.telemetry.ai_decision(
+            side="right", ai_difficulty=self.ai_difficulty, move=computer_move, trajectory_id=ball_obj.trajectory_id,
+            ball_y=ball_obj.coordinates.y, paddle_y=right_paddle_obj.rect.centery
         )
-        if computer_move == "move_down": right_paddle_obj.move_down()
-        elif computer_move == "move_up": right_paddle_obj.move_up()
+        ai_input: int = MOVE_TO_PADDLE_INPUT[computer_move]
+        right_paddle_obj.apply_input(ai_input)
+        return ai_input
 
-    def map_user_key_press(self, left_paddle_obj: PongPaddle, right_paddle_obj: PongPaddle) -> None:
+    def apply_player_inputs(self, left_paddle_obj: PongPaddle, right_paddle_obj: PongPaddle, left_input:int, right_input:int) -> tuple:
         """
-            Scans for user keyboard presses and moves the paddles accordingly.
-            Left paddle controls: 'a' moves the left paddle up, 's' moves the left paddle down.
-            Right paddle controls (2-player mode only): 'up arrow' moves the right paddle up, 'down arrow' moves the right paddle down.
+            Moves the players' paddles by their PADDLE_INPUT_* flags for this tick (see InputManager.paddle_inputs(), default
+            controls: 'a'/'s' move the left paddle, the up/down arrow keys move the right paddle in 2-player mode).
+            Returns the applied (left, right) flags.
         """
-        keys_pressed = pygame.key.get_pressed()
+        left_paddle_obj.apply_input(left_input)
+        if self.mode != "2p": right_input = PADDLE_INPUT_NONE
+        right_paddle_obj.apply_input(right_input)
+        return left_input, right_input
 
-        if keys_pressed[pygame.K_a]:
-            left_paddle_obj.move_up()
-        if keys_pressed[pygame.K_s]:
-            left_paddle_obj.move_down()
-        
-        if self.mode == "2p":
-            if keys_pressed[pygame.K_DOWN]:
-                right_paddle_obj.move_down()
-            if keys_pressed[pygame.K_UP]:
-                right_paddle_obj.move_up()
+    def play_sound(self, effect:str):
+        """Plays a preloaded sound effect once (on the sound-effect channels, the soundtrack keeps playing)."""
+        if self.deferred_sounds is not None:
+            self.deferred_sounds.append(effect) # called from the simulation thread, played by the main thread
+        elif self.sound_engine is not None:
+            self.sound_engine.play(effect)
 
-    def play_sound(self, filepath:str):
-        """Plays bounce sound effect once."""
-        pygame.mixer.music.load(filename=filepath)
-        pygame.mixer.music.play()
+    def play_deferred_sounds(self) -> None:
+        """Plays the sound-effects queued by the simulation thread since the last call (pipelined mode, main thread only)."""
+        deferred_sounds: deque = self.deferred_sounds
+        while deferred_sounds:
+            effect: str = deferred_sounds.popleft()
+            if self.sound_engine is not None: self.sound_engine.play(effect)
 
     def play_paddle_hit_sound(self):
-        self.play_sound(filepath=self._paddle_hit_sound_filepath)
+        self.play_sound(effect="paddle_hit")
 
     def play_wall_bounce_sound(self):
-        self.play_sound(filepath=self._wall_bounce_sound_filepath)
+        self.play_sound(effect="wall_bounce")
 
     def play_score_point_sound(self):
-        self.play_sound(filepath=self._score_point_sound_filepath)
+        self.play_sound(effect="score_point")
 
     def play_game_soundtrack(self):
-        """Plays bounce sound effect in an infinite-loop."""
-        pygame.mixer.music.load(filename=self._game_soundtrack_filepath)
+        """Plays the soundtrack (loaded by the preloading thread) from the start in an infinite-loop."""
+        if not self.assets.soundtrack_loaded: return
         pygame.mixer.music.play(loops=-1)
 
+    def _mark_object_drawn(self, rect:pygame.Rect) -> None:
+        """Registers a region drawn this frame (padded for circle/arc overdraw) so it gets pushed now and erased next frame."""
+        dirty_rect: pygame.Rect = rect.inflate(4, 4).clip(self.screen.get_rect())
+        self._drawn_object_rects.append(dirty_rect)
+        self._update_rects.append(dirty_rect)
+
+    def _present_software_scaled(self) -> None:
+        """Scales the screen onto the window and pushes it: the whole screen, or in "dirty" render mode only the changed regions."""
+        if self.render_mode == "flip" or self._full_redraw_pending:
+            pygame.transform.scale(self.screen, self._window.get_size(), self._window)
+            pygame.display.flip()
+            self._full_redraw_pending = False
+            return
+        x_scale, y_scale = self._window_scale
+        screen_rect: pygame.Rect = self.screen.get_rect()
+        window_rects: list = []
+        for rect in self._update_rects:
+            rect = rect.clip(screen_rect)
+            # region edges are mapped with the same rounding everywhere, so neighbouring regions line up
+            left, top = int(rect.left * x_scale), int(rect.top * y_scale)
+            window_rect = pygame.Rect(left, top, int(rect.right * x_scale) - left, int(rect.bottom * y_scale) - top)
+            if not window_rect.width or not window_rect.height: continue
+            pygame.transform.scale(self.screen.subsurface(rect), window_rect.size, self._window.subsurface(window_rect))
+            window_rects.append(window_rect)
+        pygame.display.update(window_rects)
+
+    def _resize_scaled_window(self) -> None:
+        """pygame.SCALED picks the largest integer multiple of the logical size that fits the desktop, this sets the requested window size."""
+        try:
+            from pygame._sdl2.video import Window
+            Window.from_display_module().size = self.window_size
+        except (ImportError, AttributeError, pygame.error):
+            pass # keep pygame's choice
+
+    def _render_static_background(self) -> pygame.Surface:
+        """Renders the parts of the screen that never move (black field, screen divide and boundary lines) once."""
+        background = pygame.Surface(self.screen.get_size()).convert()
+        background.fill("black")
+        # vertical screen divide line
+        pygame.draw.line(surface=background, color="gray", start_pos=(self.mid_screen_coordinate[0], 0), end_pos=(self.mid_screen_coordinate[0], self.screen.get_height()))
+        boundary_line_width: int = max(1, round(15 * self.field_scale))
+        # top horizontal boundary line
+        pygame.draw.line(surface=background, color="gray", start_pos=(0, 0), end_pos=(self.screen.get_width(), 0), width=boundary_line_width) 
+        # bottom horizontal boundary line
+        pygame.draw.line(surface=background, color="gray", start_pos=(0, self.screen.get_height()), end_pos=(self.screen.get_width(), self.screen.get_height()), width=boundary_line_width) 
+        return background
+
     def return_rect(self, object_containing_rect):
         """Adapter that takes in an object containing a Pygame.Rect field and returns the Rect."""
         return object_containing_rect.rect
 
-    def set_screen_text(self, msg:str, x_offset_mult:float, y_offset_mult:float) -> None:
+    def resume_physics_clock(self) -> None:
+        """Call when play (re)starts: drops the time accumulated while physics was paused, the next frame starts from a fresh step."""
+        self._physics_accumulator = 0.0
+        if self.physics_mode == "variable": self.dt = self.physics_dt # last frame's dt may include an idle wait
+
+    def set_screen_text(self, msg:str, x_offset_mult:float, y_offset_mult:float, bottom_aligned:bool=False) -> None:
         """Multipliers are to offset text coordinate to ideal location on screen 
             (referenced to center of the screen, e.g., x_offset_mult=1, y_offset_mult1 would center the text in the middle of the screen)
+            The offset places the text's top edge, or its bottom edge if bottom_aligned (text that must end above the bottom of the screen).
         """
         x: float = self.mid_screen_coordinate[0] * x_offset_mult
         y: float = self.mid_screen_coordinate[1] * y_offset_mult
-        self.screen.blit(self.font.render(msg, False, "white"), dest=(x, y))
\ No newline at end of file
+        text_surface: pygame.Surface = self.text_cache.render(msg, "white", False)
+        if bottom_aligned: y -= text_surface.get_height()
+        if self.render_mode == "flip":
+            self.screen.blit(text_surface, dest=(x, y))
+            return
+
+        # dirty render mode: unchanged text is left alone unless an object was erased or drawn over it this frame
+        text_rect: pygame.Rect = text_surface.get_rect(topleft=(x, y))
+        previous_surface: pygame.Surface | None = self._previous_text_blits.get((x, y))
+        self._text_blits[(x, y)] = text_surface
+        if previous_surface is text_surface and text_rect.collidelist(self._erased_rects) == -1 and text_rect.collidelist(self._drawn_object_rects) == -1:
+            return
+        if previous_surface is not None and previous_surface is not text_surface:
+            previous_rect: pygame.Rect = previous_surface.get_rect(topleft=(x, y))
+            self.screen.blit(self._background, previous_rect, area=previous_rect)
+            self._update_rects.append(previous_rect)
+        self.screen.blit(text_surface, dest=(x, y))
+        self._update_rects.append(text_rect)
\ No newline at end of file
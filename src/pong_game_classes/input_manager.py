@@ -0,0 +1,123 @@
+from array import array
+from time import perf_counter
+
+import pygame
+
+from pong_game_classes.paddle import PADDLE_INPUT_DOWN, PADDLE_INPUT_NONE, PADDLE_INPUT_UP
+
+INPUT_ACTIONS: tuple = ("left_up", "left_down", "right_up", "right_down", "start")
+DEFAULT_KEY_BINDINGS: dict = {"left_up": ("a",), "left_down": ("s",), "right_up": ("up",), "right_down": ("down",), "start": ("space",)}
+# paddle actions -> (left side paddle, PADDLE_INPUT_* flag)
+_PADDLE_ACTIONS: dict = {
+    "left_up": (True, PADDLE_INPUT_UP), "left_down": (True, PADDLE_INPUT_DOWN),
+    "right_up": (False, PADDLE_INPUT_UP), "right_down": (False, PADDLE_INPUT_DOWN),
+}
+
+
+def parse_key_bindings(bindings:list|None) -> dict:
+    """[(action, key name), ...] (from --bind) -> {action: (key names, ...)}. Binding an action replaces its default keys."""
+    key_bindings: dict = {}
+    for action, key_name in bindings or ():
+        key_bindings[action] = key_bindings.get(action, ()) + (key_name,)
+    return key_bindings
+
+
+class InputManager:
+    """
+        The only place the pygame event queue is drained: pump() is called once per frame and turns key events into
+        press/release actions. Paddle input is then resolved per physics tick (paddle_inputs()): a key counts for the first
+        tick after the pump that read its press even if it was already released, so a tap shorter than a frame still moves
+        the paddle for (at least) one tick. pygame does not expose when an event was queued, so presses are timed at the
+        pump that read them and there is no finer timing within a frame to honour.
+    """
+
+    def __init__(self, key_bindings:dict|None=None, right_paddle_enabled:bool=True, latency_history:int=512):
+        bindings: dict = {**DEFAULT_KEY_BINDINGS, **(key_bindings or {})}
+        if not right_paddle_enabled: # the ai moves the right paddle, its keys stay unbound
+            bindings["right_up"], bindings["right_down"] = (), ()
+        self._key_to_actions: dict = {} # key code -> actions bound to it
+        for action, key_names in bindings.items():
+            if action not in INPUT_ACTIONS: raise ValueError(f"unknown input action '{action}', expected one of {INPUT_ACTIONS}")
+            for key_name in key_names:
+                self._key_to_actions.setdefault(pygame.key.key_code(key_name), []).append(action)
+
+        self.quit_requested: bool = False
+        self.pressed_this_frame: set = set()    # actions pressed during the last pump
+        self._held: dict = {action: False for action in INPUT_ACTIONS}
+        self._unticked_presses: dict = {}       # action -> pump time of its press, until a physics tick used it
+
+        # pump-to-present latency: from the pump that read a press that moved a paddle until the frame showing the move was
+        # pushed to the display (the time the event waited in the queue before the pump is not known, see the class docstring)
+        self._pending_press_times: list = []
+        self._latency_ms = array("d", bytes(8 * latency_history)) # ring buffer
+        self._latency_next_idx: int = 0
+        self.latency_samples: int = 0
+
+    def pump(self, waited_event:pygame.event.Event|None=None) -> list:
+        """Drains the event queue (plus an event already taken by pygame.event.wait). Returns the events."""
+        now: float = perf_counter()
+        self.pressed_this_frame.clear()
+        events: list = pygame.event.get()
+        if waited_event is not None: events.insert(0, waited_event)
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.quit_requested = True
+            elif event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+                actions: list | None = self._key_to_actions.get(event.key)
+                if not actions: continue
+                pressed: bool = event.type == pygame.KEYDOWN
+                for action in actions:
+                    self._held[action] = pressed
+                    if pressed:
+                        self.pressed_this_frame.add(action)
+                        self._unticked_presses.setdefault(action, now)
+            elif event.type == pygame.WINDOWFOCUSLOST: # key releases are not delivered to an unfocused window
+                for action in INPUT_ACTIONS: self._held[action] = False
+        return events
+
+    def was_pressed(self, action:str) -> bool:
+        return action in self.pressed_this_frame
+
+    def paddle_inputs(self) -> tuple:
+        """
+            (left, right) PADDLE_INPUT_* flags for the next physics tick: the keys held now, plus the keys pressed since the
+            last tick (frames without a tick keep their presses for the next one).
+        """
+        unticked_presses: dict = self._unticked_presses
+        left_input, right_input = PADDLE_INPUT_NONE, PADDLE_INPUT_NONE
+        for action, (left_side, paddle_input) in _PADDLE_ACTIONS.items():
+            if self._held[action] or action in unticked_presses:
+                if left_side: left_input |= paddle_input
+                else: right_input |= paddle_input
+        if unticked_presses:
+            for action, press_time in unticked_presses.items():
+                if action in _PADDLE_ACTIONS: self._pending_press_times.append(press_time)
+            unticked_presses.clear()
+        return left_input, right_input
+
+    def consume_window(self) -> None:
+        """Forgets the presses of a frame that runs no physics on purpose (outside of play), held keys carry over as usual."""
+        self._unticked_presses.clear()
+
+    def frame_presented(self, present_time:float) -> None:
+        """Call after the frame was pushed to the display (at perf_counter() present_time), records the latency of the presses it was the first to show."""
+        if not self._pending_press_times: return
+        for press_time in self._pending_press_times:
+            self._latency_ms[self._latency_next_idx] = (present_time - press_time) * 1000
+            self._latency_next_idx = (self._latency_next_idx + 1) % len(self._latency_ms)
+            self.latency_samples += 1
+        self._pending_press_times = []
+
+    def latency_stats(self) -> dict:
+        """
+            Pump-to-present latency (ms) of recent paddle presses: from the pump that read the press until the display
+            update showing its first tick returned (neither the time in the event queue nor the monitor scan-out).
+        """
+        samples: list = sorted(self._latency_ms[:min(self.latency_samples, len(self._latency_ms))])
+        if not samples: return {"samples": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        return {
+            "samples": self.latency_samples,
+            "mean_ms": sum(samples) / len(samples),
+            "p50_ms": samples[int(len(samples) * 0.50)],
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        }
@@ -0,0 +1,174 @@
+from math import pi, sin, sqrt
+
+from pong_game_classes.ball import DIRECTION_DOWN, DIRECTION_LEFT, DIRECTION_RIGHT, DIRECTION_UP, PongBall
+from pong_game_classes.paddle import REFERENCE_FIELD_HEIGHT, REFERENCE_FIELD_WIDTH, PongPaddle
+from pong_game_classes.player import Player
+
+CHAOS_BALL_RADIUS: float = 8.0 # on the reference field, smaller than the regular ball
+CHAOS_MAX_FILL: float = 0.1    # the balls shrink below CHAOS_BALL_RADIUS so that together they cover at most this much of the field
+
+
+def chaos_ball_radius(ball_count:int) -> float:
+    """Radius (on the reference field) of ball_count balls in chaos mode, thousands of balls still leave room to move."""
+    return min(CHAOS_BALL_RADIUS, sqrt(CHAOS_MAX_FILL * REFERENCE_FIELD_WIDTH * REFERENCE_FIELD_HEIGHT / (pi * ball_count)))
+
+
+class SpatialHash:
+    """
+        Uniform-grid broadphase. Items are bucketed by the grid cell of their centre; with a cell size of at least an
+        item's diameter, two overlapping items are always in the same or in neighbouring cells.
+    """
+
+    def __init__(self, cell_size:float):
+        self.cell_size: float = cell_size
+        self._inverse_cell_size: float = 1 / cell_size
+        self._cells: dict = {} # (column, row) -> items whose centre is in that cell
+
+    def clear(self) -> None:
+        self._cells.clear()
+
+    def insert(self, item, x:float, y:float) -> None:
+        # int() truncates towards zero, so the cells either side of 0 are merged (bigger cells never miss a pair)
+        key: tuple = (int(x * self._inverse_cell_size), int(y * self._inverse_cell_size))
+        cell: list | None = self._cells.get(key)
+        if cell is None: self._cells[key] = [item]
+        else: cell.append(item)
+
+    def query(self, rect):
+        """Yields the items whose centre is in a cell overlapping rect (grow rect by the items' reach before querying)."""
+        inverse_cell_size: float = self._inverse_cell_size
+        cells: dict = self._cells
+        for column in range(int(rect.left * inverse_cell_size), int(rect.right * inverse_cell_size) + 1):
+            for row in range(int(rect.top * inverse_cell_size), int(rect.bottom * inverse_cell_size) + 1):
+                cell: list | None = cells.get((column, row))
+                if cell is not None: yield from cell
+
+    def candidate_pairs(self):
+        """Yields every pair of items in the same or in neighbouring cells once (the narrowphase test is left to the caller)."""
+        cells: dict = self._cells
+        for (column, row), cell in cells.items():
+            cell_size: int = len(cell)
+            for idx in range(cell_size):
+                item = cell[idx]
+                for other_idx in range(idx + 1, cell_size):
+                    yield item, cell[other_idx]
+            # half of the 8 neighbours, the other half sees this cell as its forward neighbour
+            for neighbour_key in ((column + 1, row), (column - 1, row + 1), (column, row + 1), (column + 1, row + 1)):
+                neighbour: list | None = cells.get(neighbour_key)
+                if neighbour is None: continue
+                for item in cell:
+                    for other in neighbour:
+                        yield item, other
+
+
+class MultiBallArena:
+    """
+        Chaos mode: ball_count balls in one match, on a PongGame or a headless PongSimulation. A SpatialHash rebuilt every
+        tick limits the paddle collision tests to the balls near a paddle, and the ball-versus-ball tests to balls in
+        neighbouring cells. Colliding balls swap their motion (an elastic collision of equal masses). A ball that leaves
+        the field scores a point and is served again from the middle; the paddles are not reset and play goes on.
+    """
+
+    def __init__(self, game, left_paddle:PongPaddle, right_paddle:PongPaddle, player_1:Player, player_2:Player, ball_count:int,
+                 ball_radius:float|None=None):
+        """ball_radius: on the reference field (PongBall scales it to the field), chaos_ball_radius(ball_count) by default."""
+        self.game = game
+        self.left_paddle: PongPaddle = left_paddle
+        self.right_paddle: PongPaddle = right_paddle
+        self.player_1: Player = player_1
+        self.player_2: Player = player_2
+        if ball_radius is None: ball_radius = chaos_ball_radius(ball_count)
+        self.balls: list = [PongBall(radius=ball_radius, game=game) for _ in range(ball_count)]
+        self.grid = SpatialHash(cell_size=max(1.0, 2 * self.balls[0].radius))
+        self.ball_collisions: int = 0
+        self.serve_all()
+
+    def serve(self, ball:PongBall, spread_x:float=0.0) -> None:
+        """Serves a ball from the middle line (+- spread_x), at a random height, direction and angle."""
+        rng = self.game.rng
+        margin: float = 2 * ball.radius
+        ball.coordinates.update(
+            self.game.mid_screen_coordinate[0] + rng.uniform(-spread_x, spread_x), rng.uniform(margin, self.game.field_height - margin)
+        )
+        ball.previous_coordinates.update(ball.coordinates)
+        ball.x_direction = rng.choice((DIRECTION_LEFT, DIRECTION_RIGHT))
+        ball.y_direction = rng.choice((DIRECTION_UP, DIRECTION_DOWN))
+        ball.current_pcnt_max_speed = 0.5
+        ball.angle = rng.uniform(-ball.max_deflection_angle, ball.max_deflection_angle)
+        ball.update_rect()
+        ball.new_trajectory_id()
+
+    def serve_all(self) -> None:
+        """Serves every ball, spread over the middle two thirds of the field so they do not all start on top of each other."""
+        for ball in self.balls:
+            self.serve(ball, spread_x=self.game.field_width / 3)
+
+    def step(self) -> int:
+        """One physics tick of every ball (same order as the single-ball tick), returns the number of points scored."""
+        grid: SpatialHash = self.grid
+        grid.clear()
+        for ball in self.balls:
+            ball.update_rect()
+            grid.insert(ball, ball.coordinates.x, ball.coordinates.y)
+
+        # a ball centre can be up to a radius plus one tick of travel (the sweep test) away from a paddle it hits
+        reach: int = 2 * round(self.balls[0].radius + self.balls[0].max_speed_x * self.game.dt)
+        for paddle in (self.left_paddle, self.right_paddle):
+            for ball in grid.query(paddle.rect.inflate(reach, reach)):
+                ball.check_and_bounce_at_rect_collision(rect_obj=paddle.rect)
+        self._collide_balls()
+
+        points: int = 0
+        field_width: int = self.game.field_width
+        for ball in self.balls:
+            ball.check_and_bounce_at_horizontal_boundary_collision()
+            ball.update_trajectory()
+            # same scoring rule as check_for_vertical_boundary_collision, but only the ball is served again
+            if ball.rect.x >= field_width - ball.rect.width: self.player_1.increment_score()
+            elif ball.rect.x <= 0: self.player_2.increment_score()
+            else: continue
+            if self.game.enable_sounds: self.game.play_score_point_sound()
+            if self.game.telemetry is not None: self.game.telemetry.point_scored(
+                scorer="left" if ball.rect.x > 0 else "right", score=(self.player_1.get_score(), self.player_2.get_score()), ball=ball
+            )
+            self.serve(ball)
+            points += 1
+        return points
+
+    def _collide_balls(self) -> None:
+        """Narrowphase of the grid's candidate pairs: overlapping balls that move towards each other swap their motion."""
+        min_distance_squared: float = (2 * self.balls[0].radius) ** 2
+        for ball, other in self.grid.candidate_pairs():
+            dx: float = other.coordinates.x - ball.coordinates.x
+            dy: float = other.coordinates.y - ball.coordinates.y
+            if dx * dx + dy * dy >= min_distance_squared: continue
+            ball_vx, ball_vy = self._velocity(ball)
+            other_vx, other_vy = self._velocity(other)
+            if (other_vx - ball_vx) * dx + (other_vy - ball_vy) * dy >= 0: continue # already separating
+            (ball.x_direction, ball.y_direction, ball.current_pcnt_max_speed, ball.angle,
+             other.x_direction, other.y_direction, other.current_pcnt_max_speed, other.angle) = (
+                other.x_direction, other.y_direction, other.current_pcnt_max_speed, other.angle,
+                ball.x_direction, ball.y_direction, ball.current_pcnt_max_speed, ball.angle
+            )
+            ball.new_trajectory_id()
+            other.new_trajectory_id()
+            self.ball_collisions += 1
+
+    @staticmethod
+    def _velocity(ball:PongBall) -> tuple:
+        speed: float = ball.current_pcnt_max_speed
+        return ball.x_direction * ball.max_speed_x * speed, ball.y_direction * ball.max_speed_y * speed * abs(sin(ball.angle))
+
+    def ai_target_ball(self, paddle:PongPaddle) -> PongBall:
+        """The ball the ai should play: the closest one heading towards the paddle (the closest one overall if none is)."""
+        paddle_x: int = paddle.rect.centerx
+        approach_direction: int = DIRECTION_LEFT if paddle.left_side_paddle else DIRECTION_RIGHT
+        target: PongBall | None = None
+        target_distance: float = float("inf")
+        for ball in self.balls:
+            if ball.x_direction != approach_direction: continue
+            distance: float = abs(paddle_x - ball.coordinates.x)
+            if distance < target_distance:
+                target, target_distance = ball, distance
+        if target is None: target = min(self.balls, key=lambda ball: abs(paddle_x - ball.coordinates.x))
+        return target
@@ -3,37 +3,103 @@ import pygame
 from pong_game_classes.player import Player
 
 PADDLE_LEFT_OFFSET: float = 0.025 # magic number to help with positioning of the paddle objects in the game loop
-PADDLE_MAX_SPEED: float = 150.0
+PADDLE_MAX_SPEED: float = 150.0    # on the reference field, scales with the field height
+
+# field size the ball and paddle geometry (sizes and speeds) is tuned for, other field sizes scale it
+REFERENCE_FIELD_WIDTH: int = 1280
+REFERENCE_FIELD_HEIGHT: int = 720
+
+# paddle input bit-flags for one tick ('up' is applied before 'down' when both keys are held)
+PADDLE_INPUT_NONE: int = 0
+PADDLE_INPUT_UP: int = 1
+PADDLE_INPUT_DOWN: int = 2
+MOVE_TO_PADDLE_INPUT: dict = {"move_up": PADDLE_INPUT_UP, "move_down": PADDLE_INPUT_DOWN, "stay": PADDLE_INPUT_NONE}
+
+# colours are resolved once, a colour name would be parsed again on every draw call
+LEFT_PADDLE_COLOR = pygame.Color("blue")
+RIGHT_PADDLE_COLOR = pygame.Color("red")
 
 class PongPaddle:
+    __slots__ = (
+        "player_assigned", "game", "paddle_width", "paddle_height", "pos_top", "pos_left", "color", "rect", "top", "previous_top",
+        "left_side_paddle", "max_speed", "_draw_rect", "_ai_position",
+    )
 
-    def __init__(self, player_assigned:Player, left_side_paddle:bool=True):
-        from pong_game_classes.game import PongGame
+    def __init__(self, player_assigned:Player, left_side_paddle:bool=True, game=None):
+        if game is None:
+            from pong_game_classes.game import PongGame
+            game = PongGame() # reference to game singleton instance
 
         self.player_assigned = player_assigned
+        self.left_side_paddle: bool = left_side_paddle
 
-        self.game = PongGame() # reference to game singleton instance
-        self.paddle_width: float = self.game.screen.get_width() * 0.025  # change this to change the width of the paddle
-        self.paddle_height: float = self.game.screen.get_height() * 0.25 # change this to change the height of the paddle
+        self.game = game # PongGame singleton, or a headless PongSimulation
+        self.paddle_width: float = self.game.field_width * 0.025  # change this to change the width of the paddle
+        self.paddle_height: float = self.game.field_height * 0.25 # change this to change the height of the paddle
         self.pos_top: float = self.game.mid_screen_coordinate[1] - (self.paddle_height  * 0.5) 
+        self.max_speed: float = PADDLE_MAX_SPEED * self.game.field_height / REFERENCE_FIELD_HEIGHT
 
         if left_side_paddle:
-            self.pos_left: float = self.game.screen.get_width() * PADDLE_LEFT_OFFSET   
-            self.color: str = "blue"                          
+            self.pos_left: float = self.game.field_width * PADDLE_LEFT_OFFSET   
+            self.color: pygame.Color = LEFT_PADDLE_COLOR
         else:
-            self.pos_left: float = self.game.screen.get_width() * (1 - PADDLE_LEFT_OFFSET) - self.paddle_width   
-            self.color: str = "red"                            
+            self.pos_left: float = self.game.field_width * (1 - PADDLE_LEFT_OFFSET) - self.paddle_width   
+            self.color: pygame.Color = RIGHT_PADDLE_COLOR
         
         self.rect = pygame.Rect(self.pos_left, self.pos_top, self.paddle_width, self.paddle_height)
+        # position in float pixels, rect.top is round(top): moves smaller than a pixel per tick (high tick rates, small
+        # fields) accumulate instead of being rounded away, so the speed does not depend on the tick rate
+        self.top: float = self.pos_top
+        self.rect.top = round(self.top)
+        self.previous_top: float = self.top # top before the current physics tick, used for render interpolation
+        self._draw_rect = pygame.Rect(self.rect)  # reused by interpolated_rect()
+        self._ai_position: dict = {"x": 0, "y": 0, "height": self.paddle_height} # reused by ai_position()
+
+
+    def interpolated_rect(self, alpha:float) -> pygame.Rect:
+        """
+            Rect between the previous and the current physics tick (alpha 0: previous, 1: current), used for drawing.
+            The returned rect is reused by the next call, copy it to keep it.
+        """
+        if alpha >= 1.0 or self.previous_top == self.top: return self.rect
+        draw_rect: pygame.Rect = self._draw_rect
+        draw_rect.update(self.rect)
+        draw_rect.top = round(self.top + (self.previous_top - self.top) * (1.0 - max(alpha, 0.0)))
+        return draw_rect
 
+    def ai_position(self) -> dict:
+        """
+            Paddle position as the AIController expects it, x being the face the ball hits. The same dict is refilled on
+            every call, copy it to keep it.
+        """
+        position: dict = self._ai_position
+        position["x"] = self.rect.right if self.left_side_paddle else self.rect.x
+        position["y"] = self.rect.y
+        return position
+
+    def store_previous_position(self) -> None:
+        """Call at the start of every physics tick."""
+        self.previous_top = self.top
+
+    def set_top(self, top:float) -> None:
+        """Moves the paddle to top (float pixels), the rect follows rounded."""
+        self.top = top
+        self.rect.top = round(top)
+
+    def apply_input(self, paddle_input:int) -> None:
+        """Moves the paddle according to a PADDLE_INPUT_* bit-flag combination."""
+        if paddle_input & PADDLE_INPUT_UP: self.move_up()
+        if paddle_input & PADDLE_INPUT_DOWN: self.move_down()
 
     def move_up(self):
-        self.rect.top -= PADDLE_MAX_SPEED * self.game.dt
+        self.set_top(self.top - self.max_speed * self.game.dt)
 
     def move_down(self):
-        self.rect.top += PADDLE_MAX_SPEED * self.game.dt
+        self.set_top(self.top + self.max_speed * self.game.dt)
 
     def reset(self):
         """Resets paddle position to initial default."""
         self.pos_top = self.game.mid_screen_coordinate[1] - (self.paddle_height  * 0.5) 
-        self.rect = pygame.Rect(self.pos_left, self.pos_top, self.paddle_width, self.paddle_height)
\ No newline at end of file
+        self.rect = pygame.Rect(self.pos_left, self.pos_top, self.paddle_width, self.paddle_height)
+        self.set_top(self.pos_top)
+        self.previous_top = self.top
\ No newline at end of file
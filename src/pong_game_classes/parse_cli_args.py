@@ -1,13 +1,87 @@
 import argparse
 
+def key_binding(value:str) -> tuple:
+    """'action=key' (e.g. 'left_up=w') -> (action, key name)."""
+    action, separator, key_name = value.partition("=")
+    if not separator or not action or not key_name: raise argparse.ArgumentTypeError(f"expected ACTION=KEY, got '{value}'")
+    return action, key_name
+
+def resolution(value:str) -> tuple:
+    """'WIDTHxHEIGHT' (e.g. '1920x1080') -> (width, height)."""
+    width, separator, height = value.lower().partition("x")
+    if not separator or not width.isdigit() or not height.isdigit() or int(width) == 0 or int(height) == 0:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'")
+    return int(width), int(height)
+
 class GameArgs(argparse.Namespace):
     difficulty: str
+    policy_file: str | None
     mode: str
+    balls: int
     enable_sounds: str
+    seed: int | None
+    record_replay: str | None
+    replay: str | None
+    replay_speed: float
+    replay_start_tick: int
+    headless: bool
+    render_mode: str
+    physics: str
+    physics_hz: int
+    fps_cap: int
+    window_size: tuple
+    logical_size: tuple | None
+    scaling: str
+    vsync: bool
+    matches: int
+    profile: bool
+    profile_overlay: bool
+    profile_dump: str | None
+    profile_dump_interval: float
+    bind: list | None
+    startup_report: bool
+    telemetry: str | None
+    telemetry_max_mb: float
+    pipeline: bool
+    tick_stats: bool
 
 parser = argparse.ArgumentParser()
-parser.add_argument("--difficulty", choices=["easy", "hard"], default="easy", help="Game difficulty selection")
+parser.add_argument("--difficulty", choices=["easy", "hard", "trained"], default="easy", help="Game difficulty selection ('trained' plays a self-play policy file, see train_ai.py)")
+parser.add_argument("--policy_file", metavar="PATH", default=None, help="Policy file for --difficulty trained (default: resources/ai/policy.bin)")
 parser.add_argument("--mode", choices=["ai", "2p"], default="ai", help="Game mode selection")
+parser.add_argument("--balls", type=int, default=1, help="Number of balls in play (more than 1: chaos mode, the match goes on through points and lasts balls times as many points)")
 parser.add_argument("--enable_sounds", choices=["0", "1"], default="0", help="Flag to turn off/on sound-effects")
+parser.add_argument("--render_mode", choices=["dirty", "flip"], default="dirty", help="'dirty' only updates changed screen regions, 'flip' redraws the whole screen every frame (fallback)")
+parser.add_argument("--physics", choices=["fixed", "variable"], default="fixed", help="'fixed' steps physics at --physics_hz independent of the frame rate, 'variable' steps once per frame")
+parser.add_argument("--physics_hz", type=int, default=120, help="Physics tick rate in 'fixed' physics mode")
+parser.add_argument("--fps_cap", type=int, default=60, help="Frame rate cap (0 renders uncapped)")
+parser.add_argument("--window_size", type=resolution, default=(1280, 720), metavar="WIDTHxHEIGHT", help="Window size (the field size too, unless --logical_size is set)")
+parser.add_argument("--logical_size", type=resolution, default=None, metavar="WIDTHxHEIGHT", help="Draw the game at this fixed resolution and scale it to the window (e.g. 1280x720 on a 4K window)")
+parser.add_argument("--scaling", choices=["gpu", "software"], default="gpu", help="How --logical_size is scaled to the window: 'gpu' by the SDL renderer (pygame.SCALED), 'software' by transform.scale of the changed regions")
+parser.add_argument("--vsync", action="store_true", help="Request vsync (only honoured with a --logical_size and 'gpu' scaling, where pygame uses a renderer)")
+parser.add_argument("--pipeline", action="store_true", help="Run the physics on its own thread at the physics tick rate, the main thread only handles events and renders the latest game state")
+parser.add_argument("--tick_stats", action="store_true", help="Print how evenly spaced the physics ticks were on exit (compare with and without --pipeline)")
+parser.add_argument("--seed", type=int, default=None, help="Seed for the game-play randomness (random by default)")
+parser.add_argument("--record_replay", metavar="PATH", default=None, help="Record the session's inputs to a replay file")
+parser.add_argument("--replay", metavar="PATH", default=None, help="Play back a replay file instead of playing")
+parser.add_argument("--replay_speed", type=float, default=1.0, help="Replay playback speed multiplier")
+parser.add_argument("--replay_start_tick", type=int, default=0, help="Physics tick to start replay playback from")
+parser.add_argument("--headless", action="store_true", help="Run ai vs ai matches without a window (no drawing, no frame cap)")
+parser.add_argument("--matches", type=int, default=10, help="Number of matches to play in --headless mode")
+parser.add_argument("--profile", action="store_true", help="Time each phase of the game loop and print a summary on exit")
+parser.add_argument("--profile_overlay", action="store_true", help="Show p50/p99 frame times on screen (implies --profile)")
+parser.add_argument("--profile_dump", metavar="PATH", default=None, help="Periodically write the per-phase frame times to a .csv or .json file (implies --profile)")
+parser.add_argument("--profile_dump_interval", type=float, default=5.0, help="Seconds between --profile_dump writes")
+parser.add_argument("--telemetry", metavar="PATH", default=None, help="Record match events (rallies, paddle bounces, ai decisions, points) to a .jsonl or .db (SQLite) file, written in the background")
+parser.add_argument("--telemetry_max_mb", type=float, default=16.0, help="Size at which a --telemetry file is rotated (the last 5 files are kept)")
+parser.add_argument("--startup_report", "--startup-report", action="store_true", help="Print how long each phase of the startup took (main thread and background asset preloading)")
+parser.add_argument(
+    "--bind", type=key_binding, action="append", metavar="ACTION=KEY",
+    help="Rebind a control (actions: left_up, left_down, right_up, right_down, start; keys by pygame name, e.g. --bind left_up=w --bind right_up=i)"
+)
 
-CLI_ARGS = parser.parse_args(namespace=GameArgs())
\ No newline at end of file
+CLI_ARGS = parser.parse_args(namespace=GameArgs())
+if CLI_ARGS.balls < 1: parser.error("--balls must be at least 1")
+if CLI_ARGS.balls > 1 and CLI_ARGS.record_replay: parser.error("--record_replay records single-ball matches only")
+if CLI_ARGS.pipeline and (CLI_ARGS.balls > 1 or CLI_ARGS.physics != "fixed"): parser.error("--pipeline runs single-ball matches with fixed physics only")
+if CLI_ARGS.pipeline and (CLI_ARGS.profile or CLI_ARGS.profile_overlay or CLI_ARGS.profile_dump): parser.error("--profile times the single-threaded game loop only, not --pipeline")
\ No newline at end of file
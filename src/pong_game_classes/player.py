@@ -1,8 +1,11 @@
 class Player:
+    __slots__ = ("name", "score", "_score_text", "_score_text_score")
 
     def __init__(self, name:str):
         self.name: str = name
         self.score: int = 0
+        self._score_text: str = ""
+        self._score_text_score: int = -1 # score _score_text was built for
 
     def get_name(self):
         return self.name
@@ -10,6 +13,13 @@ class Player:
     def get_score(self):
         return self.score
 
+    def get_score_text(self) -> str:
+        """Name followed by the score, as shown on screen every frame (only rebuilt when the score changed)."""
+        if self._score_text_score != self.score:
+            self._score_text = self.name + str(self.score)
+            self._score_text_score = self.score
+        return self._score_text
+
     def increment_score(self):
         self.score += 1
 
@@ -0,0 +1,132 @@
+"""
+    Lookup-table ai policy: one PADDLE_INPUT_* action per quantized game state, produced offline by policy_trainer.py and
+    read through a memory map at run time (the file is never parsed or copied, a decision is one index computation and
+    one byte read).
+
+    File layout (little-endian):
+    header  <8s H H H B B B B f f>  magic, version, field width, field height, ball y bins, ball y-velocity bins,
+                                    distance bins, paddle bins, max |ball y-velocity|, training generation
+    table   uint8 per state         action of every state, states in C order over (distance, y-velocity, ball y, paddle)
+
+    A state is seen from the paddle's side, so one table plays either paddle. Distance bin 0 means the ball moves away
+    from the paddle, bins 1.. split the horizontal distance to an approaching ball; paddle bins split the paddle centre.
+"""
+import mmap
+import struct
+
+from pong_game_classes.paddle import PADDLE_INPUT_DOWN, PADDLE_INPUT_NONE, PADDLE_INPUT_UP
+
+POLICY_MAGIC: bytes = b"PONGPLCY"
+POLICY_VERSION: int = 1
+POLICY_HEADER = struct.Struct("<8sHHHBBBBff")
+ACTION_TO_MOVE: tuple = ("stay", "move_up", "move_down") # indexed by PADDLE_INPUT_* flag
+POLICY_ACTIONS: tuple = (PADDLE_INPUT_NONE, PADDLE_INPUT_UP, PADDLE_INPUT_DOWN)
+
+DEFAULT_BALL_Y_BINS: int = 16
+DEFAULT_Y_VELOCITY_BINS: int = 7
+DEFAULT_DISTANCE_BINS: int = 9
+DEFAULT_PADDLE_BINS: int = 16
+DEFAULT_MAX_Y_VELOCITY: float = 180.0 # PongBall.max_speed_y
+
+
+class PolicyTable:
+    """A policy table over any buffer (an mmap of a policy file, or the bytes of a table being trained), all 'stay' if None."""
+
+    def __init__(self, table=None, field_width:int=1280, field_height:int=720, ball_y_bins:int=DEFAULT_BALL_Y_BINS,
+                 y_velocity_bins:int=DEFAULT_Y_VELOCITY_BINS, distance_bins:int=DEFAULT_DISTANCE_BINS, paddle_bins:int=DEFAULT_PADDLE_BINS,
+                 max_y_velocity:float=DEFAULT_MAX_Y_VELOCITY, generation:int=0):
+        self.field_width: int = field_width
+        self.field_height: int = field_height
+        self.ball_y_bins: int = ball_y_bins
+        self.y_velocity_bins: int = y_velocity_bins
+        self.distance_bins: int = distance_bins
+        self.paddle_bins: int = paddle_bins
+        self.max_y_velocity: float = max_y_velocity
+        self.generation: int = generation
+        self.num_states: int = distance_bins * y_velocity_bins * ball_y_bins * paddle_bins
+        if table is None: table = bytearray(self.num_states)
+        if len(table) != self.num_states: raise ValueError(f"policy table has {len(table)} states, expected {self.num_states}")
+        self.table = table
+        self._mmap: mmap.mmap | None = None
+
+        # bin scales, so state_index() is a few multiplications
+        self._ball_y_scale: float = ball_y_bins / field_height
+        self._paddle_scale: float = paddle_bins / field_height
+        self._distance_scale: float = (distance_bins - 1) / field_width
+        self._y_velocity_scale: float = y_velocity_bins / (2 * max_y_velocity)
+
+    @classmethod
+    def load(cls, filepath:str) -> "PolicyTable":
+        """Memory-maps a policy file, the table stays in the page cache and is shared by every process using it."""
+        with open(filepath, "rb") as policy_file:
+            mapped = mmap.mmap(policy_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, field_width, field_height, ball_y_bins, y_velocity_bins, distance_bins, paddle_bins, max_y_velocity, generation = \
+            POLICY_HEADER.unpack_from(mapped)
+        if magic != POLICY_MAGIC or version != POLICY_VERSION:
+            mapped.close()
+            raise ValueError(f"{filepath} is not a version {POLICY_VERSION} policy file")
+        policy = cls(
+            memoryview(mapped)[POLICY_HEADER.size:], field_width=field_width, field_height=field_height, ball_y_bins=ball_y_bins,
+            y_velocity_bins=y_velocity_bins, distance_bins=distance_bins, paddle_bins=paddle_bins, max_y_velocity=max_y_velocity,
+            generation=int(generation)
+        )
+        policy._mmap = mapped
+        return policy
+
+    def spec(self) -> dict:
+        """Constructor arguments describing the state quantization (everything but the table)."""
+        return {
+            "field_width": self.field_width, "field_height": self.field_height, "ball_y_bins": self.ball_y_bins,
+            "y_velocity_bins": self.y_velocity_bins, "distance_bins": self.distance_bins, "paddle_bins": self.paddle_bins,
+            "max_y_velocity": self.max_y_velocity, "generation": self.generation,
+        }
+
+    def save(self, filepath:str) -> None:
+        with open(filepath, "wb") as policy_file:
+            policy_file.write(POLICY_HEADER.pack(
+                POLICY_MAGIC, POLICY_VERSION, self.field_width, self.field_height, self.ball_y_bins, self.y_velocity_bins,
+                self.distance_bins, self.paddle_bins, self.max_y_velocity, self.generation
+            ))
+            policy_file.write(bytes(self.table))
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self.table.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def state_index(self, ball_trajectory_snapshot:dict, paddle_position:dict, approach_direction:int=1, field_size:tuple|None=None) -> int:
+        """
+            Quantized state of the ball as seen from a paddle (AIController arguments, see AIController.return_decision).
+            field_size is the (width, height) of the game the arguments come from, its positions and velocities are
+            normalized to the policy's field before binning (None: the policy's own field).
+        """
+        x_scale: float = 1.0
+        y_scale: float = 1.0
+        if field_size is not None: x_scale, y_scale = self.field_width / field_size[0], self.field_height / field_size[1]
+        if ball_trajectory_snapshot["x_direction"] == approach_direction:
+            distance_bin: int = 1 + int(abs(paddle_position["x"] - ball_trajectory_snapshot["x_position"]) * x_scale * self._distance_scale)
+            if distance_bin >= self.distance_bins: distance_bin = self.distance_bins - 1
+        else:
+            distance_bin = 0
+        y_velocity_bin: int = int((ball_trajectory_snapshot["y_velocity"] * y_scale + self.max_y_velocity) * self._y_velocity_scale)
+        ball_y_bin: int = int(ball_trajectory_snapshot["y_position"] * y_scale * self._ball_y_scale)
+        paddle_bin: int = int((paddle_position["y"] + paddle_position["height"] * 0.5) * y_scale * self._paddle_scale)
+        return ((distance_bin * self.y_velocity_bins + min(max(y_velocity_bin, 0), self.y_velocity_bins - 1)) * self.ball_y_bins
+                + min(max(ball_y_bin, 0), self.ball_y_bins - 1)) * self.paddle_bins + min(max(paddle_bin, 0), self.paddle_bins - 1)
+
+    def decision(self, ball_trajectory_snapshot:dict, paddle_position:dict, approach_direction:int=1, field_size:tuple|None=None) -> str:
+        return ACTION_TO_MOVE[self.table[self.state_index(ball_trajectory_snapshot, paddle_position, approach_direction, field_size)]]
+
+    def bin_centres(self, state_index:int) -> tuple:
+        """(approaching, distance, ball y velocity, ball y, paddle centre) at the middle of a state's bins."""
+        state_index, paddle_bin = divmod(state_index, self.paddle_bins)
+        state_index, ball_y_bin = divmod(state_index, self.ball_y_bins)
+        distance_bin, y_velocity_bin = divmod(state_index, self.y_velocity_bins)
+        return (
+            distance_bin > 0,
+            (distance_bin - 0.5) / self._distance_scale if distance_bin > 0 else 0.0,
+            (y_velocity_bin + 0.5) / self._y_velocity_scale - self.max_y_velocity,
+            (ball_y_bin + 0.5) / self._ball_y_scale,
+            (paddle_bin + 0.5) / self._paddle_scale,
+        )
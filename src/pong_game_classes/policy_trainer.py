@@ -0,0 +1,159 @@
+import os
+import random
+from multiprocessing import Pool
+from time import perf_counter
+
+import numpy as np
+
+from pong_game_classes.ai_controller import AIController
+from pong_game_classes.paddle import PADDLE_INPUT_DOWN, PADDLE_INPUT_NONE, PADDLE_INPUT_UP
+from pong_game_classes.policy_table import POLICY_ACTIONS, PolicyTable
+from pong_game_classes.simulation import PongSimulation
+from pong_game_classes.tournament import play_match
+
+MIN_STATE_VISITS: int = 8 # a state needs this many (decayed) votes before its table entry is replaced
+
+
+def heuristic_table(policy:PolicyTable) -> bytearray:
+    """Starting policy: follow an approaching ball's y-position, drift back to the middle otherwise."""
+    table = bytearray(policy.num_states)
+    dead_zone: float = policy.field_height / policy.paddle_bins * 0.5
+    for state_index in range(policy.num_states):
+        approaching, _, _, ball_y, paddle_centre = policy.bin_centres(state_index)
+        target_y: float = ball_y if approaching else policy.field_height * 0.5
+        if target_y < paddle_centre - dead_zone: table[state_index] = PADDLE_INPUT_UP
+        elif target_y > paddle_centre + dead_zone: table[state_index] = PADDLE_INPUT_DOWN
+        else: table[state_index] = PADDLE_INPUT_NONE
+    return table
+
+
+def play_self_play_match(policy:PolicyTable, match_seed:int, epsilon:float, dt:float, max_ticks:int, action_counts:np.ndarray) -> dict:
+    """
+        Plays one headless match with the policy on both paddles (epsilon-greedy) and labels its decisions in hindsight:
+        each time the ball reaches a paddle (returned or missed), every state that paddle was in since the ball last left
+        it gets one vote in action_counts for the move that heads towards where the ball actually arrived. The table
+        is then improved from the votes of the states the current policy leads to.
+    """
+    rng = random.Random(match_seed)
+    simulation = PongSimulation(dt=dt, seed=match_seed)
+    ball = simulation.ball
+    paddles: tuple = (simulation.left_paddle, simulation.right_paddle)
+    approach_directions: tuple = (-1, 1)
+    dead_zone: float = paddles[0].paddle_height * 0.1 # the paddle stays put when the ball arrives this close to its centre
+    table = policy.table
+    decisions: tuple = (([], []), ([], []))  # per paddle: (states, paddle centres) since the ball last left it
+    hits: int = 0
+    misses: int = 0
+
+    def label(side:int, arrival_y:float) -> None:
+        states, paddle_centres = decisions[side]
+        if not states: return
+        offsets: np.ndarray = arrival_y - np.asarray(paddle_centres) # > 0: the ball arrived below the paddle centre
+        ideal_actions: np.ndarray = np.where(offsets < -dead_zone, PADDLE_INPUT_UP, np.where(offsets > dead_zone, PADDLE_INPUT_DOWN, PADDLE_INPUT_NONE))
+        np.add.at(action_counts, (states, ideal_actions), 1)
+        states.clear()
+        paddle_centres.clear()
+
+    while simulation.winner is None and simulation.ticks < max_ticks:
+        snapshot: dict = ball.yield_trajectory_prediction_data()
+        inputs: list = [PADDLE_INPUT_NONE, PADDLE_INPUT_NONE]
+        for side in (0, 1):
+            paddle_position: dict = paddles[side].ai_position()
+            state_index: int = policy.state_index(snapshot, paddle_position, approach_directions[side])
+            inputs[side] = rng.choice(POLICY_ACTIONS) if rng.random() < epsilon else table[state_index]
+            decisions[side][0].append(state_index)
+            decisions[side][1].append(paddle_position["y"] + paddle_position["height"] * 0.5)
+
+        x_direction: int = ball.x_direction
+        ball_y: float = ball.coordinates.y # a scored point resets the ball, so its arrival is taken from before the step
+        scores: tuple = (simulation.player_1.score, simulation.player_2.score)
+        simulation.step_inputs(inputs[0], inputs[1])
+        if simulation.player_1.score != scores[0] or simulation.player_2.score != scores[1]: # missed by the paddle it approached
+            label(0 if x_direction == -1 else 1, ball_y)
+            misses += 1
+        elif ball.x_direction != x_direction:                                                # returned by it
+            label(0 if x_direction == -1 else 1, ball_y)
+            hits += 1
+    return {"ticks": simulation.ticks, "hits": hits, "misses": misses}
+
+
+def _self_play_chunk(args:tuple) -> tuple:
+    """Pool worker: plays a chunk of self-play matches, returns (worker pid, elapsed seconds, action votes, stats)."""
+    table, spec, match_seeds, epsilon, dt, max_ticks = args
+    policy = PolicyTable(table, **spec)
+    action_counts = np.zeros((policy.num_states, len(POLICY_ACTIONS)))
+    stats: dict = {"ticks": 0, "hits": 0, "misses": 0}
+    start: float = perf_counter()
+    for match_seed in match_seeds:
+        for key, value in play_self_play_match(policy, match_seed, epsilon, dt, max_ticks, action_counts).items():
+            stats[key] += value
+    return os.getpid(), perf_counter() - start, action_counts, stats
+
+
+def _evaluation_chunk(args:tuple) -> list:
+    """Pool worker: plays the greedy policy ("trained" difficulty, left paddle) against an AIController difficulty."""
+    table, spec, match_seeds, opponent, max_ticks = args
+    AIController.set_policy(PolicyTable(table, **spec))
+    return [play_match(match_seed, "trained", opponent, max_ticks) for match_seed in match_seeds]
+
+
+def train_policy(generations:int=20, matches_per_generation:int=64, seed:int=0, workers:int|None=None, chunk_size:int=8,
+                 epsilon_start:float=0.3, epsilon_end:float=0.02, decay:float=0.5, physics_hz:int=120, max_ticks:int=36_000,
+                 eval_matches:int=16, eval_opponent:str="hard", checkpoint_every:int=0, output_filepath:str|None=None) -> PolicyTable:
+    """
+        Self-play training of a PolicyTable. Every generation plays matches_per_generation matches on a process pool with
+        the current table on both paddles, merges the workers' hindsight action votes (older generations weighted down by
+        decay per generation) and makes the most voted action of every well-sampled state the new table entry.
+        Each generation's greedy table is evaluated against eval_opponent; with checkpoint_every, intermediate tables are
+        written next to output_filepath (<name>_gen<N>.bin) and serve as weaker skill levels.
+    """
+    workers = workers or os.cpu_count() or 1
+    policy = PolicyTable()
+    policy.table = heuristic_table(policy)
+    action_counts = np.zeros((policy.num_states, len(POLICY_ACTIONS)))
+    dt: float = 1 / physics_hz
+
+    with Pool(processes=workers) as pool:
+        for generation in range(1, generations + 1):
+            epsilon: float = epsilon_start + (epsilon_end - epsilon_start) * (generation - 1) / max(1, generations - 1)
+            match_seeds: list = [seed + generation * 1_000_003 + match_idx for match_idx in range(matches_per_generation)]
+            table: bytes = bytes(policy.table)
+            spec: dict = policy.spec()
+            chunks: list = [(table, spec, match_seeds[idx:idx + chunk_size], epsilon, dt, max_ticks) for idx in range(0, len(match_seeds), chunk_size)]
+
+            start: float = perf_counter()
+            action_counts *= decay
+            stats: dict = {"ticks": 0, "hits": 0, "misses": 0}
+            for _, _, chunk_counts, chunk_stats in pool.imap_unordered(_self_play_chunk, chunks):
+                action_counts += chunk_counts
+                for key, value in chunk_stats.items(): stats[key] += value
+
+            changed: int = _improve_table(policy, action_counts)
+            policy.generation = generation
+            elapsed: float = perf_counter() - start
+
+            eval_seeds: list = [seed + match_idx for match_idx in range(eval_matches)] # same matches every generation
+            eval_chunks: list = [(bytes(policy.table), policy.spec(), eval_seeds[idx:idx + chunk_size], eval_opponent, max_ticks) for idx in range(0, eval_matches, chunk_size)]
+            results: list = [result for chunk in pool.imap_unordered(_evaluation_chunk, eval_chunks) for result in chunk]
+            win_rate: float = sum(result["winner"] == "left" for result in results) / max(1, len(results))
+            print(
+                f"generation {generation:>3}: epsilon {epsilon:.3f}, self-play hit rate {stats['hits'] / max(1, stats['hits'] + stats['misses']):.1%}, "
+                f"{changed} states changed, {np.count_nonzero(action_counts.sum(axis=1) >= MIN_STATE_VISITS) / policy.num_states:.0%} states sampled, "
+                f"win rate vs {eval_opponent} {win_rate:.0%}, {stats['ticks'] / elapsed:,.0f} ticks/s"
+            )
+            if output_filepath and checkpoint_every and generation % checkpoint_every == 0 and generation < generations:
+                root, extension = os.path.splitext(output_filepath)
+                policy.save(f"{root}_gen{generation}{extension or '.bin'}")
+
+    if output_filepath: policy.save(output_filepath)
+    return policy
+
+
+def _improve_table(policy:PolicyTable, action_counts:np.ndarray) -> int:
+    """Each state sampled MIN_STATE_VISITS times takes its most voted action. Returns the number of changed states."""
+    best_actions: np.ndarray = np.asarray(POLICY_ACTIONS, dtype=np.uint8)[action_counts.argmax(axis=1)]
+    table = np.frombuffer(policy.table, dtype=np.uint8).copy()
+    update: np.ndarray = (action_counts.sum(axis=1) >= MIN_STATE_VISITS) & (best_actions != table)
+    table[update] = best_actions[update]
+    policy.table = bytearray(table.tobytes())
+    return int(np.count_nonzero(update))
@@ -0,0 +1,179 @@
+"""
+    Replay file layout (little-endian, fixed width):
+        - header          (_HEADER): counts and offsets are filled in when the recording is closed
+        - tick records    (_TICK_RECORD, one per physics tick): dt, left/right PADDLE_INPUT_* flags, tick flags
+        - keyframes       (_KEYFRAME, one every keyframe_interval ticks): full game state at the start of that tick
+    Inputs alone are enough to re-simulate a match, keyframes only make seeking cheap. At every keyframe tick the
+    game rng is reseeded with (seed + tick), so re-simulation from any keyframe draws the same random numbers.
+"""
+
+import mmap
+import struct
+
+from pong_game_classes.simulation import PongSimulation
+
+REPLAY_MAGIC: bytes = b"PONGRPL1"
+_HEADER = struct.Struct("<8sHHHdQIQQQ")         # magic, version, field width, field height, physics dt, seed, keyframe interval, tick count, keyframe count, keyframe offset
+_TICK_RECORD = struct.Struct("<dBBB")           # dt in seconds (as stepped, so playback repeats it bit for bit), left input, right input, tick flags
+_KEYFRAME = struct.Struct("<QQddddbbddddHH")    # tick, rng seed, ball x/y, ball previous x/y, ball x/y direction, speed pcnt, angle, left/right paddle top, scores
+REPLAY_VERSION: int = 3                         # 2: paddle tops are floats, 3: tick dt is a double (was whole ms)
+TICK_FLAG_NEW_MATCH: int = 1                    # scores were reset (a new match started) before this tick
+
+
+class ReplayRecorder:
+    """Streams the inputs of every physics tick (plus periodic keyframes) of a game session into a replay file."""
+
+    def __init__(self, filepath:str, seed:int, field_width:int, field_height:int, physics_dt:float, keyframe_interval:int=600):
+        self.filepath: str = filepath
+        self.seed: int = seed
+        self.field_width: int = field_width
+        self.field_height: int = field_height
+        self.physics_dt: float = physics_dt
+        self.keyframe_interval: int = keyframe_interval
+        self.tick_count: int = 0
+        self._keyframes: list = []
+        self._pending_tick_flags: int = 0
+        self._file = open(filepath, "wb")
+        self._file.write(bytes(_HEADER.size)) # placeholder, rewritten by close()
+
+    def start_match(self) -> None:
+        """Call when a new match starts, the next recorded tick is flagged so playback resets the scores too."""
+        self._pending_tick_flags |= TICK_FLAG_NEW_MATCH
+
+    def begin_tick(self, game, ball, left_paddle, right_paddle, player_1, player_2) -> None:
+        """Call at the start of every physics tick: snapshots a keyframe (and reseeds the game rng) when one is due."""
+        if self.tick_count % self.keyframe_interval != 0: return
+        rng_seed: int = keyframe_rng_seed(self.seed, self.tick_count)
+        game.rng.seed(rng_seed)
+        self._keyframes.append(_KEYFRAME.pack(
+            self.tick_count, rng_seed,
+            ball.coordinates.x, ball.coordinates.y, ball.previous_coordinates.x, ball.previous_coordinates.y,
+            ball.x_direction, ball.y_direction, ball.current_pcnt_max_speed, ball.angle,
+            left_paddle.top, right_paddle.top, player_1.score, player_2.score
+        ))
+
+    def record_tick(self, dt:float|None, left_input:int, right_input:int) -> None:
+        """Call at the end of every physics tick. dt is the variable step in seconds, or None for the fixed physics dt."""
+        self._file.write(_TICK_RECORD.pack(self.physics_dt if dt is None else dt, left_input, right_input, self._pending_tick_flags))
+        self._pending_tick_flags = 0
+        self.tick_count += 1
+
+    def close(self) -> None:
+        keyframe_offset: int = _HEADER.size + self.tick_count * _TICK_RECORD.size
+        self._file.write(b"".join(self._keyframes))
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, self.field_width, self.field_height, self.physics_dt, self.seed,
+            self.keyframe_interval, self.tick_count, len(self._keyframes), keyframe_offset
+        ))
+        self._file.close()
+
+
+class ReplayPlayer:
+    """Memory-maps a replay file and re-simulates it headlessly on a PongSimulation, seeking through the keyframe index."""
+
+    def __init__(self, filepath:str, screen=None):
+        self._file = open(filepath, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.field_width, self.field_height, self.physics_dt, self.seed,
+         self.keyframe_interval, self.tick_count, self.keyframe_count, self._keyframe_offset) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{filepath} is not a version {REPLAY_VERSION} pong replay file")
+        self.tick: int = 0 # next tick to simulate
+        self.simulation = PongSimulation(field_width=self.field_width, field_height=self.field_height, dt=self.physics_dt, screen=screen)
+        self.seek(0)
+
+    def tick_dt(self, tick:int) -> float:
+        return _TICK_RECORD.unpack_from(self._buffer, _HEADER.size + tick * _TICK_RECORD.size)[0]
+
+    def seek(self, tick:int) -> None:
+        """Restores the nearest keyframe at or before tick, then re-simulates up to (but excluding) tick."""
+        tick = max(0, min(tick, self.tick_count))
+        if self.keyframe_count == 0: return
+        keyframe_idx: int = min(tick // self.keyframe_interval, self.keyframe_count - 1)
+        (keyframe_tick, _, x, y, previous_x, previous_y, x_direction, y_direction, pcnt, angle,
+         left_top, right_top, score_1, score_2) = _KEYFRAME.unpack_from(self._buffer, self._keyframe_offset + keyframe_idx * _KEYFRAME.size)
+
+        simulation = self.simulation
+        simulation.ball.coordinates.update(x, y)
+        simulation.ball.previous_coordinates.update(previous_x, previous_y)
+        simulation.ball.x_direction, simulation.ball.y_direction = x_direction, y_direction
+        simulation.ball.current_pcnt_max_speed, simulation.ball.angle = pcnt, angle
+        simulation.left_paddle.set_top(left_top)
+        simulation.right_paddle.set_top(right_top)
+        simulation.player_1.score, simulation.player_2.score = score_1, score_2
+        simulation.winner = None
+        self.tick = keyframe_tick
+        self.advance(tick - keyframe_tick)
+
+    def advance(self, ticks:int) -> int:
+        """Re-simulates the next ticks (nothing is drawn), returns how many were actually simulated."""
+        end_tick: int = min(self.tick + ticks, self.tick_count)
+        simulation = self.simulation
+        start_offset: int = _HEADER.size + self.tick * _TICK_RECORD.size
+        records = _TICK_RECORD.iter_unpack(self._buffer[start_offset:_HEADER.size + end_tick * _TICK_RECORD.size])
+        for tick, (dt, left_input, right_input, tick_flags) in enumerate(records, start=self.tick):
+            if tick % self.keyframe_interval == 0:
+                simulation.rng.seed(keyframe_rng_seed(self.seed, tick))
+            if tick_flags & TICK_FLAG_NEW_MATCH:
+                simulation.player_1.reset()
+                simulation.player_2.reset()
+                simulation.winner = None
+            simulation.dt = dt
+            simulation.step_inputs(left_input=left_input, right_input=right_input)
+        simulated: int = end_tick - self.tick
+        self.tick = end_tick
+        return simulated
+
+    def close(self) -> None:
+        self._buffer.close()
+        self._file.close()
+
+
+def keyframe_rng_seed(seed:int, tick:int) -> int:
+    return (seed + tick) & 0xFFFFFFFFFFFFFFFF
+
+
+def run_replay_viewer(filepath:str, speed:float=1.0, start_tick:int=0) -> None:
+    """
+        Entry point for 'run.py --replay': plays a replay back in the game window at 'speed' times real time.
+        Only one frame is drawn per display frame, the ticks in between are re-simulated without rendering.
+        Controls: left/right arrow keys jump 10 seconds back/forward, SPACE pauses.
+    """
+    import pygame
+    from pong_game_classes.game import PongGame
+
+    game = PongGame(render_mode="flip")
+    player = ReplayPlayer(filepath, screen=game.screen)
+    player.seek(start_tick)
+    ticks_per_10s: int = round(10 / player.physics_dt)
+    replay_time_behind: float = 0.0 # replay time still to be simulated to catch up with the wall clock
+    paused: bool = False
+    print(f"\nReplay: {player.tick_count} ticks, seed {player.seed}\n")
+
+    while not game.quit_game:
+        if not game.assets_applied: game.apply_preloaded_assets() # window icon
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: game.quit_game = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE: paused = not paused
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT: player.seek(player.tick - ticks_per_10s)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT: player.seek(player.tick + ticks_per_10s)
+
+        if not paused:
+            replay_time_behind += game.clock.get_time() / 1000 * speed
+            ticks_due: int = 0
+            while player.tick + ticks_due < player.tick_count and replay_time_behind >= player.tick_dt(player.tick + ticks_due):
+                replay_time_behind -= player.tick_dt(player.tick + ticks_due)
+                ticks_due += 1
+            player.advance(ticks_due)
+
+        simulation = player.simulation
+        game.begin_frame()
+        game.draw_objects(ball_obj=simulation.ball, left_paddle_obj=simulation.left_paddle, right_paddle_obj=simulation.right_paddle)
+        game.set_screen_text(msg=simulation.player_1.get_score_text(), x_offset_mult=0.5, y_offset_mult=0.1)
+        game.set_screen_text(msg=simulation.player_2.get_score_text(), x_offset_mult=1.5, y_offset_mult=0.1)
+        game.set_screen_text(msg=f"tick {player.tick}/{player.tick_count}  x{speed:g}" + ("  (paused)" if paused else ""), x_offset_mult=0.05, y_offset_mult=1.85)
+        game.end_frame()
+
+    player.close()
+    game.close_and_cleanup()
@@ -0,0 +1,194 @@
+import heapq
+import random
+import zlib
+from statistics import mean
+from time import perf_counter
+
+from pong_game_classes.paddle import MOVE_TO_PADDLE_INPUT, PADDLE_INPUT_NONE
+from pong_game_classes.simulation import PongSimulation
+
+
+class RollbackSession:
+    """
+        Rollback netplay for one peer of a 2-player match. Local input is scheduled input_delay ticks ahead; the remote
+        input of a tick that has not arrived yet is predicted (the remote's latest known input is repeated) so the match
+        never waits for the network. When a remote input arrives that differs from what was predicted for its tick, the
+        simulation is restored to the snapshot of that tick and re-simulated up to the present within the same frame.
+        The simulation only runs ahead of the confirmed remote input by max_prediction ticks, beyond that it stalls.
+    """
+
+    def __init__(self, simulation:PongSimulation, local_is_left:bool, input_delay:int=2, max_prediction:int=8, record_checksums:bool=False):
+        self.simulation: PongSimulation = simulation
+        self.local_is_left: bool = local_is_left
+        self.input_delay: int = input_delay
+        self.max_prediction: int = max_prediction
+        self.tick: int = 0                   # next tick to simulate
+        self.confirmed_tick: int = input_delay - 1 # remote input is known for every tick up to this one
+
+        # nobody can press anything during the first input_delay ticks
+        self._local_inputs: dict = {tick: PADDLE_INPUT_NONE for tick in range(input_delay)} # tick -> input
+        self._last_local_input: int = PADDLE_INPUT_NONE
+        self._remote_inputs: dict = {tick: PADDLE_INPUT_NONE for tick in range(input_delay)} # tick -> input, as received
+        self._predicted_remote: dict = {}    # tick -> remote input the simulation used (ticks past confirmed_tick)
+        self._latest_remote: tuple = (-1, PADDLE_INPUT_NONE) # (tick, input) of the newest remote input received
+        self._rollback_to: int | None = None # earliest mispredicted tick
+        self._snapshots: list = [b""] * (max_prediction + 2) # ring buffer, state at the start of tick t is in slot t % len
+
+        # statistics
+        self.rollbacks: int = 0
+        self.rolled_back_ticks: int = 0
+        self.max_rollback_depth: int = 0
+        self.stalls: int = 0
+        self.record_checksums: bool = record_checksums
+        self.confirmed_checksums: dict = {}  # tick -> crc32 of the confirmed state at the start of that tick
+        self._checksummed_tick: int = -1
+
+    def add_local_input(self, paddle_input:int) -> tuple | None:
+        """
+            Schedules this frame's local input (PADDLE_INPUT_* flags), returns the (tick, input) to send to the remote peer.
+            None if the tick already has an input (the session stalled last frame): sent inputs are never changed.
+        """
+        input_tick: int = self.tick + self.input_delay
+        if input_tick in self._local_inputs: return None
+        self._local_inputs[input_tick] = paddle_input
+        self._last_local_input = paddle_input
+        return input_tick, paddle_input
+
+    def add_remote_input(self, tick:int, paddle_input:int) -> None:
+        if tick <= self.confirmed_tick or tick in self._remote_inputs: return # duplicate
+        self._remote_inputs[tick] = paddle_input
+        if tick > self._latest_remote[0]: self._latest_remote = (tick, paddle_input)
+        predicted: int | None = self._predicted_remote.pop(tick, None)
+        if predicted is not None and predicted != paddle_input:
+            self._rollback_to = tick if self._rollback_to is None else min(self._rollback_to, tick)
+        while self.confirmed_tick + 1 in self._remote_inputs:
+            self.confirmed_tick += 1
+
+    def advance(self) -> bool:
+        """Runs one frame: rolls back and re-simulates if a prediction was wrong, then simulates the next tick. False if stalled."""
+        if self._rollback_to is not None:
+            depth: int = self.tick - self._rollback_to
+            self.simulation.load_state(self._snapshots[self._rollback_to % len(self._snapshots)])
+            for tick in range(self._rollback_to, self.tick):
+                self._simulate(tick)
+            self._rollback_to = None
+            self.rollbacks += 1
+            self.rolled_back_ticks += depth
+            self.max_rollback_depth = max(self.max_rollback_depth, depth)
+
+        stalled: bool = self.tick - self.confirmed_tick > self.max_prediction
+        if stalled:
+            self.stalls += 1
+        else:
+            self._simulate(self.tick)
+            self.tick += 1
+        if self.record_checksums: self._record_confirmed_checksums()
+        self._prune_inputs()
+        return not stalled
+
+    def _simulate(self, tick:int) -> None:
+        self._snapshots[tick % len(self._snapshots)] = self.simulation.save_state()
+        local_input: int = self._local_inputs.get(tick, self._last_local_input)
+        remote_input: int | None = self._remote_inputs.get(tick)
+        if remote_input is None:
+            remote_input = self._predicted_remote[tick] = self._latest_remote[1]
+        if self.local_is_left: self.simulation.step_inputs(local_input, remote_input)
+        else: self.simulation.step_inputs(remote_input, local_input)
+
+    def _record_confirmed_checksums(self) -> None:
+        """crc32 of every state that can no longer change (its tick's inputs are all confirmed), for desync checks."""
+        for tick in range(self._checksummed_tick + 1, min(self.confirmed_tick, self.tick - 1) + 1):
+            state: bytes = self._snapshots[(tick + 1) % len(self._snapshots)] if tick + 1 < self.tick else self.simulation.save_state()
+            self.confirmed_checksums[tick + 1] = zlib.crc32(state)
+            self._checksummed_tick = tick
+
+    def _prune_inputs(self) -> None:
+        for tick in [tick for tick in self._remote_inputs if tick < self.confirmed_tick]:
+            del self._remote_inputs[tick]
+        for tick in [tick for tick in self._local_inputs if tick < self.tick - self.max_prediction - 1]:
+            del self._local_inputs[tick]
+
+
+class _LoopbackLink:
+    """One direction of a simulated network link: each packet is delivered after latency_ms +- jitter_ms (so packets may reorder)."""
+
+    def __init__(self, latency_ms:float, jitter_ms:float, rng:random.Random):
+        self.latency_ms: float = latency_ms
+        self.jitter_ms: float = jitter_ms
+        self.rng: random.Random = rng
+        self._in_flight: list = [] # heap of (delivery time, sequence, payload)
+        self._sequence: int = 0
+
+    def send(self, now_ms:float, payload:tuple) -> None:
+        delay_ms: float = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms))
+        heapq.heappush(self._in_flight, (now_ms + delay_ms, self._sequence, payload))
+        self._sequence += 1
+
+    def receive(self, now_ms:float) -> list:
+        delivered: list = []
+        while self._in_flight and self._in_flight[0][0] <= now_ms:
+            delivered.append(heapq.heappop(self._in_flight)[2])
+        return delivered
+
+
+def run_loopback_test(frames:int=3600, latency_ms:float=60.0, jitter_ms:float=15.0, input_delay:int=2, max_prediction:int=8, fps:int=60, seed:int=0) -> dict:
+    """
+        Plays a 2-player match between two RollbackSessions in one process, connected by simulated links with latency and
+        jitter, both paddles driven by the easy ai on each peer's own (predicted) view of the match. Reports rollbacks,
+        stalls and re-simulation cost, and checks that both peers agree on every confirmed state.
+    """
+    rng = random.Random(seed)
+    random.seed(seed) # AIController error terms
+    frame_ms: float = 1000 / fps
+    peers: list = [
+        RollbackSession(PongSimulation(dt=1 / fps, seed=seed), local_is_left=local_is_left, input_delay=input_delay,
+                        max_prediction=max_prediction, record_checksums=True)
+        for local_is_left in (True, False)
+    ]
+    links: list = [_LoopbackLink(latency_ms, jitter_ms, rng), _LoopbackLink(latency_ms, jitter_ms, rng)] # links[i]: peer i -> other peer
+    frame_times_ms: list = []
+
+    for frame in range(frames):
+        now_ms: float = frame * frame_ms
+        for peer_idx, peer in enumerate(peers):
+            for tick, paddle_input in links[1 - peer_idx].receive(now_ms):
+                peer.add_remote_input(tick, paddle_input)
+            move: str = peer.simulation.ai_decision("easy", left_side_paddle=peer.local_is_left)
+            packet: tuple | None = peer.add_local_input(MOVE_TO_PADDLE_INPUT[move])
+            if packet is not None: links[peer_idx].send(now_ms, packet)
+            start: float = perf_counter()
+            peer.advance()
+            frame_times_ms.append((perf_counter() - start) * 1000)
+
+    common_ticks: set = peers[0].confirmed_checksums.keys() & peers[1].confirmed_checksums.keys()
+    desyncs: int = sum(peers[0].confirmed_checksums[tick] != peers[1].confirmed_checksums[tick] for tick in common_ticks)
+    frame_times_ms.sort()
+    return {
+        "frames": frames,
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "input_delay": input_delay,
+        "max_prediction": max_prediction,
+        "rollbacks": [peer.rollbacks for peer in peers],
+        "rolled_back_ticks": [peer.rolled_back_ticks for peer in peers],
+        "mean_rollback_depth": [peer.rolled_back_ticks / peer.rollbacks if peer.rollbacks else 0.0 for peer in peers],
+        "max_rollback_depth": [peer.max_rollback_depth for peer in peers],
+        "stalls": [peer.stalls for peer in peers],
+        "ticks": [peer.tick for peer in peers],
+        "checked_ticks": len(common_ticks),
+        "desyncs": desyncs,
+        "advance_mean_ms": mean(frame_times_ms),
+        "advance_p99_ms": frame_times_ms[int(len(frame_times_ms) * 0.99)],
+        "score": (peers[0].simulation.player_1.score, peers[0].simulation.player_2.score),
+    }
+
+
+def print_loopback_report(report:dict) -> None:
+    print(f"\nloopback 2p rollback: {report['frames']} frames, latency {report['latency_ms']:.0f}ms +- {report['jitter_ms']:.0f}ms, "
+          f"input delay {report['input_delay']} ticks, prediction window {report['max_prediction']} ticks")
+    for peer_idx, side in enumerate(("left", "right")):
+        print(f"  {side} peer: {report['rollbacks'][peer_idx]} rollbacks, {report['rolled_back_ticks'][peer_idx]} ticks re-simulated "
+              f"(mean depth {report['mean_rollback_depth'][peer_idx]:.1f}, max {report['max_rollback_depth'][peer_idx]}), "
+              f"{report['stalls'][peer_idx]} stalled frames, {report['ticks'][peer_idx]} ticks simulated")
+    print(f"  advance() per frame: mean {report['advance_mean_ms']:.3f}ms, p99 {report['advance_p99_ms']:.3f}ms")
+    print(f"  {report['checked_ticks']} confirmed states compared, {report['desyncs']} desyncs, score {report['score'][0]}-{report['score'][1]}")
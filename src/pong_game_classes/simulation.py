@@ -0,0 +1,213 @@
+import random
+import struct
+from time import perf_counter
+
+from pong_game_classes.ai_controller import AIController
+from pong_game_classes.ball import PongBall
+from pong_game_classes.game import POINTS_PER_GAME
+from pong_game_classes.paddle import MOVE_TO_PADDLE_INPUT, PongPaddle
+from pong_game_classes.player import Player
+from pong_game_classes.telemetry import MatchTelemetry
+
+# PongSimulation.save_state() layout: ticks, rng version, ball x/y, ball previous x/y, ball x/y direction,
+# speed pcnt, angle, left/right paddle top, scores, winner (0: none, 1: player 1, 2: player 2)
+_STATE = struct.Struct("<IIddddbbddddHHB")
+
+
+class VersionedRandom(random.Random):
+    """
+        random.Random that counts the changes of its state. The game only draws from it when the ball is served, so a state
+        snapshot can refer to the (expensive to copy) generator state by version and only copy it when it actually changed.
+    """
+    version: int = 0
+
+    def seed(self, *args, **kwargs) -> None:
+        super().seed(*args, **kwargs)
+        self.version += 1
+
+    def choice(self, seq):
+        self.version += 1
+        return super().choice(seq)
+
+
+class PongSimulation:
+    """
+        Headless counterpart of PongGame. Drives the very same PongBall/PongPaddle physics with plain geometry:
+        no window, no drawing surface, no sounds and no frame cap. Unlike PongGame this is not a singleton,
+        so any number of simulations can live side by side in one process.
+    """
+
+    def __init__(self, field_width:int=1280, field_height:int=720, dt:float=1/60, points_per_game:int=POINTS_PER_GAME, seed:int|None=None, screen=None):
+        self.field_width: int = field_width
+        self.field_height: int = field_height
+        self.mid_screen_coordinate: tuple = (field_width*0.5, field_height*0.5) # [0]: x-coordinate, [1]: y-coordinate
+        self.dt: float = dt                  # fixed step, in seconds
+        self.points_per_game: int = points_per_game
+        self.enable_sounds: bool = False
+        self.rng = VersionedRandom(seed)     # game-play randomness (ball serve direction)
+        self.screen = screen                 # optional surface, only needed to draw the simulation (e.g. the replay viewer)
+        self._debug_game: bool = False
+        self.telemetry: MatchTelemetry | None = None # match event recording, None when off
+        self.intercept_cache: dict = {}      # this simulation's ai predictions (see AIController._predictive_tracking_decision)
+        self.ticks: int = 0
+        self.winner: Player | None = None
+        self._rng_states: dict = {}          # rng version -> getstate(), for the versions referenced by saved states
+
+        self.player_1 = Player(name="P1-  ")
+        self.player_2 = Player(name="P2-  ")
+        self.left_paddle = PongPaddle(player_assigned=self.player_1, game=self)
+        self.right_paddle = PongPaddle(player_assigned=self.player_2, left_side_paddle=False, game=self)
+        self.ball = PongBall(game=self)
+
+    def ai_decision(self, ai_difficulty:str, left_side_paddle:bool=False) -> str:
+        """Returns the AIController decision ('move_up', 'move_down' or 'stay') for either paddle."""
+        paddle_obj: PongPaddle = self.left_paddle if left_side_paddle else self.right_paddle
+        decision: str = AIController.return_decision(
+            ai_difficulty=ai_difficulty,
+            ball_trajectory_snapshot=self.ball.yield_trajectory_prediction_data(),
+            paddle_position=paddle_obj.ai_position(),
+            game_dt=self.dt,
+            approach_direction=-1 if left_side_paddle else 1,
+            field_size=(self.field_width, self.field_height),
+            intercept_cache=self.intercept_cache
+        )
+        if self.telemetry is not None: self.telemetry.ai_decision(
+            side="left" if left_side_paddle else "right", ai_difficulty=ai_difficulty, move=decision,
+            trajectory_id=self.ball.trajectory_id, ball_y=self.ball.coordinates.y, paddle_y=paddle_obj.rect.centery
+        )
+        return decision
+
+    def bound_paddle_in_screen_window(self, paddle_obj: PongPaddle) -> None:
+        """Keeps the paddle inside the field (same rule as PongGame.bound_paddle_in_screen_window)."""
+        paddle_obj.set_top(max(min(paddle_obj.top, self.field_height - paddle_obj.rect.height), 0))
+
+    def check_for_vertical_boundary_collision(self) -> bool:
+        """Same scoring rule as PongGame.check_for_vertical_boundary_collision, returns True if a point was scored."""
+        left_paddle_wins: bool = self.ball.rect.x >= self.field_width - self.ball.rect.width
+        right_paddle_wins: bool = self.ball.rect.x <= 0
+
+        if (left_paddle_wins or right_paddle_wins):
+            if left_paddle_wins:
+                self.player_1.increment_score()
+            else:
+                self.player_2.increment_score()
+            if self.telemetry is not None: self.telemetry.point_scored(
+                scorer="left" if left_paddle_wins else "right", score=(self.player_1.get_score(), self.player_2.get_score()), ball=self.ball
+            )
+            self.ball.reset()
+            self.left_paddle.reset()
+            self.right_paddle.reset()
+            return True
+        return False
+
+    def check_for_winner(self) -> Player | None:
+        """Sets and returns the winning player once either score reaches points_per_game."""
+        previous_winner: Player | None = self.winner
+        for player in (self.player_1, self.player_2):
+            if player.get_score() == self.points_per_game:
+                self.winner = player
+        if self.winner is not previous_winner and self.telemetry is not None: self.telemetry.match_won(
+            winner="left" if self.winner is self.player_1 else "right", score=(self.player_1.get_score(), self.player_2.get_score())
+        )
+        return self.winner
+
+    def save_state(self) -> bytes:
+        """
+            Compact snapshot of the full simulation state (_STATE, 79 bytes). The rng state is kept aside by version
+            (see VersionedRandom), so saving costs a struct.pack unless a serve happened since the last save.
+        """
+        rng_version: int = self.rng.version
+        if rng_version not in self._rng_states:
+            if len(self._rng_states) >= 64: del self._rng_states[next(iter(self._rng_states))] # only recent versions are ever restored
+            self._rng_states[rng_version] = self.rng.getstate()
+        ball = self.ball
+        return _STATE.pack(
+            self.ticks, rng_version,
+            ball.coordinates.x, ball.coordinates.y, ball.previous_coordinates.x, ball.previous_coordinates.y,
+            ball.x_direction, ball.y_direction, ball.current_pcnt_max_speed, ball.angle,
+            self.left_paddle.top, self.right_paddle.top, self.player_1.score, self.player_2.score,
+            0 if self.winner is None else (1 if self.winner is self.player_1 else 2)
+        )
+
+    def load_state(self, state:bytes) -> None:
+        """Restores a save_state() snapshot taken from this simulation."""
+        ball = self.ball
+        (self.ticks, rng_version, ball_x, ball_y, previous_x, previous_y,
+         ball.x_direction, ball.y_direction, ball.current_pcnt_max_speed, ball.angle,
+         left_top, right_top, self.player_1.score, self.player_2.score, winner) = _STATE.unpack(state)
+        if rng_version != self.rng.version:
+            self.rng.setstate(self._rng_states[rng_version])
+            self.rng.version = rng_version
+        ball.coordinates.update(ball_x, ball_y)
+        ball.previous_coordinates.update(previous_x, previous_y)
+        ball.update_rect()
+        ball.new_trajectory_id()
+        self.left_paddle.set_top(left_top)
+        self.left_paddle.previous_top = left_top
+        self.right_paddle.set_top(right_top)
+        self.right_paddle.previous_top = right_top
+        self.winner = (None, self.player_1, self.player_2)[winner]
+
+    def reset_match(self) -> None:
+        """Resets scores, ball and paddles so a new match can be played."""
+        self.player_1.reset()
+        self.player_2.reset()
+        self.ball.reset()
+        self.left_paddle.reset()
+        self.right_paddle.reset()
+        self.winner = None
+        self.intercept_cache.clear()
+
+    def step(self, left_move:str="stay", right_move:str="stay") -> None:
+        """
+            Advances the simulation by one tick, in the same order as GameLoop._physics_tick.
+            Moves are the AIController vocabulary: 'move_up', 'move_down' or 'stay'.
+        """
+        self.step_inputs(left_input=MOVE_TO_PADDLE_INPUT[left_move], right_input=MOVE_TO_PADDLE_INPUT[right_move])
+
+    def step_inputs(self, left_input:int, right_input:int) -> None:
+        """Same as step(), with the paddle inputs given as PADDLE_INPUT_* bit-flags."""
+        self.ball.update_rect() # GameLoop does this while drawing, at the start of the frame
+
+        self.ball.check_and_bounce_at_rect_collision(rect_obj=self.left_paddle.rect)
+        self.ball.check_and_bounce_at_rect_collision(rect_obj=self.right_paddle.rect)
+        self.ball.check_and_bounce_at_horizontal_boundary_collision()
+        self.ball.update_trajectory()
+        self.check_for_vertical_boundary_collision()
+
+        self.left_paddle.apply_input(left_input)
+        self.right_paddle.apply_input(right_input)
+        self.bound_paddle_in_screen_window(self.left_paddle)
+        self.bound_paddle_in_screen_window(self.right_paddle)
+
+        self.check_for_winner()
+        self.ticks += 1
+
+    def run_match(self, left_difficulty:str="easy", right_difficulty:str="easy", max_ticks:int=36_000) -> Player | None:
+        """Plays ai vs ai until someone wins (or max_ticks elapse, 10 minutes of 60 FPS play by default). Returns the winning player, or None."""
+        self.reset_match()
+        if self.telemetry is not None: self.telemetry.start_match(
+            mode="headless", left_difficulty=left_difficulty, right_difficulty=right_difficulty, points_per_game=self.points_per_game
+        )
+        start_tick: int = self.ticks
+        while self.winner is None and self.ticks - start_tick < max_ticks:
+            self.step(
+                left_move=self.ai_decision(left_difficulty, left_side_paddle=True),
+                right_move=self.ai_decision(right_difficulty)
+            )
+        return self.winner
+
+
+def run_headless(matches:int, left_difficulty:str="easy", right_difficulty:str="easy", telemetry_path:str|None=None, telemetry_max_bytes:int=16 * 2**20) -> None:
+    """Entry point for 'run.py --headless': plays ai vs ai matches and prints the simulation throughput (telemetry_path: see --telemetry)."""
+    simulation = PongSimulation()
+    if telemetry_path: simulation.telemetry = MatchTelemetry(filepath=telemetry_path, max_file_bytes=telemetry_max_bytes)
+    start: float = perf_counter()
+    for match_idx in range(matches):
+        winner = simulation.run_match(left_difficulty=left_difficulty, right_difficulty=right_difficulty)
+        print(f"match {match_idx + 1}: {winner.get_name() if winner else 'no winner '}({simulation.player_1.get_score()}-{simulation.player_2.get_score()})")
+    elapsed: float = perf_counter() - start
+    print(f"\n{simulation.ticks} ticks in {elapsed:.2f}s ({simulation.ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+    if "hard" in (left_difficulty, right_difficulty):
+        print(f"ai intercept predictions: {AIController.get_prediction_stats()}")
+    if simulation.telemetry: simulation.telemetry.close()
@@ -0,0 +1,55 @@
+import pygame
+
+class SoundEngine:
+    """
+        Sound-effect subsystem. Every effect is decoded (or synthesized) once into a pygame.mixer.Sound at startup and played on a
+        reserved pool of mixer channels, so playing an effect never touches the disk and never interrupts the
+        soundtrack on the pygame.mixer.music stream. Each effect is rate limited: a replay requested within its
+        minimum interval is dropped instead of stacking up during a burst of bounces.
+    """
+
+    def __init__(self, effect_filepaths:dict|None=None, min_interval_ms:dict|None=None, num_channels:int=4, volume:float=1.0,
+                 effect_sounds:dict|None=None):
+        """
+            Parameter(s):
+                - effect_filepaths (dict): effect name -> path of the sound file to decode
+                - effect_sounds (dict): effect name -> pygame.mixer.Sound already in memory (e.g. from sound_synth)
+                - min_interval_ms (dict): effect name -> minimum time between two plays of that effect (default 0)
+                - num_channels (int): size of the channel pool reserved for sound-effects
+        """
+        if not pygame.mixer.get_init(): pygame.mixer.init()
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), num_channels))
+        pygame.mixer.set_reserved(num_channels) # reserved channels are never picked by Sound.play()/find_channel()
+
+        self._channels: list = [pygame.mixer.Channel(idx) for idx in range(num_channels)]
+        self._next_channel_idx: int = 0
+        self._sounds: dict = dict(effect_sounds or {})
+        for name, filepath in (effect_filepaths or {}).items():
+            self._sounds[name] = pygame.mixer.Sound(filepath)
+        for sound in self._sounds.values():
+            sound.set_volume(volume)
+        self._min_interval_ms: dict = min_interval_ms or {}
+        self._last_played_ms: dict = {}
+        self.dropped_plays: int = 0
+
+    def _next_channel(self) -> pygame.mixer.Channel:
+        """Returns an idle channel of the pool, or (if every channel is busy) the next one in round-robin order."""
+        for offset in range(len(self._channels)):
+            channel = self._channels[(self._next_channel_idx + offset) % len(self._channels)]
+            if not channel.get_busy():
+                return channel
+        channel = self._channels[self._next_channel_idx] # every channel is busy, steal them in round-robin order
+        self._next_channel_idx = (self._next_channel_idx + 1) % len(self._channels)
+        return channel
+
+    def play(self, effect:str) -> bool:
+        """Plays the effect once, returns False if the play was dropped by the effect's rate limit."""
+        now_ms: int = pygame.time.get_ticks()
+        last_played_ms: int | None = self._last_played_ms.get(effect)
+        if last_played_ms is not None and now_ms - last_played_ms < self._min_interval_ms.get(effect, 0):
+            self.dropped_plays += 1
+            return False
+
+        self._last_played_ms[effect] = now_ms
+        self._next_channel().play(self._sounds[effect])
+        return True
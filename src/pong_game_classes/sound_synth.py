@@ -0,0 +1,85 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pygame
+
+from misc.get_parent_dir import ROOT_DIR
+
+SYNTH_VERSION: int = 1 # bump when synthesize() changes, so cached buffers of the old code are not reused
+DEFAULT_CACHE_DIR: Path = ROOT_DIR / ".cache" / "sounds"
+
+# effect name -> synthesis parameters (the cache key is a hash of these, so editing a recipe re-synthesizes that effect)
+#   tones: (start Hz, end Hz, gain dB) sine sweeps (linear in frequency) layered on top of each other
+EFFECT_RECIPES: dict = {
+    "paddle_hit": {"tones": [(900, 500, 0.0)], "duration_ms": 120, "fade_out_ms": 50},             # descending blip (laser feel)
+    "wall_bounce": {"tones": [(500, 1000, 0.0)], "duration_ms": 100, "fade_out_ms": 50},           # ascending ping (spacy sparkle)
+    "score_point": {"tones": [(600, 600, 0.0), (900, 900, -3.0)], "duration_ms": 120, "fade_out_ms": 80}, # double chime
+}
+PEAK_AMPLITUDE: float = 0.8 # of full scale, layered tones are scaled down together so they never clip
+
+# pygame.mixer sample size -> numpy dtype of the raw buffer
+_SAMPLE_DTYPES: dict = {-16: "<i2", 16: "<u2", -8: "i1", 8: "u1", 32: "<f4", -32: "<f4"} # float32 mixers report -32 (signed) or 32
+
+
+def synthesize(recipe:dict, sample_rate:int, size:int, channels:int):
+    """
+        Renders a recipe into a numpy array in the mixer's sample format, (samples, channels) shaped or 1-dimensional for
+        a mono mixer (pygame.sndarray.make_sound() wants the array of the mixer's channel count).
+    """
+    import numpy as np # only needed on a cache miss
+
+    num_samples: int = int(sample_rate * recipe["duration_ms"] / 1000)
+    progress = np.arange(num_samples) / num_samples
+    wave = np.zeros(num_samples)
+    for start_hz, end_hz, gain_db in recipe["tones"]:
+        frequency = start_hz + (end_hz - start_hz) * progress
+        phase = 2 * np.pi * np.cumsum(frequency) / sample_rate # integrated frequency, the sweep has no phase jumps
+        wave += 10 ** (gain_db / 20) * np.sin(phase)
+    fade_samples: int = min(num_samples, int(sample_rate * recipe["fade_out_ms"] / 1000))
+    if fade_samples: wave[num_samples - fade_samples:] *= np.linspace(1.0, 0.0, fade_samples)
+    wave *= PEAK_AMPLITUDE / max(np.abs(wave).max(), 1e-9)
+
+    dtype = np.dtype(_SAMPLE_DTYPES[size])
+    if dtype.kind == "f":
+        samples = wave.astype(dtype)
+    else:
+        info = np.iinfo(dtype)
+        samples = np.round(wave * (info.max - (info.max + info.min) / 2) + (info.max + info.min + 1) // 2).astype(dtype)
+    if channels == 1: return samples
+    return np.repeat(samples[:, np.newaxis], channels, axis=1)
+
+
+def recipe_hash(recipe:dict, sample_rate:int, size:int, channels:int) -> str:
+    key: str = json.dumps({"recipe": recipe, "format": [sample_rate, size, channels], "version": SYNTH_VERSION}, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def load_synthesized_sounds(recipes:dict|None=None, cache_dir:Path|str|None=DEFAULT_CACHE_DIR) -> dict:
+    """
+        Returns {effect name: pygame.mixer.Sound} for the recipes (EFFECT_RECIPES by default), in the format of the
+        initialized mixer. Each effect's raw sample buffer is cached in cache_dir under the hash of its recipe and the
+        mixer format: a cache hit is a file read handed to the mixer as is, only a miss imports numpy and synthesizes.
+        No caching if cache_dir is None.
+    """
+    if not pygame.mixer.get_init(): pygame.mixer.init()
+    sample_rate, size, channels = pygame.mixer.get_init()
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    sounds: dict = {}
+    for name, recipe in (recipes or EFFECT_RECIPES).items():
+        cache_filepath: Path | None = None
+        if cache_dir is not None:
+            cache_filepath = cache_dir / f"{name}-{recipe_hash(recipe, sample_rate, size, channels)}.raw"
+            if cache_filepath.exists():
+                sounds[name] = pygame.mixer.Sound(buffer=cache_filepath.read_bytes())
+                continue
+        samples = synthesize(recipe, sample_rate, size, channels)
+        sounds[name] = pygame.sndarray.make_sound(samples)
+        if cache_filepath is not None:
+            temporary_filepath: Path = cache_filepath.with_suffix(".tmp")
+            temporary_filepath.write_bytes(samples.tobytes())
+            temporary_filepath.replace(cache_filepath) # atomic, a concurrent start never reads a half written buffer
+    return sounds
@@ -0,0 +1,203 @@
+"""
+    Match telemetry: rallies, paddle bounces (angle and speed ramp), ai decisions, points and match results, recorded
+    where they happen in the game (PongGame or a headless PongSimulation, whose 'telemetry' attribute is None when off).
+    An ai decides every tick, its decisions are recorded as one 'ai_trajectory' event per ball trajectory (between two
+    bounces) and side: how many ticks it moved up, down or stayed and how often it changed its mind.
+
+    The game thread only appends a tuple to a deque (append/popleft are atomic, no lock is taken); a background thread
+    drains it every flush_interval_s, or as soon as a batch_size batch is pending, and writes the events in batches. When the writer falls behind (slow disk), events
+    are dropped and counted once max_pending are waiting, the game never blocks on telemetry.
+
+    Output by file extension, rotated to <name>.1<ext> ... <name>.<max_files><ext> once a file reaches max_file_bytes:
+    .jsonl          one json object per line: {"t": unix time, "match": match number, "event": type, ...fields}
+    .db / .sqlite   table events(t REAL, match INTEGER, event TEXT, data TEXT), data being the fields as json
+"""
+import json
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from time import time
+
+SQLITE_EXTENSIONS: tuple = (".db", ".sqlite", ".sqlite3")
+
+
+def _rotate(filepath:Path, max_files:int) -> None:
+    """filepath -> <name>.1<ext>, <name>.1<ext> -> <name>.2<ext>, ... the oldest beyond max_files is deleted."""
+    def numbered(index:int) -> Path: return filepath.with_name(f"{filepath.stem}.{index}{filepath.suffix}")
+    numbered(max_files).unlink(missing_ok=True)
+    for index in range(max_files - 1, 0, -1):
+        if numbered(index).exists(): numbered(index).replace(numbered(index + 1))
+    if filepath.exists(): filepath.replace(numbered(1))
+
+
+class _JsonlSink:
+    def __init__(self, filepath:Path, max_file_bytes:int, max_files:int):
+        self.filepath: Path = filepath
+        self.max_file_bytes: int = max_file_bytes
+        self.max_files: int = max_files
+        self._file = None # opened by the writer thread on the first batch
+
+    def write(self, batch:list) -> None:
+        if self._file is None: self._file = open(self.filepath, "a", encoding="utf-8")
+        self._file.write("".join(
+            json.dumps({"t": timestamp, "match": match, "event": event, **fields}) + "\n" for timestamp, match, event, fields in batch
+        ))
+        self._file.flush()
+        if self._file.tell() >= self.max_file_bytes:
+            self._file.close()
+            _rotate(self.filepath, self.max_files)
+            self._file = open(self.filepath, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        if self._file is not None: self._file.close()
+
+
+class _SqliteSink:
+    def __init__(self, filepath:Path, max_file_bytes:int, max_files:int):
+        self.filepath: Path = filepath
+        self.max_file_bytes: int = max_file_bytes
+        self.max_files: int = max_files
+        self._connection: sqlite3.Connection | None = None # sqlite connections belong to the thread that opened them
+
+    def _connect(self) -> None:
+        self._connection = sqlite3.connect(self.filepath)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS events (t REAL, match INTEGER, event TEXT, data TEXT)")
+
+    def write(self, batch:list) -> None:
+        if self._connection is None: self._connect()
+        with self._connection: # one transaction per batch
+            self._connection.executemany(
+                "INSERT INTO events VALUES (?, ?, ?, ?)", [(timestamp, match, event, json.dumps(fields)) for timestamp, match, event, fields in batch]
+            )
+        if self.filepath.stat().st_size >= self.max_file_bytes:
+            self._connection.close()
+            _rotate(self.filepath, self.max_files)
+            self._connect()
+
+    def close(self) -> None:
+        if self._connection is not None: self._connection.close()
+
+
+class MatchTelemetry:
+    """Event recorder handed to a PongGame/PongSimulation (see the module docstring). Call close() to write what is left."""
+
+    def __init__(self, filepath:str, max_pending:int=10_000, batch_size:int=512, flush_interval_s:float=0.5,
+                 max_file_bytes:int=16 * 2**20, max_files:int=5):
+        self.filepath: Path = Path(filepath)
+        self.max_pending: int = max_pending
+        self.batch_size: int = batch_size
+        self.flush_interval_s: float = flush_interval_s
+        sink_type = _SqliteSink if self.filepath.suffix.lower() in SQLITE_EXTENSIONS else _JsonlSink
+        self._sink = sink_type(self.filepath, max_file_bytes, max_files)
+
+        self._events: deque = deque()   # (unix time, match, event, fields), appended by the game, drained by the writer
+        self.match: int = 0
+        self.rally_hits: int = 0        # paddle hits since the last point
+        self._ai_trajectories: dict = {} # side -> decisions of the ball trajectory in progress, see ai_decision()
+        self.emitted: int = 0
+        # dropped events, one counter per thread that drops them (a shared += from two threads could lose counts)
+        self.dropped_queue_full: int = 0     # game thread: max_pending were waiting (writer behind)
+        self.dropped_write_errors: int = 0   # writer thread: a batch failed to write
+        self.written: int = 0
+        self.write_errors: int = 0
+
+        self._batch_pending = threading.Event() # set once per full batch, wakes the writer before its flush interval
+        self._closing: bool = False
+        self._writer_thread = threading.Thread(target=self._writer, name="telemetry-writer", daemon=True)
+        self._writer_thread.start()
+
+    def emit(self, event:str, fields:dict) -> None:
+        """Queues an event, never blocks: dropped (and counted) if the writer is max_pending events behind."""
+        self.emitted += 1
+        if len(self._events) >= self.max_pending:
+            self.dropped_queue_full += 1
+            return
+        self._events.append((time(), self.match, event, fields))
+        if len(self._events) == self.batch_size: self._batch_pending.set()
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_queue_full + self.dropped_write_errors
+
+    def start_match(self, **match_info) -> None:
+        self.match += 1
+        self.rally_hits = 0
+        self._ai_trajectories.clear()
+        self.emit("match_start", match_info)
+
+    def paddle_bounce(self, ball) -> None:
+        """Call after the ball bounced off a paddle (its new angle, direction and speed are set)."""
+        self.rally_hits += 1
+        self.emit("paddle_bounce", {
+            "paddle": "left" if ball.x_direction > 0 else "right", "rally_hits": self.rally_hits, "angle": ball.angle,
+            "pcnt_max_speed": ball.current_pcnt_max_speed, "y_direction": ball.y_direction, "ball_y": ball.coordinates.y,
+        })
+
+    def ai_decision(self, side:str, ai_difficulty:str, move:str, trajectory_id:int, ball_y:float, paddle_y:float) -> None:
+        """
+            Counts an ai's decision (made every tick) into the summary of the ball trajectory it was made for, the summary
+            is recorded once the ai decides for another trajectory (or the point ends).
+        """
+        summary: dict | None = self._ai_trajectories.get(side)
+        if summary is None or summary["trajectory_id"] != trajectory_id:
+            if summary is not None: self.emit("ai_trajectory", summary)
+            summary = {
+                "side": side, "difficulty": ai_difficulty, "trajectory_id": trajectory_id, "ticks": 0, "move_up": 0,
+                "move_down": 0, "stay": 0, "changes": 0, "first_move": move, "ball_y": ball_y, "paddle_y": paddle_y,
+            }
+            self._ai_trajectories[side] = summary
+        elif summary["last_move"] != move:
+            summary["changes"] += 1
+        summary["ticks"] += 1
+        summary[move] += 1
+        summary["last_move"] = move
+        summary["last_paddle_y"] = paddle_y
+
+    def _flush_ai_trajectories(self) -> None:
+        for summary in self._ai_trajectories.values():
+            self.emit("ai_trajectory", summary)
+        self._ai_trajectories.clear()
+
+    def point_scored(self, scorer:str, score:tuple, ball) -> None:
+        """Call when the ball left the field, before it is reset."""
+        self._flush_ai_trajectories()
+        self.emit("point", {
+            "scorer": scorer, "score": score, "rally_hits": self.rally_hits, "pcnt_max_speed": ball.current_pcnt_max_speed,
+            "ball_y": ball.coordinates.y,
+        })
+        self.rally_hits = 0
+
+    def match_won(self, winner:str, score:tuple) -> None:
+        self.emit("match_end", {"winner": winner, "score": score})
+
+    def close(self) -> None:
+        """Stops the writer thread once the queued events are written and prints how many made it to disk."""
+        self._flush_ai_trajectories()
+        self._closing = True
+        self._batch_pending.set()
+        self._writer_thread.join()
+        print(
+            f"\nTelemetry: {self.written} events written to {self.filepath}, {self.dropped} dropped "
+            f"({self.dropped_queue_full} with the writer behind, {self.dropped_write_errors} by write errors)"
+        )
+
+    def _writer(self) -> None:
+        while True:
+            self._batch_pending.wait(self.flush_interval_s)
+            self._batch_pending.clear()
+            closing: bool = self._closing
+            self._write_pending()
+            if closing: break
+        self._sink.close()
+
+    def _write_pending(self) -> None:
+        events: deque = self._events
+        while events:
+            batch: list = [events.popleft() for _ in range(min(self.batch_size, len(events)))]
+            try:
+                self._sink.write(batch)
+                self.written += len(batch)
+            except (OSError, sqlite3.Error):
+                self.write_errors += 1
+                self.dropped_write_errors += len(batch)
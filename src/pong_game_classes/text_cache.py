@@ -0,0 +1,37 @@
+from collections import OrderedDict
+
+import pygame
+
+class TextRenderCache:
+    """
+        Memoizes font.render() surfaces keyed by (message, color, antialias), evicting the least recently used
+        entry once max_entries is reached. Static instruction lines are rendered once, and score labels only
+        when the score (and therefore the message) changes.
+    """
+
+    def __init__(self, font:pygame.font.Font, max_entries:int=64):
+        self.font = font
+        self.max_entries: int = max_entries
+        self._surfaces: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def render(self, msg:str, color="white", antialias:bool=False) -> pygame.Surface:
+        """Drop-in replacement for font.render(msg, antialias, color) that returns a cached surface when possible."""
+        key: tuple = (msg, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font.render(msg, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False) # evict least recently used
+        return surface
+
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,136 @@
+import os
+import random
+from multiprocessing import Pool
+from statistics import mean, median
+from time import perf_counter
+
+from pong_game_classes.ai_controller import AIController
+from pong_game_classes.simulation import PongSimulation
+
+# pairing name -> (left paddle controller, right paddle controller)
+PAIRINGS: dict = {
+    "easy-vs-easy": ("easy", "easy"),
+    "easy-vs-hard": ("easy", "hard"),
+    "hard-vs-hard": ("hard", "hard"),
+    "easy-vs-scripted": ("easy", "scripted"),
+    "hard-vs-scripted": ("hard", "scripted"),
+    "trained-vs-easy": ("trained", "easy"),
+    "trained-vs-hard": ("trained", "hard"),
+}
+
+
+def scripted_decision(simulation:PongSimulation, left_side_paddle:bool) -> str:
+    """Deterministic baseline opponent: keeps the paddle centre on the ball's current y-position, no error, no prediction."""
+    paddle_obj = simulation.left_paddle if left_side_paddle else simulation.right_paddle
+    paddle_center: float = paddle_obj.rect.y + paddle_obj.paddle_height*0.5
+    if simulation.ball.coordinates.y < paddle_center - 5: return "move_up"
+    if simulation.ball.coordinates.y > paddle_center + 5: return "move_down"
+    return "stay"
+
+
+def play_match(match_seed:int, left_controller:str, right_controller:str, max_ticks:int) -> dict:
+    """
+        Plays one headless match on a PongSimulation (PongBall physics, PongGame scoring) and returns its statistics.
+        Every source of randomness is seeded from match_seed, so a match's result does not depend on the worker running it.
+    """
+    random.seed(match_seed)                 # AIController error terms
+    simulation = PongSimulation(seed=match_seed)
+    ball = simulation.ball
+
+    def decide(controller:str, left_side_paddle:bool) -> str:
+        if controller == "scripted": return scripted_decision(simulation, left_side_paddle)
+        return simulation.ai_decision(controller, left_side_paddle=left_side_paddle)
+
+    rally_lengths: list = []
+    scoring_speeds: list = []
+    paddle_hits: int = 0
+    while simulation.winner is None and simulation.ticks < max_ticks:
+        x_direction, pcnt_max_speed = ball.x_direction, ball.current_pcnt_max_speed
+        total_score: int = simulation.player_1.score + simulation.player_2.score
+        simulation.step(left_move=decide(left_controller, True), right_move=decide(right_controller, False))
+
+        if simulation.player_1.score + simulation.player_2.score != total_score: # point scored (ball was reset)
+            rally_lengths.append(paddle_hits)
+            scoring_speeds.append(pcnt_max_speed * ball.max_speed_x)
+            paddle_hits = 0
+        elif ball.x_direction != x_direction:
+            paddle_hits += 1
+
+    return {
+        "seed": match_seed,
+        "winner": None if simulation.winner is None else ("left" if simulation.winner is simulation.player_1 else "right"),
+        "score": (simulation.player_1.score, simulation.player_2.score),
+        "ticks": simulation.ticks,
+        "rally_lengths": rally_lengths,
+        "scoring_speeds": scoring_speeds,
+    }
+
+
+def _play_match_chunk(args:tuple) -> tuple:
+    """Pool worker: plays a chunk of matches, returns (worker pid, elapsed seconds, match results)."""
+    match_seeds, left_controller, right_controller, max_ticks, policy_filepath = args
+    if policy_filepath: AIController.load_policy(policy_filepath)
+    start: float = perf_counter()
+    results: list = [play_match(match_seed, left_controller, right_controller, max_ticks) for match_seed in match_seeds]
+    return os.getpid(), perf_counter() - start, results
+
+
+def run_tournament(pairing:str, matches:int, seed:int=0, workers:int|None=None, chunk_size:int=8, max_ticks:int=36_000, policy_filepath:str|None=None) -> dict:
+    """
+        Plays 'matches' headless matches of the given pairing on a process pool (one worker per core by default)
+        and aggregates win rates, rally lengths, ball speeds at scoring and throughput. Match i is seeded with seed + i,
+        so the aggregated results are the same for any number of workers. policy_filepath replaces the default policy of
+        the "trained" controller.
+    """
+    if matches < 1: raise ValueError(f"a tournament needs at least 1 match, got {matches}")
+    left_controller, right_controller = PAIRINGS[pairing]
+    workers = workers or os.cpu_count() or 1
+    match_seeds: list = [seed + match_idx for match_idx in range(matches)]
+    chunks: list = [(match_seeds[idx:idx + chunk_size], left_controller, right_controller, max_ticks, policy_filepath) for idx in range(0, matches, chunk_size)]
+
+    start: float = perf_counter()
+    results: list = []
+    worker_stats: dict = {}  # pid -> [matches, ticks, busy seconds]
+    with Pool(processes=workers) as pool:
+        for pid, elapsed, chunk_results in pool.imap_unordered(_play_match_chunk, chunks):
+            results.extend(chunk_results)
+            stats = worker_stats.setdefault(pid, [0, 0, 0.0])
+            stats[0] += len(chunk_results)
+            stats[1] += sum(result["ticks"] for result in chunk_results)
+            stats[2] += elapsed
+    wall_time: float = perf_counter() - start
+    results.sort(key=lambda result: result["seed"])
+
+    rally_lengths: list = [rally for result in results for rally in result["rally_lengths"]]
+    scoring_speeds: list = [speed for result in results for speed in result["scoring_speeds"]]
+    return {
+        "pairing": pairing,
+        "seed": seed,
+        "matches": matches,
+        "left_win_rate": sum(result["winner"] == "left" for result in results) / matches,
+        "right_win_rate": sum(result["winner"] == "right" for result in results) / matches,
+        "undecided_rate": sum(result["winner"] is None for result in results) / matches,
+        "rally_length_mean": mean(rally_lengths) if rally_lengths else 0.0,
+        "rally_length_median": median(rally_lengths) if rally_lengths else 0.0,
+        "rally_length_max": max(rally_lengths, default=0),
+        "scoring_speed_mean": mean(scoring_speeds) if scoring_speeds else 0.0,
+        "scoring_speed_max": max(scoring_speeds, default=0.0),
+        "wall_time_s": wall_time,
+        "matches_per_s": matches / wall_time,
+        "ticks_per_s": sum(result["ticks"] for result in results) / wall_time,
+        "workers": {
+            str(pid): {"matches": stats[0], "matches_per_s": stats[0] / stats[2], "ticks_per_s": stats[1] / stats[2]}
+            for pid, stats in sorted(worker_stats.items())
+        },
+    }
+
+
+def print_tournament_report(report:dict) -> None:
+    left_controller, right_controller = PAIRINGS[report["pairing"]]
+    print(f"\n{report['pairing']}: {report['matches']} matches (seed {report['seed']})")
+    print(f"  win rate     left ({left_controller}): {report['left_win_rate']:.1%}   right ({right_controller}): {report['right_win_rate']:.1%}   undecided: {report['undecided_rate']:.1%}")
+    print(f"  rally length mean {report['rally_length_mean']:.2f}   median {report['rally_length_median']}   max {report['rally_length_max']} paddle hits")
+    print(f"  scoring speed mean {report['scoring_speed_mean']:.1f}   max {report['scoring_speed_max']:.1f} px/s (x-component)")
+    print(f"  throughput   {report['matches_per_s']:.2f} matches/s, {report['ticks_per_s']:,.0f} ticks/s in {report['wall_time_s']:.2f}s")
+    for pid, stats in report["workers"].items():
+        print(f"    worker {pid}: {stats['matches']} matches, {stats['matches_per_s']:.2f} matches/s, {stats['ticks_per_s']:,.0f} ticks/s")
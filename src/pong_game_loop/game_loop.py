@@ -1,17 +1,42 @@
+from collections import deque
+from time import perf_counter
+
 import pygame
 
 from pong_game_classes.parse_cli_args import CLI_ARGS
+from pong_game_classes.ai_controller import AIController
+from pong_game_classes.asset_manager import StartupReport
 from pong_game_classes.game import PongGame
 from pong_game_classes.ball import PongBall
 from pong_game_classes.paddle import PongPaddle
 from pong_game_classes.player import Player
+from pong_game_classes.replay import ReplayRecorder
+from pong_game_classes.frame_profiler import FrameProfiler
+from pong_game_classes.input_manager import InputManager, parse_key_bindings
+from pong_game_classes.multi_ball import MultiBallArena
+from pong_game_classes.telemetry import MatchTelemetry
+from pong_game_loop.pipeline import GameStateSnapshot, SimulationThread, TickPacing
+
+# scenes of the game loop; only "playing" advances physics, the others show a still field and wait for input or their timer
+SCENE_ATTRACT: str = "attract"
+SCENE_PLAYING: str = "playing"
+SCENE_POINT_SCORED: str = "point_scored"
+SCENE_GAME_OVER: str = "game_over"
+ATTRACT_IDLE_WAIT_MS: int = 500 # longest an idle start screen blocks waiting for an event before running a frame anyway
 
 class GameLoop:
 
-    def __init__(self):
+    def __init__(self, startup_report:StartupReport|None=None):
+        """startup_report: if given, the startup phases are timed and printed once the first frame is up and the assets are loaded."""
+        if startup_report: startup_report.mark("imports")
     
         # game objects instantiations (game, players, left_paddle, right_paddle, and ball)
-        self.game_instance = PongGame(mode=CLI_ARGS.mode, ai_difficulty=CLI_ARGS.difficulty, enable_sounds=CLI_ARGS.enable_sounds)
+        self.game_instance = PongGame(
+            mode=CLI_ARGS.mode, ai_difficulty=CLI_ARGS.difficulty, enable_sounds=CLI_ARGS.enable_sounds, render_mode=CLI_ARGS.render_mode,
+            physics_mode=CLI_ARGS.physics, physics_hz=CLI_ARGS.physics_hz, fps_cap=CLI_ARGS.fps_cap, seed=CLI_ARGS.seed,
+            startup_report=startup_report, screen_width=CLI_ARGS.window_size[0], screen_length=CLI_ARGS.window_size[1],
+            logical_size=CLI_ARGS.logical_size, scaling=CLI_ARGS.scaling, vsync=CLI_ARGS.vsync
+        )
 
         self.player_1 = Player(name="P1-  ")
         if self.game_instance.mode == "2p": self.player_2 = Player(name="P2-  ")
@@ -19,61 +44,302 @@ class GameLoop:
         self.left_paddle = PongPaddle(player_assigned=self.player_1)
         self.right_paddle = PongPaddle(player_assigned=self.player_2, left_side_paddle=False)
         self.ball = PongBall()
+        self.arena: MultiBallArena | None = None # chaos mode (--balls > 1), self.ball is then the first of its balls
+        if CLI_ARGS.balls > 1:
+            self.arena = MultiBallArena(self.game_instance, self.left_paddle, self.right_paddle, self.player_1, self.player_2, ball_count=CLI_ARGS.balls)
+            self.ball = self.arena.balls[0]
+            self.game_instance.points_per_game *= CLI_ARGS.balls # points come balls times as fast
+        self.input_manager = InputManager(key_bindings=parse_key_bindings(CLI_ARGS.bind), right_paddle_enabled=self.game_instance.mode == "2p")
+        if CLI_ARGS.policy_file: AIController.load_policy(CLI_ARGS.policy_file)
         print(f"\nGame Mode: {self.game_instance.mode}, Game Difficulty: {self.game_instance.ai_difficulty}\n")
-        if self.game_instance.enable_sounds: self.game_instance.play_game_soundtrack()
+
+        self.replay_recorder: ReplayRecorder | None = None
+        if CLI_ARGS.record_replay:
+            self.replay_recorder = ReplayRecorder(
+                filepath=CLI_ARGS.record_replay, seed=self.game_instance.seed,
+                field_width=self.game_instance.field_width, field_height=self.game_instance.field_height,
+                physics_dt=self.game_instance.physics_dt
+            )
+            print(f"Recording replay to {CLI_ARGS.record_replay} (seed {self.game_instance.seed})\n")
+        if CLI_ARGS.telemetry:
+            self.game_instance.telemetry = MatchTelemetry(filepath=CLI_ARGS.telemetry, max_file_bytes=int(CLI_ARGS.telemetry_max_mb * 2**20))
+        self.scene: str = SCENE_ATTRACT
+        self.scene_durations_ms: dict = {SCENE_POINT_SCORED: 1000, SCENE_GAME_OVER: 3000} # timed scenes, the others last until an input
+        self._scene_deadline_ms: int | None = None
+        self._scene_frames: int = 0     # frames run since the scene was entered
+        self._winner: Player | None = None
+
+        # per-phase frame timing, None when profiling is off (every mark is then a single falsy check)
+        self.profiler: FrameProfiler | None = None
+        if CLI_ARGS.profile or CLI_ARGS.profile_overlay or CLI_ARGS.profile_dump:
+            self.profiler = FrameProfiler(dump_path=CLI_ARGS.profile_dump, dump_interval_s=CLI_ARGS.profile_dump_interval)
+        self.show_profiler_overlay: bool = CLI_ARGS.profile_overlay
+        self.tick_pacing: TickPacing | None = TickPacing(physics_dt=self.game_instance.physics_dt) if CLI_ARGS.tick_stats else None
+        self.simulation_thread: SimulationThread | None = None # pipelined mode (--pipeline), see start_pipeline()
+        self.startup_report: StartupReport | None = startup_report # None once printed
+        if startup_report: startup_report.mark("game objects")
+
+    def _physics_tick(self, paddle_inputs:tuple|None=None) -> bool:
+        """
+            One physics step: collisions, ball trajectory, scoring and paddle movement (same order as PongSimulation.step).
+            The (left, right) paddle_inputs default to the input manager's for this tick. Returns True if a point was scored, the caller makes the scene change (see _on_point_scored()).
+        """
+        profiler = self.profiler
+        if self.arena: return self._arena_physics_tick()
+        points_before_tick: int = self.player_1.get_score() + self.player_2.get_score()
+        self.left_paddle.store_previous_position()
+        self.right_paddle.store_previous_position()
+        self.ball.update_rect()
+        if self.replay_recorder: self.replay_recorder.begin_tick(
+            self.game_instance, self.ball, self.left_paddle, self.right_paddle, self.player_1, self.player_2
+        )
+
+        self.ball.check_and_bounce_at_rect_collision(rect_obj=self.game_instance.return_rect(self.left_paddle))
+        self.ball.check_and_bounce_at_rect_collision(rect_obj=self.game_instance.return_rect(self.right_paddle))
+        self.ball.check_and_bounce_at_horizontal_boundary_collision()
+        self.ball.update_trajectory()
+
+        self.game_instance.check_for_vertical_boundary_collision(
+            ball_obj=self.ball, 
+            left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle, 
+            player_1_obj=self.player_1, player_2_obj=self.player_2
+        )
+        if profiler: profiler.mark("physics")
+        left_input, right_input = self.game_instance.apply_player_inputs(
+            self.left_paddle, self.right_paddle, *(paddle_inputs or self.input_manager.paddle_inputs())
+        )
+        if profiler: profiler.mark("input")
+        if self.game_instance.mode == "ai": 
+            right_input = self.game_instance.make_move_for_ai(ball_obj=self.ball, right_paddle_obj=self.right_paddle)
+            if profiler: profiler.mark("ai")
+        self.game_instance.bound_paddle_in_screen_window(paddle_obj=self.left_paddle)
+        self.game_instance.bound_paddle_in_screen_window(paddle_obj=self.right_paddle)
+
+        if self.replay_recorder: self.replay_recorder.record_tick(
+            dt=self.game_instance.dt if self.game_instance.physics_mode == "variable" else None, left_input=left_input, right_input=right_input
+        )
+        if profiler: profiler.mark("physics")
+        return self.player_1.get_score() + self.player_2.get_score() != points_before_tick
+
+    def _arena_physics_tick(self) -> bool:
+        """_physics_tick() of chaos mode: every ball steps through the arena, the ai plays the ball closest to its paddle."""
+        profiler = self.profiler
+        self.left_paddle.store_previous_position()
+        self.right_paddle.store_previous_position()
+        points: int = self.arena.step()
+        if profiler: profiler.mark("physics")
+        self.game_instance.apply_player_inputs(self.left_paddle, self.right_paddle, *self.input_manager.paddle_inputs())
+        if profiler: profiler.mark("input")
+        if self.game_instance.mode == "ai":
+            self.game_instance.make_move_for_ai(ball_obj=self.arena.ai_target_ball(self.right_paddle), right_paddle_obj=self.right_paddle)
+            if profiler: profiler.mark("ai")
+        self.game_instance.bound_paddle_in_screen_window(paddle_obj=self.left_paddle)
+        self.game_instance.bound_paddle_in_screen_window(paddle_obj=self.right_paddle)
+        if profiler: profiler.mark("physics")
+        return points > 0
+
+    def set_scene(self, scene:str) -> None:
+        """Switches the game loop to another scene (timed scenes end on their own after scene_durations_ms)."""
+        self.scene = scene
+        self._scene_frames = 0
+        duration_ms: int | None = self.scene_durations_ms.get(scene)
+        self._scene_deadline_ms = None if duration_ms is None else pygame.time.get_ticks() + duration_ms
+        self.game_instance.has_user_started_game = scene == SCENE_PLAYING # physics clock only runs while playing
+        if self.tick_pacing and scene != SCENE_PLAYING: self.tick_pacing.break_sequence()
+        if self.simulation_thread:
+            # the simulation thread owns the game state during play, the other scenes change it on this thread
+            if scene == SCENE_PLAYING: self.simulation_thread.snapshots.publish(self._take_snapshot())
+            self.simulation_thread.set_playing(scene == SCENE_PLAYING)
+
+    def _on_point_scored(self) -> None:
+        """Ends the rally (or the match) after a tick that scored, on the main thread in pipelined mode as well."""
+        self._winner = self.game_instance.check_for_winner(player_1_obj=self.player_1, player_2_obj=self.player_2)
+        if self._winner: self.set_scene(SCENE_GAME_OVER)
+        elif self.arena is None: self.set_scene(SCENE_POINT_SCORED) # chaos mode plays on through points
+
+    def _on_scene_timer_elapsed(self) -> None:
+        if self.scene == SCENE_POINT_SCORED:
+            self.set_scene(SCENE_PLAYING)
+        elif self.scene == SCENE_GAME_OVER:
+            self.player_1.reset()
+            self.player_2.reset()
+            if self.arena: self.arena.serve_all()
+            self._winner = None
+            self.set_scene(SCENE_ATTRACT)
+
+    def _idle_wait_ms(self) -> int:
+        """
+            How long this frame may block waiting for an event. A scene with nothing moving whose last frame is already on screen
+            waits for input (or its timer) instead of redrawing the same picture, SPACE/quit still wake it up immediately.
+        """
+        if self.scene == SCENE_PLAYING or self._scene_frames == 0 or self.game_instance.has_pending_redraw(): return 0
+        if not self.game_instance.assets_applied: return 0 # keep polling the preloading thread
+        if self._scene_deadline_ms is None: return ATTRACT_IDLE_WAIT_MS
+        return max(0, self._scene_deadline_ms - pygame.time.get_ticks())
+
+    def start_pipeline(self) -> None:
+        """
+            Pipelined mode (--pipeline): physics ticks run on a SimulationThread at a fixed rate, this thread only pumps
+            events and renders the latest snapshot, so a slow display update or text render no longer delays a tick.
+            Scenes stay on this thread: the simulation thread pauses itself after a tick that scored and flags its
+            snapshot, run_frame() then makes the scene change; its sound-effects are queued and played by run_frame() too.
+        """
+        # stand-ins positioned from the snapshots, the simulation thread keeps moving the real objects meanwhile
+        self._snapshot_ball = PongBall()
+        self._snapshot_left_paddle = PongPaddle(player_assigned=self.player_1)
+        self._snapshot_right_paddle = PongPaddle(player_assigned=self.player_2, left_side_paddle=False)
+        self.simulation_thread = SimulationThread(
+            tick=self._physics_tick, take_snapshot=self._take_snapshot, physics_dt=self.game_instance.physics_dt, tick_pacing=self.tick_pacing
+        )
+        self.game_instance.deferred_sounds = deque()
+        self.simulation_thread.set_playing(self.scene == SCENE_PLAYING)
+        self.simulation_thread.start()
+
+    def stop_pipeline(self) -> None:
+        self.simulation_thread.stop()
+        self.simulation_thread = None
+        self.game_instance.deferred_sounds = None
+        self.game_instance.resume_physics_clock()
+
+    def _take_snapshot(self, point_scored:bool=False) -> GameStateSnapshot:
+        ball: PongBall = self.ball
+        return GameStateSnapshot(
+            perf_counter(), ball.coordinates.x, ball.coordinates.y, ball.previous_coordinates.x, ball.previous_coordinates.y, ball.x_direction,
+            self.left_paddle.top, self.left_paddle.previous_top, self.right_paddle.top, self.right_paddle.previous_top,
+            self.player_1.get_score_text(), self.player_2.get_score_text(), point_scored
+        )
+
+    def _draw_snapshot(self, snapshot:GameStateSnapshot) -> None:
+        """draw_objects() of a snapshot, interpolated from its previous positions by the time since it was published."""
+        ball: PongBall = self._snapshot_ball
+        ball.coordinates.update(snapshot.ball_x, snapshot.ball_y)
+        ball.previous_coordinates.update(snapshot.ball_previous_x, snapshot.ball_previous_y)
+        ball.x_direction = snapshot.ball_x_direction
+        self._snapshot_left_paddle.set_top(snapshot.left_top)
+        self._snapshot_left_paddle.previous_top = snapshot.left_previous_top
+        self._snapshot_right_paddle.set_top(snapshot.right_top)
+        self._snapshot_right_paddle.previous_top = snapshot.right_previous_top
+        self.game_instance.draw_objects(
+            ball_obj=ball, left_paddle_obj=self._snapshot_left_paddle, right_paddle_obj=self._snapshot_right_paddle,
+            alpha=(perf_counter() - snapshot.published_at) / self.game_instance.physics_dt
+        )
 
     def start(self):
         # game loop
+        if CLI_ARGS.pipeline: self.start_pipeline()
 
         while not self.game_instance.quit_game:
+            self.run_frame()
+
+        if self.simulation_thread:
+            snapshots = self.simulation_thread.snapshots
+            print(f"Pipeline: {snapshots.published} snapshots published, {snapshots.rendered} rendered")
+            self.stop_pipeline()
+        if self.tick_pacing: self.tick_pacing.print_report("pipelined" if CLI_ARGS.pipeline else "single-threaded")
+        if self.replay_recorder: self.replay_recorder.close()
+        if self.profiler: self.profiler.close()
+        if self.game_instance.telemetry: self.game_instance.telemetry.close()
+        latency: dict = self.input_manager.latency_stats()
+        if latency["samples"]:
+            print(f"Pump-to-present latency ({latency['samples']} presses): p50 {latency['p50_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms")
+        self.game_instance.close_and_cleanup()
+
+    def _finish_startup_report(self) -> None:
+        self.startup_report.first_frame_presented()
+        if not self.game_instance.assets_applied: return
+        self.startup_report.print_report()
+        self.startup_report = None
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.game_instance.quit_game = True
+    def run_frame(self) -> None:
+        """One iteration of the game loop (events, scene update and drawing, end of frame). Never blocks longer than an idle wait."""
+        profiler = self.profiler
+        snapshot: GameStateSnapshot | None = None # pipelined mode, what is drawn while playing
+        waited_event: pygame.event.Event | None = None
+        wait_ms: int = self._idle_wait_ms()
+        if wait_ms > 0:
+            event = pygame.event.wait(timeout=wait_ms)
+            if event.type != pygame.NOEVENT: waited_event = event
+            if profiler: profiler.mark("idle")
+        self.input_manager.pump(waited_event) # the only place the event queue is drained
+        if self.input_manager.quit_requested:
+            self.game_instance.quit_game = True
+        if self.scene == SCENE_ATTRACT and self.input_manager.was_pressed("start"):
+            if self.replay_recorder: self.replay_recorder.start_match()
+            if self.game_instance.telemetry: self.game_instance.telemetry.start_match(
+                mode=self.game_instance.mode, difficulty=self.game_instance.ai_difficulty, seed=self.game_instance.seed,
+                balls=CLI_ARGS.balls, points_per_game=self.game_instance.points_per_game
+            )
+            self.set_scene(SCENE_PLAYING)
+        if self._scene_deadline_ms is not None and pygame.time.get_ticks() >= self._scene_deadline_ms:
+            self._on_scene_timer_elapsed()
+        if not self.game_instance.assets_applied: # the start screen runs while the assets load, play waits for them
+            self.game_instance.apply_preloaded_assets(wait=self.scene != SCENE_ATTRACT)
+        if profiler: profiler.mark("events")
 
-            self.game_instance.screen.fill("black") # fill the screen with a color to wipe away anything from last frame
-            self.game_instance.draw_objects(ball_obj=self.ball, left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle)
+        self.game_instance.begin_frame() # wipe away anything from last frame
+        if profiler: profiler.mark("draw")
 
-            if not self.game_instance.check_if_user_has_started_game():
+        if self.scene == SCENE_PLAYING and self.simulation_thread:
+            self.simulation_thread.publish_inputs(self.input_manager.paddle_inputs()) # held for every tick until the next frame
+            snapshot = self.simulation_thread.snapshots.latest()
+            self._draw_snapshot(snapshot)
+            self.game_instance.play_deferred_sounds()
+            if snapshot.point_scored: self._on_point_scored() # the simulation thread paused itself after that tick
+        elif self.scene == SCENE_PLAYING:
+            if self._scene_frames == 0: self.game_instance.resume_physics_clock() # time spent in the previous scene is not simulated
+            # physics runs in fixed steps (possibly several per frame), drawing is interpolated between the last two
+            ticks: int = self.game_instance.physics_ticks_due()
+            for _ in range(ticks):
+                if self.tick_pacing: self.tick_pacing.record()
+                if self._physics_tick(): self._on_point_scored()
+                if self.scene != SCENE_PLAYING: break # a point was scored, the rest of the frame's ticks are dropped
+            self.game_instance.draw_objects(
+                ball_obj=self.ball, left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle,
+                alpha=self.game_instance.interpolation_alpha() if self.scene == SCENE_PLAYING else 1.0,
+                balls=self.arena.balls if self.arena else None
+            )
+        else:
+            self.input_manager.consume_window()
+            self.game_instance.draw_objects(
+                ball_obj=self.ball, left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle, balls=self.arena.balls if self.arena else None
+            )
+        if profiler: profiler.mark("draw")
+
+        if self.scene == SCENE_ATTRACT:
+            self.game_instance.set_screen_text(
+                msg="Use 'a' to move the left paddle up and 's' to move it down.",
+                x_offset_mult=0.35,
+                y_offset_mult=1.35
+            )
+            if self.game_instance.mode == "2p":
                 self.game_instance.set_screen_text(
-                    msg="Use 'a' to move the left paddle up and 's' to move it down.",
-                    x_offset_mult=0.35,
-                    y_offset_mult=1.35
+                    msg="Use up arrow key to move the right paddle up and down arrow key to move it down.",
+                    x_offset_mult=0.10,
+                    y_offset_mult=1.50
                 )
-                if self.game_instance.mode == "2p":
-                    self.game_instance.set_screen_text(
-                        msg="Use up arrow key to move the right paddle up and down arrow key to move it down.",
-                        x_offset_mult=0.10,
-                        y_offset_mult=1.50
-                    )
+            self.game_instance.set_screen_text(
+                msg=f"First to score {self.game_instance.points_per_game} wins!", 
+                x_offset_mult=0.75, 
+                y_offset_mult=1.65
+            )
+            self.game_instance.set_screen_text(msg="Press SPACE to start the game.", x_offset_mult=0.65, y_offset_mult=1.80)
+        else:
+            if snapshot is None: left_score_text, right_score_text = self.player_1.get_score_text(), self.player_2.get_score_text()
+            else: left_score_text, right_score_text = snapshot.left_score_text, snapshot.right_score_text
+            self.game_instance.set_screen_text(msg=left_score_text, x_offset_mult=0.5, y_offset_mult=0.1)
+            self.game_instance.set_screen_text(msg=right_score_text, x_offset_mult=1.5, y_offset_mult=0.1)
+            if self.scene == SCENE_GAME_OVER:
                 self.game_instance.set_screen_text(
-                    msg=f"First to score {self.game_instance.points_per_game} wins!", 
-                    x_offset_mult=0.75, 
-                    y_offset_mult=1.65
-                )
-                self.game_instance.set_screen_text(msg="Press SPACE to start the game.", x_offset_mult=0.65, y_offset_mult=1.80)
-
-            else: 
-                self.ball.check_and_bounce_at_rect_collision(rect_obj=self.game_instance.return_rect(self.left_paddle))
-                self.ball.check_and_bounce_at_rect_collision(rect_obj=self.game_instance.return_rect(self.right_paddle))
-                self.ball.check_and_bounce_at_horizontal_boundary_collision()
-                self.ball.update_trajectory()
-
-                self.game_instance.check_for_vertical_boundary_collision(
-                    ball_obj=self.ball, 
-                    left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle, 
-                    player_1_obj=self.player_1, player_2_obj=self.player_2
+                    msg=f"{self._winner.get_name()} WINS.", x_offset_mult=0.6 if self._winner is self.player_1 else 1.2, y_offset_mult=1.35
                 )
-                self.game_instance.map_user_key_press(left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle)
-                if self.game_instance.mode == "ai": 
-                    self.game_instance.make_move_for_ai(ball_obj=self.ball, right_paddle_obj=self.right_paddle)
-                self.game_instance.bound_paddle_in_screen_window(paddle_obj=self.left_paddle)
-                self.game_instance.bound_paddle_in_screen_window(paddle_obj=self.right_paddle)
-
-                self.game_instance.set_screen_text(msg=self.player_1.name + str(self.player_1.get_score()), x_offset_mult=0.5, y_offset_mult=0.1)
-                self.game_instance.set_screen_text(msg=self.player_2.name + str(self.player_2.get_score()), x_offset_mult=1.5, y_offset_mult=0.1)
-                self.game_instance.check_for_winner(player_1_obj=self.player_1, player_2_obj=self.player_2)
-                self.game_instance.debug_print_if_enabled(ball_obj=self.ball, left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle) # Only prints if game_instance._debug_game is True
-            self.game_instance.end_frame() # MAKE SURE TO KEEP THIS AS THE LAST STATEMENT AT THE END OF THE GAME LOOP!
-
-        self.game_instance.close_and_cleanup()
\ No newline at end of file
+            self.game_instance.debug_print_if_enabled(ball_obj=self.ball, left_paddle_obj=self.left_paddle, right_paddle_obj=self.right_paddle) # Only prints if game_instance._debug_game is True
+        if self.show_profiler_overlay:
+            self.game_instance.set_screen_text(msg=profiler.overlay_text(), x_offset_mult=0.02, y_offset_mult=1.98, bottom_aligned=True)
+        if profiler: profiler.mark("text")
+        self._scene_frames += 1
+        self.game_instance.end_frame() # MAKE SURE TO KEEP THIS AS THE LAST STATEMENT AT THE END OF THE GAME LOOP!
+        self.input_manager.frame_presented(self.game_instance.last_present_time)
+        if self.startup_report: self._finish_startup_report()
+        if profiler:
+            profiler.mark("flip_tick")
+            profiler.end_frame()
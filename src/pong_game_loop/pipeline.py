@@ -0,0 +1,169 @@
+import sys
+import threading
+from array import array
+from time import perf_counter, sleep
+from typing import Callable, NamedTuple
+
+from pong_game_classes.paddle import PADDLE_INPUT_NONE
+
+PIPELINE_SWITCH_INTERVAL_S: float = 0.001 # GIL hand-over interval while pipelined (python's default 5ms would be the tick jitter)
+MAX_CATCH_UP_S: float = 0.25               # a simulation thread further behind than this skips ahead instead of catching up
+
+
+class TickPacing:
+    """
+        When physics ticks actually run, against the fixed physics_dt they stand for. The single-threaded loop runs the
+        ticks due at the start of each frame back to back, so their spacing follows the frame time (and every slow flip or
+        text render); the pipelined simulation thread runs each tick on its own schedule. jitter is |interval - physics_dt|.
+    """
+
+    def __init__(self, physics_dt:float, history:int=4096):
+        self.physics_dt: float = physics_dt
+        self._intervals = array("d", bytes(8 * history)) # ring buffer, seconds between consecutive ticks
+        self._next_idx: int = 0
+        self.intervals_recorded: int = 0
+        self._last_tick_at: float | None = None
+
+    def record(self) -> None:
+        """Call at the start of every physics tick."""
+        now: float = perf_counter()
+        if self._last_tick_at is not None:
+            self._intervals[self._next_idx] = now - self._last_tick_at
+            self._next_idx = (self._next_idx + 1) % len(self._intervals)
+            self.intervals_recorded += 1
+        self._last_tick_at = now
+
+    def break_sequence(self) -> None:
+        """Call when physics pauses (outside of play), the pause is not counted as an interval."""
+        self._last_tick_at = None
+
+    def stats(self) -> dict:
+        """Interval and jitter percentiles (ms) of the recent ticks."""
+        intervals: list = sorted(self._intervals[:min(self.intervals_recorded, len(self._intervals))])
+        if not intervals: return {"intervals": 0, "interval_p50_ms": 0.0, "interval_p99_ms": 0.0, "jitter_p50_ms": 0.0, "jitter_p99_ms": 0.0, "jitter_max_ms": 0.0}
+        jitters: list = sorted(abs(interval - self.physics_dt) for interval in intervals)
+        p50_idx, p99_idx = int(len(intervals) * 0.50), min(len(intervals) - 1, int(len(intervals) * 0.99))
+        return {
+            "intervals": self.intervals_recorded,
+            "interval_p50_ms": intervals[p50_idx] * 1000,
+            "interval_p99_ms": intervals[p99_idx] * 1000,
+            "jitter_p50_ms": jitters[p50_idx] * 1000,
+            "jitter_p99_ms": jitters[p99_idx] * 1000,
+            "jitter_max_ms": jitters[-1] * 1000,
+        }
+
+    def print_report(self, loop_name:str) -> None:
+        stats: dict = self.stats()
+        print(
+            f"\nPhysics tick pacing ({loop_name}, {stats['intervals']} intervals, target {self.physics_dt * 1000:.2f}ms): "
+            f"interval p50 {stats['interval_p50_ms']:.2f}ms p99 {stats['interval_p99_ms']:.2f}ms, "
+            f"jitter p50 {stats['jitter_p50_ms']:.2f}ms p99 {stats['jitter_p99_ms']:.2f}ms max {stats['jitter_max_ms']:.2f}ms"
+        )
+
+
+class GameStateSnapshot(NamedTuple):
+    """Everything the renderer needs of one physics tick, previous positions included (for interpolation)."""
+    published_at: float     # perf_counter() when the tick finished
+    ball_x: float
+    ball_y: float
+    ball_previous_x: float
+    ball_previous_y: float
+    ball_x_direction: int   # picks the ball's outline colour
+    left_top: float
+    left_previous_top: float
+    right_top: float
+    right_previous_top: float
+    left_score_text: str
+    right_score_text: str
+    point_scored: bool      # the tick scored, the simulation thread paused and the main thread is to change the scene
+
+
+class SnapshotBuffer:
+    """
+        Hand-over of snapshots from the simulation thread to the renderer. Snapshots are immutable, so there are no slots to
+        reuse: publishing is one reference assignment (atomic under the GIL) and the renderer keeps the snapshot it took
+        for as long as it draws it, which is what swapping the buffers of a double/triple buffer achieves. Neither side
+        ever waits for the other.
+    """
+
+    def __init__(self, snapshot:GameStateSnapshot):
+        self._latest: GameStateSnapshot = snapshot
+        self.published: int = 0    # snapshots published
+        self.rendered: int = 0     # distinct snapshots taken by the renderer (the others were superseded unseen)
+        self._last_taken: GameStateSnapshot | None = None
+
+    def publish(self, snapshot:GameStateSnapshot) -> None:
+        self._latest = snapshot
+        self.published += 1
+
+    def latest(self) -> GameStateSnapshot:
+        snapshot: GameStateSnapshot = self._latest
+        if snapshot is not self._last_taken:
+            self._last_taken = snapshot
+            self.rendered += 1
+        return snapshot
+
+
+class SimulationThread:
+    """
+        Runs the game's physics ticks at a fixed rate on its own thread, while play is on (set_playing()), and publishes a
+        snapshot after every tick. Ticks are scheduled against absolute deadlines (next tick = previous deadline +
+        physics_dt), so a late wake-up does not delay the ticks after it. The paddle inputs of a tick are the last ones the
+        main thread published with publish_inputs(). A tick returning True (a point was scored) pauses the thread, the
+        snapshot of that tick has point_scored set: the main thread reacts to it, the simulation thread never changes scenes.
+    """
+
+    def __init__(self, tick:Callable, take_snapshot:Callable, physics_dt:float, tick_pacing:TickPacing|None=None):
+        """
+            tick(paddle_inputs=(left, right)) runs one physics tick and returns whether play pauses after it,
+            take_snapshot(point_scored) returns a GameStateSnapshot of the game state.
+        """
+        self.tick: Callable = tick
+        self.take_snapshot: Callable = take_snapshot
+        self.physics_dt: float = physics_dt
+        self.tick_pacing: TickPacing | None = tick_pacing
+        self.snapshots = SnapshotBuffer(take_snapshot())
+        self.ticks: int = 0
+        self.late_ticks_skipped: int = 0
+        self._paddle_inputs: tuple = (PADDLE_INPUT_NONE, PADDLE_INPUT_NONE) # (left, right) PADDLE_INPUT_* flags, replaced (never mutated) by the main thread
+        self._playing = threading.Event()
+        self._stopping: bool = False
+        self._previous_switch_interval: float = sys.getswitchinterval()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self) -> None:
+        sys.setswitchinterval(PIPELINE_SWITCH_INTERVAL_S)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping = True
+        self._playing.set()
+        self._thread.join()
+        sys.setswitchinterval(self._previous_switch_interval)
+
+    def set_playing(self, playing:bool) -> None:
+        """Resumes or pauses the ticks; a pause takes effect after the tick in progress. Either thread may call it."""
+        if playing: self._playing.set()
+        else: self._playing.clear()
+
+    def publish_inputs(self, paddle_inputs:tuple) -> None:
+        self._paddle_inputs = paddle_inputs
+
+    def _run(self) -> None:
+        while True:
+            self._playing.wait()
+            if self._stopping: return
+            next_tick_at: float = perf_counter() # play (re)starts with a tick right away
+            while self._playing.is_set() and not self._stopping:
+                wait_s: float = next_tick_at - perf_counter()
+                if wait_s > 0: sleep(wait_s)
+                if self.tick_pacing: self.tick_pacing.record()
+                point_scored: bool = self.tick(paddle_inputs=self._paddle_inputs)
+                if point_scored: self._playing.clear() # before publishing, the main thread may resume play as soon as it sees the snapshot
+                self.snapshots.publish(self.take_snapshot(point_scored))
+                self.ticks += 1
+                next_tick_at += self.physics_dt
+                if perf_counter() - next_tick_at > MAX_CATCH_UP_S: # e.g. the process was suspended
+                    next_tick_at = perf_counter()
+                    self.late_ticks_skipped += 1
+            if self.tick_pacing: self.tick_pacing.break_sequence()
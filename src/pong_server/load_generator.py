@@ -0,0 +1,175 @@
+import asyncio
+import json
+import random
+from multiprocessing import Process
+from time import monotonic
+
+from pong_game_classes.paddle import PADDLE_INPUT_DOWN, PADDLE_INPUT_NONE, PADDLE_INPUT_UP
+from pong_server.match_server import run_server
+from pong_server.protocol import (
+    INPUT, JOIN, MSG_INPUT, MSG_JOIN, MSG_STATE, MSG_STATS, SIDE_LEFT, SIDE_SPECTATOR, TCP_FRAME_LENGTH, StateDecoder, state_server_time
+)
+
+PLAYER_INPUT_HZ: int = 20 # how often the simulated players send their paddle input
+
+
+class _ClientStats:
+    """State messages and delivery latency (server send to client receive, same host clock) seen by all simulated clients."""
+
+    def __init__(self):
+        self.states: int = 0
+        self.bytes: int = 0
+        self.latencies_ms: list = []
+        self.recording: bool = False
+
+    def record(self, message:bytes, decoder:StateDecoder) -> None:
+        decoder.apply(message)
+        if not self.recording: return
+        self.states += 1
+        self.bytes += len(message)
+        self.latencies_ms.append((monotonic() - state_server_time(message)) * 1000)
+
+
+class _UdpPlayer(asyncio.DatagramProtocol):
+    """Simulated player: joins a match's left side over udp, sends random paddle input and decodes the state stream."""
+
+    def __init__(self, match_id:int, client_stats:_ClientStats):
+        self.match_id: int = match_id
+        self.client_stats: _ClientStats = client_stats
+        self.decoder = StateDecoder()
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport:asyncio.DatagramTransport) -> None:
+        self.transport = transport
+        transport.sendto(JOIN.pack(MSG_JOIN, self.match_id, SIDE_LEFT))
+
+    def datagram_received(self, data:bytes, address:tuple) -> None:
+        if data[0] == MSG_STATE: self.client_stats.record(data, self.decoder)
+
+    def send_random_input(self, rng:random.Random) -> None:
+        paddle_input: int = rng.choice((PADDLE_INPUT_NONE, PADDLE_INPUT_UP, PADDLE_INPUT_DOWN))
+        self.transport.sendto(INPUT.pack(MSG_INPUT, self.match_id, SIDE_LEFT, paddle_input))
+
+
+async def _tcp_send(writer:asyncio.StreamWriter, message:bytes) -> None:
+    writer.write(TCP_FRAME_LENGTH.pack(len(message)) + message)
+    await writer.drain()
+
+
+async def _read_tcp_frame(reader:asyncio.StreamReader) -> bytes:
+    frame_length: int = TCP_FRAME_LENGTH.unpack(await reader.readexactly(TCP_FRAME_LENGTH.size))[0]
+    return await reader.readexactly(frame_length)
+
+
+async def _tcp_spectator(host:str, port:int, match_id:int, client_stats:_ClientStats) -> None:
+    """Simulated spectator: subscribes to a match over tcp and decodes its state stream until cancelled."""
+    reader, writer = await asyncio.open_connection(host, port)
+    decoder = StateDecoder()
+    await _tcp_send(writer, JOIN.pack(MSG_JOIN, match_id, SIDE_SPECTATOR))
+    try:
+        while True:
+            message: bytes = await _read_tcp_frame(reader)
+            if message[0] == MSG_STATE: client_stats.record(message, decoder)
+    finally:
+        writer.close()
+
+
+async def _server_stats(host:str, port:int) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    await _tcp_send(writer, bytes((MSG_STATS,)))
+    while True:
+        message: bytes = await _read_tcp_frame(reader)
+        if message[0] == MSG_STATS: break
+    writer.close()
+    return json.loads(message[1:])
+
+
+async def _wait_for_server(host:str, port:int, timeout_s:float=15.0) -> None:
+    deadline: float = monotonic() + timeout_s
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if monotonic() > deadline: raise
+            await asyncio.sleep(0.1)
+
+
+async def _measure(host:str, port:int, matches:int, duration_s:float, spectator_every:int, seed:int) -> dict:
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    client_stats = _ClientStats()
+    await _wait_for_server(host, port)
+
+    players: list = []
+    for match_id in range(matches):
+        _, player = await loop.create_datagram_endpoint(lambda match_id=match_id: _UdpPlayer(match_id, client_stats), remote_addr=(host, port))
+        players.append(player)
+    spectators: list = [
+        asyncio.create_task(_tcp_spectator(host, port, match_id, client_stats)) for match_id in range(0, matches, spectator_every)
+    ]
+
+    async def send_inputs() -> None:
+        while True:
+            for player in players: player.send_random_input(rng)
+            await asyncio.sleep(1 / PLAYER_INPUT_HZ)
+    input_task = asyncio.create_task(send_inputs())
+
+    await asyncio.sleep(1.0) # warm up: everyone joined and got a keyframe
+    stats_before: dict = await _server_stats(host, port)
+    client_stats.recording = True
+    await asyncio.sleep(duration_s)
+    client_stats.recording = False
+    stats_after: dict = await _server_stats(host, port)
+
+    input_task.cancel()
+    for spectator in spectators: spectator.cancel()
+    await asyncio.gather(input_task, *spectators, return_exceptions=True)
+    for player in players: player.transport.close()
+
+    elapsed_s: float = stats_after["uptime_s"] - stats_before["uptime_s"]
+    latencies: list = sorted(client_stats.latencies_ms)
+    return {
+        "matches": matches,
+        "udp_players": len(players),
+        "tcp_spectators": len(spectators),
+        "server_ticks_per_s": (stats_after["ticks"] - stats_before["ticks"]) / elapsed_s,
+        "target_ticks_per_s": stats_after["tick_hz"],
+        "match_ticks_per_s": (stats_after["match_ticks"] - stats_before["match_ticks"]) / elapsed_s,
+        "tick_latency_p50_ms": stats_after["tick_latency_p50_ms"],
+        "tick_latency_p99_ms": stats_after["tick_latency_p99_ms"],
+        "client_states_per_s": client_stats.states / duration_s,
+        "client_latency_p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+        "bytes_per_state": client_stats.bytes / max(1, client_stats.states),
+        "keyframe_ratio": (stats_after["keyframes_sent"] - stats_before["keyframes_sent"]) / max(1, stats_after["packets_sent"] - stats_before["packets_sent"]),
+        "dropped_deltas": sum(player.decoder.dropped_deltas for player in players),
+    }
+
+
+def run_load_test(match_counts:tuple, host:str="127.0.0.1", port:int=9999, tick_hz:int=60, duration_s:float=5.0, spectator_every:int=10, seed:int=0) -> list:
+    """
+        For each match count, starts a MatchServer in a separate process, connects one udp player per match (plus a tcp
+        spectator every spectator_every matches) and measures server tick rate, p99 tick latency and client-side delivery.
+    """
+    reports: list = []
+    for matches in match_counts:
+        server_process = Process(target=run_server, kwargs={"matches": matches, "host": host, "port": port, "tick_hz": tick_hz, "seed": seed}, daemon=True)
+        server_process.start()
+        try:
+            reports.append(asyncio.run(_measure(host, port, matches, duration_s, spectator_every, seed)))
+        finally:
+            server_process.terminate()
+            server_process.join()
+        print_load_test_row(reports[-1], header=len(reports) == 1)
+    return reports
+
+
+def print_load_test_row(report:dict, header:bool=False) -> None:
+    if header:
+        print(f"\n{'matches':>8}{'ticks/s':>10}{'target':>8}{'match ticks/s':>15}{'tick p50':>10}{'tick p99':>10}{'states/s':>10}{'client p99':>12}{'B/state':>9}{'dropped':>9}")
+    print(
+        f"{report['matches']:>8}{report['server_ticks_per_s']:>10.1f}{report['target_ticks_per_s']:>8}{report['match_ticks_per_s']:>15,.0f}"
+        f"{report['tick_latency_p50_ms']:>8.2f}ms{report['tick_latency_p99_ms']:>8.2f}ms{report['client_states_per_s']:>10,.0f}"
+        f"{report['client_latency_p99_ms']:>10.2f}ms{report['bytes_per_state']:>9.1f}{report['dropped_deltas']:>9}"
+    )
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import struct
+from array import array
+from time import monotonic
+
+from pong_game_classes.paddle import MOVE_TO_PADDLE_INPUT, PADDLE_INPUT_NONE
+from pong_game_classes.simulation import PongSimulation
+from pong_server.protocol import (
+    INPUT, JOIN, LEAVE, MSG_INPUT, MSG_JOIN, MSG_LEAVE, MSG_STATS, SIDE_LEFT, SIDE_RIGHT, TCP_FRAME_LENGTH, encode_state, quantize_state
+)
+
+UDP_CLIENT_TIMEOUT_S: float = 5.0       # udp subscribers that sent nothing for this long are dropped
+TCP_MAX_WRITE_BUFFER: int = 64 * 1024   # a tcp subscriber this far behind skips states (and gets a keyframe once it caught up)
+
+
+class HostedMatch:
+    """
+        One authoritative match: a headless PongSimulation, the latest input of each side and the clients subscribed to it.
+        A side nobody has joined is played by the ai, so unattended matches keep running.
+    """
+
+    def __init__(self, match_id:int, tick_hz:int, seed:int, ai_difficulty:str):
+        self.match_id: int = match_id
+        self.ai_difficulty: str = ai_difficulty
+        self.simulation = PongSimulation(dt=1 / tick_hz, seed=seed)
+        self.side_owners: dict = {SIDE_LEFT: None, SIDE_RIGHT: None} # side -> subscriber controlling it (None: ai)
+        self.side_inputs: dict = {SIDE_LEFT: PADDLE_INPUT_NONE, SIDE_RIGHT: PADDLE_INPUT_NONE}
+        self.udp_subscribers: dict = {}     # address -> monotonic() last heard from
+        self.tcp_subscribers: set = set()   # StreamWriters
+        self.needs_keyframe: set = set()    # subscribers whose next state must be a keyframe (just joined, or skipped states)
+        self.previous_state: tuple | None = None
+        self.matches_finished: int = 0
+
+    def step(self) -> None:
+        simulation = self.simulation
+        left_input: int = self.side_inputs[SIDE_LEFT]
+        if self.side_owners[SIDE_LEFT] is None:
+            left_input = MOVE_TO_PADDLE_INPUT[simulation.ai_decision(self.ai_difficulty, left_side_paddle=True)]
+        right_input: int = self.side_inputs[SIDE_RIGHT]
+        if self.side_owners[SIDE_RIGHT] is None:
+            right_input = MOVE_TO_PADDLE_INPUT[simulation.ai_decision(self.ai_difficulty)]
+        simulation.step_inputs(left_input, right_input)
+        if simulation.winner is not None:
+            self.matches_finished += 1
+            simulation.reset_match()
+
+    def subscribe(self, subscriber, side:int) -> None:
+        if isinstance(subscriber, tuple): self.udp_subscribers[subscriber] = monotonic()
+        else: self.tcp_subscribers.add(subscriber)
+        self.needs_keyframe.add(subscriber)
+        if side in self.side_owners and self.side_owners[side] in (None, subscriber):
+            self.side_owners[side] = subscriber
+            self.side_inputs[side] = PADDLE_INPUT_NONE
+
+    def unsubscribe(self, subscriber) -> None:
+        self.udp_subscribers.pop(subscriber, None)
+        self.tcp_subscribers.discard(subscriber)
+        self.needs_keyframe.discard(subscriber)
+        for side, owner in self.side_owners.items():
+            if owner == subscriber: self.side_owners[side] = None # back to the ai
+
+    def has_subscribers(self) -> bool:
+        return bool(self.udp_subscribers or self.tcp_subscribers)
+
+
+class MatchServer:
+    """
+        Authoritative asyncio server running many independent headless matches in one process (PongSimulation is not a
+        singleton, unlike PongGame). Every tick it steps all matches and broadcasts each match's delta-compressed state to
+        its udp and tcp subscribers; the encoded state is shared by all subscribers of a match.
+    """
+
+    def __init__(self, matches:int, host:str="127.0.0.1", port:int=9999, tick_hz:int=60, keyframe_interval:int=60, seed:int=0, ai_difficulty:str="easy"):
+        self.host: str = host
+        self.port: int = port
+        self.tick_hz: int = tick_hz
+        self.keyframe_interval: int = keyframe_interval
+        self.matches: list = [HostedMatch(match_id, tick_hz, seed + match_id, ai_difficulty) for match_id in range(matches)]
+        self.ticks: int = 0
+        self.udp_transport: asyncio.DatagramTransport | None = None
+        self._started_at: float = monotonic()
+
+        # statistics
+        self.packets_sent: int = 0
+        self.bytes_sent: int = 0
+        self.keyframes_sent: int = 0
+        self._tick_latency_ms = array("d", bytes(8 * tick_hz * 5)) # ring buffer, last 5 seconds of ticks
+        self._tick_latency_next_idx: int = 0
+
+    async def serve_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: _UdpServerProtocol(self), local_addr=(self.host, self.port))
+        tcp_server = await asyncio.start_server(self._handle_tcp_client, self.host, self.port)
+        print(f"Serving {len(self.matches)} matches at {self.tick_hz} ticks/s on {self.host}:{self.port} (udp and tcp)")
+        async with tcp_server:
+            await self._tick_loop()
+
+    async def _tick_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        tick_interval: float = 1 / self.tick_hz
+        next_tick: float = loop.time()
+        while True:
+            server_time: float = monotonic()
+            keyframe_tick: bool = self.ticks % self.keyframe_interval == 0
+            for match in self.matches:
+                match.step()
+                self._broadcast(match, server_time, keyframe_tick)
+            self.ticks += 1
+            if self.ticks % self.tick_hz == 0: self._drop_silent_udp_subscribers()
+
+            # tick latency: how late this tick's broadcast finished relative to when the tick was due
+            now: float = loop.time()
+            self._tick_latency_ms[self._tick_latency_next_idx] = (now - next_tick) * 1000
+            self._tick_latency_next_idx = (self._tick_latency_next_idx + 1) % len(self._tick_latency_ms)
+            next_tick += tick_interval
+            if next_tick < now - 0.25: next_tick = now # overloaded, drop ticks instead of trying to catch up forever
+            await asyncio.sleep(max(0.0, next_tick - now))
+
+    def _broadcast(self, match:HostedMatch, server_time:float, keyframe_tick:bool) -> None:
+        if not match.has_subscribers():
+            match.previous_state = None
+            return
+        state: tuple = quantize_state(match.simulation)
+        tick: int = match.simulation.ticks
+        delta: bytes | None = None
+        if not keyframe_tick and match.previous_state is not None:
+            delta = encode_state(match.match_id, tick, server_time, state, match.previous_state)
+        keyframe: bytes | None = None # encoded on first use
+        match.previous_state = state
+
+        needs_keyframe: set = match.needs_keyframe
+        for subscriber in (*match.udp_subscribers, *match.tcp_subscribers):
+            if isinstance(subscriber, asyncio.StreamWriter):
+                if subscriber.is_closing():
+                    match.unsubscribe(subscriber)
+                    continue
+                if subscriber.transport.get_write_buffer_size() > TCP_MAX_WRITE_BUFFER:
+                    needs_keyframe.add(subscriber) # slow reader, skip this state
+                    continue
+            if delta is None or subscriber in needs_keyframe:
+                if keyframe is None: keyframe = encode_state(match.match_id, tick, server_time, state, None)
+                message: bytes = keyframe
+                needs_keyframe.discard(subscriber)
+                self.keyframes_sent += 1
+            else:
+                message = delta
+            if isinstance(subscriber, tuple): self.udp_transport.sendto(message, subscriber)
+            else: subscriber.write(TCP_FRAME_LENGTH.pack(len(message)) + message)
+            self.packets_sent += 1
+            self.bytes_sent += len(message)
+
+    def _drop_silent_udp_subscribers(self) -> None:
+        cutoff: float = monotonic() - UDP_CLIENT_TIMEOUT_S
+        for match in self.matches:
+            for address in [address for address, last_heard in match.udp_subscribers.items() if last_heard < cutoff]:
+                match.unsubscribe(address)
+
+    def handle_message(self, message:bytes, subscriber) -> bytes | None:
+        """Handles one client message (subscriber is a udp address or a tcp StreamWriter), returns a reply if there is one."""
+        if not message: return None
+        message_type: int = message[0]
+        if message_type == MSG_STATS:
+            return bytes((MSG_STATS,)) + json.dumps(self.stats()).encode()
+        try:
+            if message_type == MSG_INPUT:
+                _, match_id, side, paddle_input = INPUT.unpack_from(message)
+                match: HostedMatch = self.matches[match_id]
+                if match.side_owners.get(side) == subscriber: match.side_inputs[side] = paddle_input
+                if subscriber in match.udp_subscribers: match.udp_subscribers[subscriber] = monotonic()
+            elif message_type == MSG_JOIN:
+                _, match_id, side = JOIN.unpack_from(message)
+                self.matches[match_id].subscribe(subscriber, side)
+            elif message_type == MSG_LEAVE:
+                _, match_id = LEAVE.unpack_from(message)
+                self.matches[match_id].unsubscribe(subscriber)
+        except (IndexError, struct.error):
+            pass # malformed message or unknown match, ignored
+        return None
+
+    def stats(self) -> dict:
+        ticks_recorded: int = min(self.ticks, len(self._tick_latency_ms))
+        latencies: list = sorted(self._tick_latency_ms[:ticks_recorded])
+        return {
+            "matches": len(self.matches),
+            "tick_hz": self.tick_hz,
+            "ticks": self.ticks,
+            "match_ticks": sum(match.simulation.ticks for match in self.matches),
+            "matches_finished": sum(match.matches_finished for match in self.matches),
+            "uptime_s": monotonic() - self._started_at,
+            "tick_latency_p50_ms": latencies[int(ticks_recorded * 0.50)] if latencies else 0.0,
+            "tick_latency_p99_ms": latencies[min(ticks_recorded - 1, int(ticks_recorded * 0.99))] if latencies else 0.0,
+            "udp_subscribers": sum(len(match.udp_subscribers) for match in self.matches),
+            "tcp_subscribers": sum(len(match.tcp_subscribers) for match in self.matches),
+            "packets_sent": self.packets_sent,
+            "bytes_sent": self.bytes_sent,
+            "keyframes_sent": self.keyframes_sent,
+        }
+
+    async def _handle_tcp_client(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                frame_length: int = TCP_FRAME_LENGTH.unpack(await reader.readexactly(TCP_FRAME_LENGTH.size))[0]
+                reply: bytes | None = self.handle_message(await reader.readexactly(frame_length), writer)
+                if reply is not None: writer.write(TCP_FRAME_LENGTH.pack(len(reply)) + reply)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for match in self.matches: match.unsubscribe(writer)
+            writer.close()
+
+
+class _UdpServerProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, server:MatchServer):
+        self.server: MatchServer = server
+
+    def connection_made(self, transport:asyncio.DatagramTransport) -> None:
+        self.server.udp_transport = transport
+
+    def datagram_received(self, data:bytes, address:tuple) -> None:
+        reply: bytes | None = self.server.handle_message(data, address)
+        if reply is not None: self.server.udp_transport.sendto(reply, address)
+
+
+def run_server(matches:int, host:str="127.0.0.1", port:int=9999, tick_hz:int=60, keyframe_interval:int=60, seed:int=0, ai_difficulty:str="easy") -> None:
+    server = MatchServer(matches, host=host, port=port, tick_hz=tick_hz, keyframe_interval=keyframe_interval, seed=seed, ai_difficulty=ai_difficulty)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,133 @@
+"""
+    Wire format shared by the match server, its clients and the load generator (little-endian, same bytes over UDP and TCP,
+    TCP frames are prefixed with their length as an unsigned short).
+
+    client -> server   JOIN     <B I B>       type, match id, side (SIDE_*)
+                       INPUT    <B I B B>     type, match id, side, PADDLE_INPUT_* flags (held until the next INPUT)
+                       LEAVE    <B I>         type, match id
+                       STATS    <B>           type, asks for the server statistics (answered with a STATS message)
+    server -> client   STATE    <B I I d B>   type, match id, tick, server time (time.monotonic()), field mask, then the fields
+                                              flagged in the mask
+                       STATS    <B> + json    type, json encoded server statistics
+
+    STATE is delta-compressed against the previous tick of the same match: only fields that changed are sent, positions
+    as small differences in 1/8 pixel units. A keyframe (FIELD_KEYFRAME set) carries every field as an absolute value
+    and is sent every keyframe_interval ticks and to anyone who (re)joins, so a client that lost a UDP packet
+    resyncs at the next keyframe.
+"""
+import struct
+
+MSG_JOIN: int = 1
+MSG_INPUT: int = 2
+MSG_LEAVE: int = 3
+MSG_STATE: int = 4
+MSG_STATS: int = 5
+
+SIDE_SPECTATOR: int = 0
+SIDE_LEFT: int = 1
+SIDE_RIGHT: int = 2
+
+FIELD_BALL_X: int = 1
+FIELD_BALL_Y: int = 2
+FIELD_LEFT_TOP: int = 4
+FIELD_RIGHT_TOP: int = 8
+FIELD_SCORES: int = 16
+FIELD_KEYFRAME: int = 128
+
+POSITION_SCALE: int = 8 # ball coordinates are sent in 1/8 pixel units
+
+JOIN = struct.Struct("<BIB")
+INPUT = struct.Struct("<BIBB")
+LEAVE = struct.Struct("<BI")
+STATE_HEADER = struct.Struct("<BIIdB")
+TCP_FRAME_LENGTH = struct.Struct("<H")
+_KEYFRAME_FIELDS = struct.Struct("<iihhBB")  # ball x, ball y, left top, right top, left score, right score
+_DELTA_POSITION = struct.Struct("<h")
+_DELTA_PADDLE = struct.Struct("<b")
+_SCORES = struct.Struct("<BB")
+
+
+def quantize_state(simulation) -> tuple:
+    """(ball x, ball y, left top, right top, left score, right score) of a PongSimulation, as sent on the wire."""
+    return (
+        round(simulation.ball.coordinates.x * POSITION_SCALE), round(simulation.ball.coordinates.y * POSITION_SCALE),
+        simulation.left_paddle.rect.top, simulation.right_paddle.rect.top,
+        simulation.player_1.score, simulation.player_2.score,
+    )
+
+
+def encode_state(match_id:int, tick:int, server_time:float, state:tuple, previous_state:tuple|None) -> bytes:
+    """STATE message for state, delta-encoded against previous_state (a keyframe if None or a delta would not fit)."""
+    if previous_state is not None:
+        ball_dx: int = state[0] - previous_state[0]
+        ball_dy: int = state[1] - previous_state[1]
+        left_dy: int = state[2] - previous_state[2]
+        right_dy: int = state[3] - previous_state[3]
+        if -32768 <= ball_dx <= 32767 and -32768 <= ball_dy <= 32767 and -128 <= left_dy <= 127 and -128 <= right_dy <= 127:
+            mask: int = 0
+            fields: list = []
+            if ball_dx:
+                mask |= FIELD_BALL_X
+                fields.append(_DELTA_POSITION.pack(ball_dx))
+            if ball_dy:
+                mask |= FIELD_BALL_Y
+                fields.append(_DELTA_POSITION.pack(ball_dy))
+            if left_dy:
+                mask |= FIELD_LEFT_TOP
+                fields.append(_DELTA_PADDLE.pack(left_dy))
+            if right_dy:
+                mask |= FIELD_RIGHT_TOP
+                fields.append(_DELTA_PADDLE.pack(right_dy))
+            if state[4:] != previous_state[4:]:
+                mask |= FIELD_SCORES
+                fields.append(_SCORES.pack(state[4], state[5]))
+            return STATE_HEADER.pack(MSG_STATE, match_id, tick, server_time, mask) + b"".join(fields)
+    return STATE_HEADER.pack(MSG_STATE, match_id, tick, server_time, FIELD_KEYFRAME) + _KEYFRAME_FIELDS.pack(*state)
+
+
+class StateDecoder:
+    """Client side of the STATE stream of one match: applies keyframes and deltas, ignores deltas until it is in sync."""
+
+    def __init__(self):
+        self.state: tuple | None = None     # quantized, see quantize_state()
+        self.tick: int = -1
+        self.keyframes: int = 0
+        self.deltas: int = 0
+        self.dropped_deltas: int = 0        # deltas that did not follow the last applied tick (lost or reordered packets)
+
+    def apply(self, message:bytes) -> bool:
+        """Applies a STATE message, returns True if the decoded state is now at the message's tick."""
+        _, _, tick, _, mask = STATE_HEADER.unpack_from(message)
+        offset: int = STATE_HEADER.size
+        if mask & FIELD_KEYFRAME:
+            self.state = _KEYFRAME_FIELDS.unpack_from(message, offset)
+            self.tick = tick
+            self.keyframes += 1
+            return True
+        if self.state is None or tick != self.tick + 1:
+            self.dropped_deltas += 1
+            return False
+
+        ball_x, ball_y, left_top, right_top, left_score, right_score = self.state
+        if mask & FIELD_BALL_X:
+            ball_x += _DELTA_POSITION.unpack_from(message, offset)[0]
+            offset += _DELTA_POSITION.size
+        if mask & FIELD_BALL_Y:
+            ball_y += _DELTA_POSITION.unpack_from(message, offset)[0]
+            offset += _DELTA_POSITION.size
+        if mask & FIELD_LEFT_TOP:
+            left_top += _DELTA_PADDLE.unpack_from(message, offset)[0]
+            offset += _DELTA_PADDLE.size
+        if mask & FIELD_RIGHT_TOP:
+            right_top += _DELTA_PADDLE.unpack_from(message, offset)[0]
+            offset += _DELTA_PADDLE.size
+        if mask & FIELD_SCORES:
+            left_score, right_score = _SCORES.unpack_from(message, offset)
+        self.state = (ball_x, ball_y, left_top, right_top, left_score, right_score)
+        self.tick = tick
+        self.deltas += 1
+        return True
+
+
+def state_server_time(message:bytes) -> float:
+    return STATE_HEADER.unpack_from(message)[3]
@@ -1,5 +1,23 @@
-from pong_game_loop.game_loop import GameLoop
+from time import perf_counter
+
+from pong_game_classes.parse_cli_args import CLI_ARGS
 
 if __name__ == "__main__":
-    game = GameLoop()
-    game.start()
\ No newline at end of file
+    if CLI_ARGS.headless:
+        from pong_game_classes.simulation import run_headless
+        if CLI_ARGS.policy_file:
+            from pong_game_classes.ai_controller import AIController
+            AIController.load_policy(CLI_ARGS.policy_file)
+        run_headless(
+            matches=CLI_ARGS.matches, left_difficulty=CLI_ARGS.difficulty, right_difficulty=CLI_ARGS.difficulty,
+            telemetry_path=CLI_ARGS.telemetry, telemetry_max_bytes=int(CLI_ARGS.telemetry_max_mb * 2**20)
+        )
+    elif CLI_ARGS.replay:
+        from pong_game_classes.replay import run_replay_viewer
+        run_replay_viewer(filepath=CLI_ARGS.replay, speed=CLI_ARGS.replay_speed, start_tick=CLI_ARGS.replay_start_tick)
+    else:
+        startup_started_at: float = perf_counter()
+        from pong_game_loop.game_loop import GameLoop
+        from pong_game_classes.asset_manager import StartupReport
+        game = GameLoop(startup_report=StartupReport(started_at=startup_started_at) if CLI_ARGS.startup_report else None)
+        game.start()
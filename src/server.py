@@ -0,0 +1,25 @@
+import argparse
+
+parser = argparse.ArgumentParser(description="Authoritative match server hosting many headless matches (udp and tcp), or its load test.")
+parser.add_argument("--matches", type=int, default=100, help="Matches hosted by the server")
+parser.add_argument("--host", default="127.0.0.1", help="Address to serve on")
+parser.add_argument("--port", type=int, default=9999, help="Udp and tcp port")
+parser.add_argument("--tick_hz", type=int, default=60, help="Server tick rate")
+parser.add_argument("--keyframe_interval", type=int, default=60, help="Ticks between full (non-delta) state broadcasts")
+parser.add_argument("--difficulty", choices=["easy", "hard", "trained"], default="easy", help="Ai playing the sides no client has joined")
+parser.add_argument("--seed", type=int, default=0, help="Base seed, match i is seeded with seed + i")
+parser.add_argument("--load_test", action="store_true", help="Run the load generator against a fresh server for each of --match_counts")
+parser.add_argument("--match_counts", type=int, nargs="+", default=[50, 100, 200, 400], help="Match counts to load test")
+parser.add_argument("--duration", type=float, default=5.0, help="Seconds measured per load test step")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if args.load_test:
+        from pong_server.load_generator import run_load_test
+        run_load_test(match_counts=tuple(args.match_counts), host=args.host, port=args.port, tick_hz=args.tick_hz, duration_s=args.duration, seed=args.seed)
+    else:
+        from pong_server.match_server import run_server
+        run_server(
+            matches=args.matches, host=args.host, port=args.port, tick_hz=args.tick_hz,
+            keyframe_interval=args.keyframe_interval, seed=args.seed, ai_difficulty=args.difficulty
+        )
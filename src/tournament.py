@@ -0,0 +1,25 @@
+import argparse
+import json
+
+from pong_game_classes.tournament import PAIRINGS, print_tournament_report, run_tournament
+
+parser = argparse.ArgumentParser(description="Plays headless ai matches across all cores and reports win rates, rallies and throughput.")
+parser.add_argument("--pairing", choices=list(PAIRINGS), nargs="+", default=["easy-vs-hard"], help="Controller pairing(s) to play")
+parser.add_argument("--matches", type=int, default=200, help="Matches per pairing")
+parser.add_argument("--seed", type=int, default=0, help="Base seed, match i is seeded with seed + i")
+parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+parser.add_argument("--max_ticks", type=int, default=36_000, help="Ticks after which a match is abandoned as undecided")
+parser.add_argument("--policy_file", metavar="PATH", default=None, help="Policy file of the 'trained' controller (default: resources/ai/policy.bin)")
+parser.add_argument("--json", metavar="PATH", default=None, help="Also write the reports to a json file")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if args.matches < 1: parser.error("--matches must be at least 1")
+    reports: list = []
+    for pairing in args.pairing:
+        report = run_tournament(pairing=pairing, matches=args.matches, seed=args.seed, workers=args.workers, max_ticks=args.max_ticks, policy_filepath=args.policy_file)
+        print_tournament_report(report)
+        reports.append(report)
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(reports, json_file, indent=2)
@@ -0,0 +1,26 @@
+import argparse
+
+from pong_game_classes.ai_controller import DEFAULT_POLICY_FILEPATH
+
+parser = argparse.ArgumentParser(description="Trains a lookup-table ai policy by self-play on all cores, for '--difficulty trained'.")
+parser.add_argument("--output", metavar="PATH", default=DEFAULT_POLICY_FILEPATH, help="Policy file to write")
+parser.add_argument("--generations", type=int, default=20, help="Policy improvement rounds")
+parser.add_argument("--matches", type=int, default=64, help="Self-play matches per generation")
+parser.add_argument("--seed", type=int, default=0, help="Base seed of the self-play and evaluation matches")
+parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+parser.add_argument("--physics_hz", type=int, default=120, help="Physics tick rate to train at (the game's default is 120)")
+parser.add_argument("--eval_matches", type=int, default=16, help="Matches against --eval_opponent after every generation")
+parser.add_argument("--eval_opponent", choices=["easy", "hard"], default="hard", help="Hand-written ai the policy is evaluated against")
+parser.add_argument("--checkpoint_every", type=int, default=0, help="Also write every N-th generation's policy (<output>_gen<N>), weaker skill levels")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    from pathlib import Path
+    from pong_game_classes.policy_trainer import train_policy
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    policy = train_policy(
+        generations=args.generations, matches_per_generation=args.matches, seed=args.seed, workers=args.workers,
+        physics_hz=args.physics_hz, eval_matches=args.eval_matches, eval_opponent=args.eval_opponent,
+        checkpoint_every=args.checkpoint_every, output_filepath=args.output
+    )
+    print(f"\nPolicy ({policy.num_states} states, {policy.num_states} bytes) written to {args.output}")